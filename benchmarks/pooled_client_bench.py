@@ -0,0 +1,107 @@
+"""Benchmark of the upstream HTTP client strategies used by the frontend.
+
+Starts a local stand-in for the backend API and measures the latency of
+`GET /events/upcoming` when a new `httpx.AsyncClient` is opened per request
+(the previous behaviour) versus the shared pooled client.
+
+Usage::
+
+    python -m benchmarks.pooled_client_bench --requests 500 --concurrency 10
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from config import Settings
+from services.http_client import create_http_client
+
+backend = FastAPI()
+
+
+@backend.get("/events/upcoming")
+async def upcoming_events():
+    return [{"id": i, "name": f"Evento {i}"} for i in range(10)]
+
+
+def start_backend() -> str:
+    """Starts the stand-in backend in a background thread.
+
+    :return: Base URL of the stand-in backend.
+    :rtype: str
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(backend, host="127.0.0.1", port=port, log_level="error")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    return f"http://127.0.0.1:{port}"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def run(label: str, fetch, total: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await fetch()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+
+    print(
+        f"{label:<22} p50={percentile(samples, 50):7.2f} ms  "
+        f"p99={percentile(samples, 99):7.2f} ms  "
+        f"mean={statistics.fmean(samples):7.2f} ms"
+    )
+
+
+async def main(total: int, concurrency: int) -> None:
+    api_url = start_backend()
+    url = f"{api_url}/events/upcoming"
+
+    async def per_request_client():
+        async with httpx.AsyncClient() as client:
+            (await client.get(url)).json()
+
+    pooled = create_http_client(Settings(API_URL=api_url))
+
+    async def pooled_client():
+        (await pooled.get(url)).json()
+
+    # Warm up both paths so that imports and the backend are ready.
+    await run("warm-up", per_request_client, 20, concurrency)
+    await run("warm-up", pooled_client, 20, concurrency)
+
+    await run("client per request", per_request_client, total, concurrency)
+    await run("pooled client", pooled_client, total, concurrency)
+
+    await pooled.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency))
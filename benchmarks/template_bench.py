@@ -0,0 +1,94 @@
+"""Benchmark of the template setup.
+
+Starts the application in a fresh interpreter for each mode and measures
+the startup (lifespan) time and the latency of the first and second render
+of a few pages that need no backend:
+
+* ``development``: templates compiled on first use and checked for
+  changes on every render (the previous behaviour).
+* ``cold``: production mode with an empty bytecode cache, so every
+  template is compiled on startup.
+* ``warm``: production mode with the bytecode cache left by ``cold``, as a
+  restarted worker finds it.
+
+Usage::
+
+    python -m benchmarks.template_bench --pages /login /terms /signup
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {
+    "development": {"TEMPLATE_PRODUCTION": "false"},
+    "cold": {"TEMPLATE_PRODUCTION": "true"},
+    "warm": {"TEMPLATE_PRODUCTION": "true"},
+}
+
+
+def worker(pages: list[str]) -> None:
+    """Starts the application and prints the timings as JSON."""
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as client:
+        startup = time.perf_counter() - start
+        first, second = [], []
+        for page in pages:
+            for latencies in (first, second):
+                began = time.perf_counter()
+                client.get(page)
+                latencies.append(time.perf_counter() - began)
+
+    print(json.dumps({
+        "startup": startup,
+        "first": sum(first) / len(first),
+        "second": sum(second) / len(second),
+    }))
+
+
+def run(mode: str, cache_dir: str, pages: list[str]) -> dict:
+    env = {
+        "DEV_MODE": "true",
+        **os.environ,
+        **MODES[mode],
+        "TEMPLATE_CACHE_DIR": cache_dir,
+    }
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.template_bench", "--worker",
+         "--pages", *pages],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main(pages: list[str]) -> None:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for mode in MODES:
+            timings = run(mode, cache_dir, pages)
+            print(
+                f"{mode:<12} startup={timings['startup'] * 1000:7.1f} ms  "
+                f"first render={timings['first'] * 1000:6.2f} ms  "
+                f"second render={timings['second'] * 1000:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=["/login", "/terms", "/signup"])
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.pages)
+    else:
+        main(args.pages)
@@ -0,0 +1,111 @@
+"""Benchmark of the memory used to forward uploads to the backend.
+
+Starts a local stand-in for the backend API and forwards spooled uploads of
+several sizes to `POST /assistant/get-by-image`, either reading them into
+memory first (`await image.read()`, the previous behaviour) or streaming
+them from the spooled file. Reports the peak memory allocated per upload.
+
+Usage::
+
+    python -m benchmarks.upload_memory_bench --sizes 1 5 20
+"""
+import argparse
+import asyncio
+import socket
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+from config import Settings
+from services.http_client import create_http_client
+
+backend = FastAPI()
+
+
+@backend.post("/assistant/get-by-image")
+async def get_by_image(request: Request):
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+    return {"size": size}
+
+
+def start_backend() -> str:
+    """Starts the stand-in backend in a background thread.
+
+    :return: Base URL of the stand-in backend.
+    :rtype: str
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(backend, host="127.0.0.1", port=port, log_level="error")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    return f"http://127.0.0.1:{port}"
+
+
+def spooled_upload(size: int) -> tempfile.SpooledTemporaryFile:
+    """Creates an upload spooled to disk, like Starlette does for big files.
+
+    :param size: Size of the upload in bytes.
+    :type size: int
+    :return: Spooled file holding the upload.
+    :rtype: tempfile.SpooledTemporaryFile
+    """
+    file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    chunk = b"x" * (1024 * 1024)
+    for _ in range(size // len(chunk)):
+        file.write(chunk)
+    file.seek(0)
+    return file
+
+
+async def measure(label: str, forward, size: int) -> None:
+    file = spooled_upload(size)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    await forward(file)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    file.close()
+
+    print(f"{label:<10} upload={size / 2**20:5.0f} MiB  peak={peak / 2**20:7.2f} MiB")
+
+
+async def main(sizes: list[int]) -> None:
+    api_url = start_backend()
+    client = create_http_client(Settings(API_URL=api_url))
+    url = f"{api_url}/assistant/get-by-image"
+
+    async def buffered(file):
+        await client.post(url, files={"image": ("face.png", file.read(), "image/png")})
+
+    async def streamed(file):
+        await client.post(url, files={"image": ("face.png", file, "image/png")})
+
+    # Warm up so that imports and the connection pool are ready.
+    await streamed(spooled_upload(1024 * 1024))
+
+    for size in sizes:
+        await measure("buffered", buffered, size * 2**20)
+        await measure("streamed", streamed, size * 2**20)
+
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 20])
+    args = parser.parse_args()
+
+    asyncio.run(main(args.sizes))
@@ -16,6 +16,279 @@ class Settings(BaseSettings):
                   "http://backend:8000"]
     )
 
+    HTTP_MAX_CONNECTIONS: int = Field(
+        default=100,
+        title="Maximum upstream connections",
+        description="Maximum number of concurrent connections the shared HTTP client opens to the backend API.",
+        examples=[100]
+    )
+
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20,
+        title="Maximum keep-alive connections",
+        description="Maximum number of idle connections kept open in the pool for reuse.",
+        examples=[20]
+    )
+
+    HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0,
+        title="Keep-alive expiry",
+        description="Seconds an idle pooled connection is kept before being closed.",
+        examples=[30.0]
+    )
+
+    HTTP_CONNECT_TIMEOUT: float = Field(
+        default=5.0,
+        title="Connect timeout",
+        description="Seconds to wait while establishing a connection to the backend API.",
+        examples=[5.0]
+    )
+
+    HTTP_READ_TIMEOUT: float = Field(
+        default=30.0,
+        title="Read timeout",
+        description="Seconds to wait for the backend API to send a response. Face recognition requests can take several seconds.",
+        examples=[30.0]
+    )
+
+    HTTP_WRITE_TIMEOUT: float = Field(
+        default=30.0,
+        title="Write timeout",
+        description="Seconds to wait while sending a request body (e.g. image uploads) to the backend API.",
+        examples=[30.0]
+    )
+
+    HTTP_POOL_TIMEOUT: float = Field(
+        default=5.0,
+        title="Pool timeout",
+        description="Seconds to wait for a free connection from the pool before failing.",
+        examples=[5.0]
+    )
+
+    UPCOMING_EVENTS_CACHE_TTL: float = Field(
+        default=60.0,
+        title="Upcoming events cache TTL",
+        description="Seconds the list of upcoming events is kept in memory before asking the backend again. Use 0 to disable the cache.",
+        examples=[60.0]
+    )
+
+    IDENTITY_CACHE_TTL: float = Field(
+        default=30.0,
+        title="Identity cache TTL",
+        description="Seconds the user information returned by `/info` and `/assistant/info` is reused for the same access token. Use 0 to disable the cache.",
+        examples=[30.0]
+    )
+
+    IDENTITY_CACHE_MAX_ENTRIES: int = Field(
+        default=1024,
+        title="Identity cache size",
+        description="Maximum number of identity lookups kept in memory. The least recently used ones are evicted first.",
+        examples=[1024]
+    )
+
+    IMAGE_CACHE_DIR: Path = Field(
+        default=Path.cwd() / "data" / "image_cache",
+        title="Image cache directory",
+        description="Directory where the event images downloaded from the backend are kept.",
+        examples=["data/image_cache"]
+    )
+
+    IMAGE_CACHE_MAX_BYTES: int = Field(
+        default=256 * 1024 * 1024,
+        title="Image cache size",
+        description="Maximum number of bytes of event images kept on disk. The least recently used ones are evicted first. Use 0 to disable the cache.",
+        examples=[268435456]
+    )
+
+    IMAGE_PLACEHOLDER_MAX_ENTRIES: int = Field(
+        default=4096,
+        title="Image placeholder cache size",
+        description="Maximum number of low-quality image placeholders kept in memory for the event cards. Use 0 to disable the placeholders.",
+        examples=[4096]
+    )
+
+    IMAGE_PREFETCH_CONCURRENCY: int = Field(
+        default=4,
+        title="Image prefetch concurrency",
+        description="Maximum number of event images downloaded at the same time into the image cache when a listing page is rendered. Use 0 to disable the prefetching.",
+        examples=[4]
+    )
+
+    IMAGE_MAX_AGE: int = Field(
+        default=365 * 24 * 60 * 60,
+        title="Image max age",
+        description="Seconds browsers may keep an event image without asking again. Event images never change for the same UUID.",
+        examples=[31536000]
+    )
+
+    MAX_UPLOAD_BYTES: int = Field(
+        default=10 * 1024 * 1024,
+        title="Maximum upload size",
+        description="Maximum size in bytes of a request body, e.g. a check-in photo or an event image. Bigger uploads are rejected with 413 before being read. Use 0 to disable the limit.",
+        examples=[10485760]
+    )
+
+    CHECKIN_IMAGE_MAX_DIMENSION: int = Field(
+        default=1024,
+        title="Check-in photo size",
+        description="Maximum width and height in pixels of the check-in photos sent to face recognition. Larger photos are shrunk and re-encoded as JPEG. Use 0 to forward them unchanged.",
+        examples=[1024]
+    )
+
+    CHECKIN_IMAGE_QUALITY: int = Field(
+        default=85,
+        title="Check-in photo quality",
+        description="JPEG quality, from 1 to 95, of the normalized check-in photos.",
+        examples=[85]
+    )
+
+    CHECKIN_IMAGE_WORKERS: int = Field(
+        default=2,
+        title="Check-in photo workers",
+        description="Number of threads normalizing check-in photos at the same time.",
+        examples=[2]
+    )
+
+    CHECKIN_FACE_DETECTION: bool = Field(
+        default=False,
+        title="Local face detection",
+        description="Whether check-in photos are checked for a face locally before calling face recognition. Photos without a face are rejected and the face is cropped in the others. Requires `opencv-python-headless<5`.",
+        examples=[True]
+    )
+
+    CHECKIN_FACE_MARGIN: float = Field(
+        default=0.4,
+        title="Face crop margin",
+        description="Margin kept around the detected face when cropping it, as a fraction of the face size.",
+        examples=[0.4]
+    )
+
+    CHECKIN_WS_MIN_INTERVAL: float = Field(
+        default=1.0,
+        title="Continuous check-in interval",
+        description="Minimum seconds between two frames of a continuous check-in connection sent to face recognition. Frames arriving in between replace each other.",
+        examples=[1.0]
+    )
+
+    CHECKIN_WS_ALLOWED_ORIGINS: list[str] = Field(
+        default=[],
+        title="Continuous check-in origins",
+        description="Origins, besides the host the request was sent to, allowed to open a continuous check-in connection, e.g. when a proxy rewrites the Host header. Connections from any other page are rejected, as the browser sends the staff session cookie with them.",
+        examples=[["https://asistencia.example.com"]]
+    )
+
+    CHECKIN_DEDUP_WINDOW: float = Field(
+        default=5.0,
+        title="Repeated photo window",
+        description="Seconds during which a check-in face nearly identical to a previous one of the same event date gets the previous face recognition result without calling the backend. Faces are compared on the crop made by the local face detection, so this only applies when CHECKIN_FACE_DETECTION is enabled (see the README); the whole frame is not compared, as with a fixed camera different people would look the same. Use 0 to disable it.",
+        examples=[5.0]
+    )
+
+    CHECKIN_DEDUP_MAX_DISTANCE: int = Field(
+        default=2,
+        title="Repeated photo distance",
+        description="Maximum number of differing bits, out of 64, between the perceptual hashes of two check-in face crops for them to be considered the same. Keep it low: a match reuses the identity of the previous person.",
+        examples=[2]
+    )
+
+    ROSTER_REFRESH_INTERVAL: float = Field(
+        default=60,
+        title="Attendee roster refresh",
+        description="Seconds after which the in-memory roster of the people registered to an event is refreshed in the background while it is being checked in.",
+        examples=[60]
+    )
+
+    ROSTER_MAX_EVENTS: int = Field(
+        default=32,
+        title="Attendee roster events",
+        description="Maximum number of events whose roster is kept in memory. Use 0 to load the roster on every lookup.",
+        examples=[32]
+    )
+
+    ATTENDANCE_QUEUE_PATH: Path = Field(
+        default=Path.cwd() / "data" / "attendance_queue.sqlite3",
+        title="Attendance queue file",
+        description="SQLite file where the check-ins the backend could not record are kept until they are sent. It must be on persistent storage, or queued check-ins are lost on redeploy; the container image sets it to /data/attendance_queue.sqlite3, where a volume must be mounted.",
+        examples=["data/attendance_queue.sqlite3"]
+    )
+
+    ATTENDANCE_QUEUE_TIMEOUT: float = Field(
+        default=2.0,
+        title="Attendance queue timeout",
+        description="Seconds a check-in waits for the backend before it is queued and sent in the background. Use 0 to always queue check-ins.",
+        examples=[2.0]
+    )
+
+    ATTENDANCE_QUEUE_BATCH_SIZE: int = Field(
+        default=20,
+        title="Attendance queue batch size",
+        description="Maximum number of queued check-ins sent to the backend at the same time.",
+        examples=[20]
+    )
+
+    ATTENDANCE_QUEUE_FLUSH_INTERVAL: float = Field(
+        default=5.0,
+        title="Attendance queue flush interval",
+        description="Seconds between two attempts to send the queued check-ins when no new one arrives.",
+        examples=[5.0]
+    )
+
+    ATTENDANCE_QUEUE_MAX_ATTEMPTS: int = Field(
+        default=10,
+        title="Attendance queue attempts",
+        description="Attempts to send a queued check-in before it is given up and kept as failed.",
+        examples=[10]
+    )
+
+    SESSION_SECRET: str | None = Field(
+        default=None,
+        title="Session secret",
+        description="Key used to sign the session cookie. It is required, and must be the same in every worker, unless DEV_MODE is enabled, where a random one is generated on startup.",
+        examples=["change-me"]
+    )
+
+    DEV_MODE: bool = Field(
+        default=False,
+        title="Development mode",
+        description="Whether the application runs on a developer machine, where missing secrets are generated on startup instead of stopping it.",
+        examples=[False]
+    )
+
+    SESSION_MAX_AGE: int = Field(
+        default=12 * 60 * 60,
+        title="Session duration",
+        description="Seconds a session lasts when the access token issued by the backend has no expiry.",
+        examples=[43200]
+    )
+
+    TOKEN_EXPIRY_LEEWAY: float = Field(
+        default=5,
+        title="Token expiry leeway",
+        description="Seconds before the expiry of an access token it is already considered expired, sending the user to the login page without calling the backend.",
+        examples=[5]
+    )
+
+    TEMPLATE_PRODUCTION: bool = Field(
+        default=False,
+        title="Template production mode",
+        description="Whether the templates are compiled on startup, kept compiled in memory and never checked for changes. Off by default, so that template edits are picked up during development; the container image turns it on.",
+        examples=[True]
+    )
+
+    TEMPLATE_CACHE_DIR: Path = Field(
+        default=Path.cwd() / "data" / "template_cache",
+        title="Template bytecode cache directory",
+        description="Directory where the compiled templates are stored in production mode, so that restarted workers do not compile them again.",
+        examples=["data/template_cache"]
+    )
+
+    TEMPLATE_STREAMING: bool = Field(
+        default=True,
+        title="Template streaming",
+        description="Whether the pages listing events send the head and navigation before the backend answers, and the rest of the page once it does.",
+        examples=[True]
+    )
+
     model_config = SettingsConfigDict(
         env_file=Path.cwd() / ".env",
         env_file_encoding='utf-8',
@@ -1,31 +1,162 @@
 from email import message
-import tempfile
+import asyncio
 import json
+import logging
+import re
+import secrets
+from io import BytesIO
+from contextlib import asynccontextmanager
 from typing import Annotated
+from urllib.parse import quote, urlsplit
 from uuid import UUID
-from fastapi import Cookie, FastAPI, Form, HTTPException, Path, Query, Request, UploadFile, File, status
+import httpx
+from fastapi import Cookie, Depends, FastAPI, Form, HTTPException, Path, Query, Request, UploadFile, File, WebSocket, WebSocketDisconnect, status
+from fastapi.requests import HTTPConnection
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-import httpx
-import requests
+from PIL import Image
+from starlette.background import BackgroundTask
+from starlette.websockets import WebSocketState
 
-from config import SettingsDependency
+from config import SettingsDependency, get_settings
 from models.models import LoginForm, Staff, UserUpdate, AssistantUpdate, ProfileUpdateRequest
+from services.attendance_queue import AttendanceQueue
+from services.auth import LoginRequired, PrincipalDependency, require_role
+from services.attendee_roster import RosterCache
+from services.face_detector import FaceDetector
+from services.frame_dedup import RecognitionCache, perceptual_hash
+from services.frame_throttle import FrameThrottle
+from services.fetch_plan import FetchPlan
+from services.gateway import Gateway, GatewayDependency
+from services.http_client import create_http_client
+from services.identity_cache import IdentityCache
+from services.image_cache import ImageCache
+from services.image_normalizer import ImageNormalizer
+from services.image_placeholders import PlaceholderCache
+from services.image_prefetcher import ImagePrefetcher
+from services.image_variants import PRESETS, negotiate_format, render_variant, variant_width
+from services.session import Principal, SessionSigner
+from services.single_flight import SingleFlight
+from services.templates import TemplateStreamer, create_templates, precompile_templates
+from services.token_guard import AccessTokenDependency, OptionalAccessTokenDependency, SessionExpired, TokenGuard
+from services.ttl_cache import TTLCache
+from services.upload_limit import UploadLimitMiddleware
 from datetime import datetime
 import traceback
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Creates the resources shared by all the requests of a worker and
+    releases them on shutdown.
+
+    \f
+
+    :param app: FastAPI application being started.
+    :type app: FastAPI
+    """
+    app.state.http_client = create_http_client(get_settings())
+    if get_settings().TEMPLATE_PRODUCTION:
+        app.state.template_stats = precompile_templates(templates.env)
+    app.state.attendance_queue.start(
+        lambda *ids: send_queued_attendance(app, *ids)
+    )
+    try:
+        yield
+    finally:
+        await app.state.attendance_queue.close()
+        await app.state.image_prefetcher.close()
+        await app.state.http_client.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    UploadLimitMiddleware,
+    max_bytes=get_settings().MAX_UPLOAD_BYTES
+)
+app.state.single_flight = SingleFlight()
+app.state.upcoming_events_cache = TTLCache(
+    get_settings().UPCOMING_EVENTS_CACHE_TTL
+)
+app.state.identity_cache = IdentityCache(
+    get_settings().IDENTITY_CACHE_TTL,
+    get_settings().IDENTITY_CACHE_MAX_ENTRIES
+)
+app.state.image_cache = ImageCache(
+    get_settings().IMAGE_CACHE_DIR,
+    get_settings().IMAGE_CACHE_MAX_BYTES
+)
+app.state.placeholder_cache = PlaceholderCache(
+    app.state.image_cache,
+    get_settings().IMAGE_PLACEHOLDER_MAX_ENTRIES
+)
+app.state.image_prefetcher = ImagePrefetcher(
+    app.state.image_cache,
+    get_settings().IMAGE_PREFETCH_CONCURRENCY
+)
+app.state.image_normalizer = ImageNormalizer(
+    get_settings().CHECKIN_IMAGE_MAX_DIMENSION,
+    get_settings().CHECKIN_IMAGE_QUALITY,
+    get_settings().CHECKIN_IMAGE_WORKERS
+)
+app.state.face_detector = FaceDetector(
+    get_settings().CHECKIN_FACE_DETECTION,
+    get_settings().CHECKIN_FACE_MARGIN,
+    get_settings().CHECKIN_IMAGE_QUALITY,
+    app.state.image_normalizer.executor
+)
+app.state.recognition_cache = RecognitionCache(
+    get_settings().CHECKIN_DEDUP_WINDOW,
+    get_settings().CHECKIN_DEDUP_MAX_DISTANCE
+)
+app.state.roster_cache = RosterCache(
+    get_settings().ROSTER_REFRESH_INTERVAL,
+    get_settings().ROSTER_MAX_EVENTS
+)
+app.state.attendance_queue = AttendanceQueue(
+    get_settings().ATTENDANCE_QUEUE_PATH,
+    get_settings().ATTENDANCE_QUEUE_BATCH_SIZE,
+    get_settings().ATTENDANCE_QUEUE_FLUSH_INTERVAL,
+    get_settings().ATTENDANCE_QUEUE_MAX_ATTEMPTS
+)
+app.state.attendance_queue_timeout = get_settings().ATTENDANCE_QUEUE_TIMEOUT
+if not get_settings().SESSION_SECRET and not get_settings().DEV_MODE:
+    # Con un secreto aleatorio por proceso las sesiones fallarían al azar
+    raise RuntimeError(
+        "SESSION_SECRET must be set, with the same value in every worker"
+    )
+app.state.session_signer = SessionSigner(
+    get_settings().SESSION_SECRET or secrets.token_urlsafe(32),
+    get_settings().SESSION_MAX_AGE
+)
+app.state.token_guard = TokenGuard(get_settings().TOKEN_EXPIRY_LEEWAY)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
-templates = Jinja2Templates(directory="templates")
+def principal_context(request: Request) -> dict:
+    """Context processor making the user resolved for the request, if any,
+    available to every template as `principal`."""
+    return {"principal": getattr(request.state, "principal", None)}
+
+
+templates = create_templates(
+    "templates",
+    get_settings().TEMPLATE_PRODUCTION,
+    get_settings().TEMPLATE_CACHE_DIR,
+    context_processors=[principal_context]
+)
 templates.env.filters["strftime"] = lambda date_str: (  # type: ignore
     datetime.fromisoformat(date_str.replace(
         'Z', '+00:00')).strftime('%d/%m/%Y %H:%M')
 )
+app.state.template_streamer = TemplateStreamer(
+    templates,
+    get_settings().TEMPLATE_STREAMING
+)
 
 
 # Manejador para errores de validación
@@ -39,6 +170,65 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         )
 
 
+@app.exception_handler(LoginRequired)
+async def login_required_handler(request: Request, exc: LoginRequired):
+    # La página requiere otro rol o iniciar sesión
+    return RedirectResponse(
+        url="/login",
+        status_code=status.HTTP_303_SEE_OTHER
+    )
+
+
+@app.exception_handler(SessionExpired)
+async def session_expired_handler(request: Request, exc: SessionExpired):
+    # El token ya expiró: volver al login sin llamar al backend
+    if request.headers.get("accept") == "application/json":
+        response = Response(status_code=status.HTTP_401_UNAUTHORIZED)
+    else:
+        response = RedirectResponse(
+            url="/login",
+            status_code=status.HTTP_303_SEE_OTHER
+        )
+    response.delete_cookie(key="access_token")
+    response.delete_cookie(key="role")
+    response.delete_cookie(key="session")
+    return response
+
+
+async def get_upcoming_events(request: Request, gateway) -> list:
+    """Helper function to get the upcoming events.
+
+    The list is kept in the upcoming events cache of the worker, so the
+    pages showing it only reach the backend once per cache TTL.
+    """
+
+    async def fetch():
+        response = await gateway.shared_get("/events/upcoming")
+
+        if response.status_code != status.HTTP_200_OK:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=response.text
+            )
+
+        return response.json() or []
+
+    return await request.app.state.upcoming_events_cache.get_or_fetch(
+        "upcoming", fetch
+    )
+
+
+async def get_image_placeholders(request: Request, events: list) -> dict:
+    """Helper function to get the placeholders of the event card images.
+
+    The cards show them inline while the real images load lazily. Images
+    not in the image cache yet get no placeholder.
+    """
+    return await request.app.state.placeholder_cache.get_many([
+        str(event["image_uuid"]) for event in events if event.get("image_uuid")
+    ])
+
+
 @app.get(
     "/home",
     response_class=HTMLResponse,
@@ -47,6 +237,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def home(
     request: Request,
     settings: SettingsDependency,
+    gateway: GatewayDependency,
     role: Annotated[str | None, Cookie()] = None
 ):
     """Endpoint to retrieve the home page with upcoming events.
@@ -59,23 +250,24 @@ async def home(
     :rtype: _TemplateResponse
     """
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{settings.API_URL}/events/upcoming?quantity=3")
-
-    events = response.json()
-
-    if not events:
-        events = []  # or handle the empty case as needed
+    async def load():
+        # Los tres próximos eventos salen de la lista completa en caché
+        events = (await get_upcoming_events(request, gateway))[:3]
+        prefetch_event_images(request, gateway, events)
+        return {
+            "events": events,
+            "placeholders": await get_image_placeholders(request, events),
+        }
 
-    return templates.TemplateResponse(
-        request=request,
-        name="index.html.j2",
-        context={
+    return await request.app.state.template_streamer.response(
+        request,
+        "index.html.j2",
+        {
             "request": request,
-            "events": events,
             "role": role,
             "api_url": settings.API_URL,
-        }
+        },
+        load
     )
 
 
@@ -110,13 +302,193 @@ async def terms(
     )
 
 
-@app.get(
+async def stream_image(response, writer=None):
+    """Helper function to stream the body of a backend image response.
+
+    Each chunk is sent to the client as soon as it arrives and, if a cache
+    writer is given, also written to the image cache. The image is only
+    added to the cache once it was received completely.
+    """
+    try:
+        async for chunk in response.aiter_bytes():
+            if writer is not None:
+                await writer.write(chunk)
+            yield chunk
+
+        if writer is not None:
+            await writer.commit()
+    finally:
+        await close_image_stream(response, writer)
+
+
+def image_cache_headers(
+    image_uuid: UUID,
+    settings,
+    variant: str | None = None
+) -> dict:
+    """Helper function to build the HTTP caching headers of an event image.
+
+    The content behind an image UUID never changes, so the UUID itself (plus
+    the variant, if any) is a strong ETag and browsers may keep the image
+    for as long as they want. The format of a variant depends on the
+    `Accept` header, so shared caches must take it into account.
+    """
+    headers = {
+        "ETag": f'"{image_uuid}"' if variant is None else f'"{image_uuid}-{variant}"',
+        "Cache-Control": f"public, max-age={settings.IMAGE_MAX_AGE}, immutable",
+    }
+    if variant is not None:
+        headers["Vary"] = "Accept"
+    return headers
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Helper function to check an `If-None-Match` header against an ETag,
+    using the weak comparison required for that header."""
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+async def open_image_stream(gateway, image_uuid: UUID, range_header=None):
+    """Helper function to request an event image from the backend without
+    reading its body.
+
+    Returns the backend response with its content type and file name.
+    """
+    response = await gateway.stream(
+        f"/events/image/{image_uuid}",
+        headers={"Range": range_header} if range_header else None
+    )
+
+    if response.status_code not in [
+        status.HTTP_200_OK,
+        status.HTTP_206_PARTIAL_CONTENT
+    ]:
+        await response.aclose()
+        raise HTTPException(
+            status_code=response.status_code,
+            detail="Failed to retrieve the image"
+        )
+
+    content_type = response.headers.get("Content-Type", "")
+
+    filename = "image"
+    content_disp = response.headers.get("Content-Disposition")
+    if content_disp and "filename=" in content_disp:
+        filename = content_disp.split("filename=")[1].strip('"')
+
+    return response, content_type, filename
+
+
+def image_download_key(image_uuid) -> str:
+    """Helper function to build the single flight key of the download of
+    an event image into the image cache."""
+    return f"image-download:{image_uuid}"
+
+
+async def download_image(request: Request, gateway, image_uuid):
+    """Helper function to download an event image into the image cache
+    without sending it to a client.
+
+    Simultaneous downloads of the same image, e.g. a prefetch and a
+    variant, are collapsed into one. Returns `None` if the image was not
+    stored.
+    """
+    image_cache = request.app.state.image_cache
+
+    async def download():
+        response, content_type, filename = await open_image_stream(
+            gateway, image_uuid
+        )
+        writer = image_cache.writer(str(image_uuid), content_type, filename)
+        if writer is None:
+            await response.aclose()
+            return None
+
+        try:
+            async for chunk in response.aiter_bytes():
+                await writer.write(chunk)
+            return await writer.commit()
+        finally:
+            await close_image_stream(response, writer)
+
+    return await request.app.state.single_flight.do(
+        image_download_key(image_uuid), download
+    )
+
+
+def prefetch_event_images(request: Request, gateway, events: list) -> None:
+    """Helper function to download the images of the listed events into
+    the image cache in the background, before the browser asks for them."""
+    request.app.state.image_prefetcher.schedule(
+        [str(event["image_uuid"]) for event in events if event.get("image_uuid")],
+        lambda image_uuid: download_image(request, gateway, image_uuid)
+    )
+
+
+async def build_image_variant(
+    request: Request,
+    gateway,
+    image_uuid: UUID,
+    width: int,
+    image_format: str | None,
+    key: str
+):
+    """Helper function to generate a resized variant of an event image
+    and store it in the image cache.
+
+    The original is downloaded into the cache first if needed. Returns
+    `None` if the cache is disabled or the image cannot be decoded, in which
+    case the original should be served instead.
+    """
+    image_cache = request.app.state.image_cache
+
+    original = image_cache.get(str(image_uuid))
+    if original is None:
+        original = await download_image(request, gateway, image_uuid)
+        if original is None:
+            return None
+
+    try:
+        # Redimensionar es trabajo de CPU, no debe bloquear el event loop
+        content, media_type, extension = await asyncio.to_thread(
+            render_variant, original.path, width, image_format
+        )
+    except (OSError, Image.DecompressionBombError):
+        # UnidentifiedImageError es un OSError; una bomba de descompresión no
+        return None
+
+    return await image_cache.put(
+        key,
+        content,
+        media_type,
+        f"{original.filename.rsplit('.', 1)[0]}.{extension}"
+    )
+
+
+async def close_image_stream(response, writer=None):
+    """Helper function to release a backend image response and discard
+    its unfinished cache entry, if any."""
+    if writer is not None:
+        writer.abort()
+    await response.aclose()
+
+
+@app.api_route(
     "/event/image/{image_uuid}",
+    methods=["GET", "HEAD"],
     response_class=FileResponse,
     summary="Endpoint to retrieve the event image",
     response_description="Successful Response with the event image",
 )
 async def get_event_image(
+    request: Request,
     image_uuid: Annotated[
         UUID,
         Path(
@@ -124,47 +496,155 @@ async def get_event_image(
             description="The UUID of the event image to retrieve",
         )
     ],
-    settings: SettingsDependency
+    settings: SettingsDependency,
+    gateway: GatewayDependency,
+    width: Annotated[
+        int | None,
+        Query(
+            gt=0,
+            title="Width",
+            description="Maximum width in pixels of the image to retrieve",
+        )
+    ] = None,
+    preset: Annotated[
+        str | None,
+        Query(
+            title="Preset",
+            description=f"Predefined width: {', '.join(PRESETS)}",
+        )
+    ] = None,
 ):
     """Endpoint to retrieve the event image.
 
+    The images are kept in the image cache of the worker, so an image is
+    only downloaded from the backend the first time it is requested. On
+    that first request the image is streamed to the client while it is
+    being written to the cache, so memory use does not depend on its size.
+
+    Cached images support `HEAD` and byte-range requests. A byte-range
+    request for an image that is not cached is forwarded to the backend.
+
+    Responses carry a strong ETag and an immutable `Cache-Control`, and a
+    request whose `If-None-Match` matches is answered with `304 Not
+    Modified` without looking at the cache or the backend.
+
+    With a width or a preset, a resized variant is served instead,
+    re-encoded to AVIF or WebP when the `Accept` header allows it.
+    Variants are generated once and kept in the image cache.
+
     \f
 
+    :param request: Request object containing request information.
+    :type request: Request
     :param image_uuid: UUID of the event image to retrieve.
     :type image_uuid: UUID
-    :param settings: SettingsDependency object containing the API URL.
-    :type settings: SettingsDependency
-    :return: FileResponse object containing the event image.
-    :rtype: FileResponse
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
+    :param width: Maximum width in pixels of the image.
+    :type width: int | None
+    :param preset: Predefined width of the image.
+    :type preset: str | None
+    :return: Response containing the event image.
+    :rtype: FileResponse | StreamingResponse | Response
     """
+    if preset is not None and preset not in PRESETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown image preset: {preset}"
+        )
 
-    response = requests.get(f"{settings.API_URL}/events/image/{image_uuid}")
+    image_cache = request.app.state.image_cache
+    request.app.state.image_prefetcher.claim(str(image_uuid))
 
-    if response.status_code != status.HTTP_200_OK:
-        raise HTTPException(
-            status_code=response.status_code,
-            detail="Failed to retrieve the image"
+    variant_size = variant_width(width, preset)
+    if variant_size is not None:
+        image_format = negotiate_format(request.headers.get("Accept"))
+        variant = f"{variant_size}_{image_format or 'original'}"
+        key = f"{image_uuid}_{variant}"
+        cache_headers = image_cache_headers(image_uuid, settings, variant)
+
+        if etag_matches(request.headers.get("If-None-Match"), cache_headers["ETag"]):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=cache_headers
+            )
+
+        image = image_cache.get(key)
+        if image is None:
+            # Peticiones simultáneas de la misma variante la generan una vez
+            image = await request.app.state.single_flight.do(
+                f"image-variant:{key}",
+                lambda: build_image_variant(
+                    request, gateway, image_uuid, variant_size, image_format, key
+                )
+            )
+
+        if image is not None:
+            return FileResponse(
+                image.path,
+                media_type=image.media_type,
+                filename=image.filename,
+                headers={"X-Accel-Buffering": "no", **cache_headers}
+            )
+
+    cache_headers = image_cache_headers(image_uuid, settings)
+
+    if etag_matches(request.headers.get("If-None-Match"), cache_headers["ETag"]):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=cache_headers
         )
 
-    # Guardar la imagen en un archivo temporal
-    content_type = response.headers.get("Content-Type", "")
-    suffix = ".png"
-    # Puedes agregar más tipos si lo necesitas
+    image = image_cache.get(str(image_uuid))
+    downloads = request.app.state.single_flight.in_flight
+    if image is None and image_download_key(image_uuid) in downloads:
+        # Ya se está descargando (p. ej. precarga): esperarla es más barato
+        image = await download_image(request, gateway, image_uuid)
 
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    temp_file.write(response.content)
-    temp_file.close()
+    if image is not None:
+        return FileResponse(
+            image.path,
+            media_type=image.media_type,
+            filename=image.filename,
+            headers={"X-Accel-Buffering": "no", **cache_headers}
+        )
 
-    filename = "image"
-    content_disp = response.headers.get("Content-Disposition")
-    if content_disp and "filename=" in content_disp:
-        filename = content_disp.split("filename=")[1].strip('"')
+    response, content_type, filename = await open_image_stream(
+        gateway, image_uuid, request.headers.get("Range")
+    )
 
-    return FileResponse(
-        temp_file.name,
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Accel-Buffering": "no",
+        **cache_headers,
+    }
+    # El cuerpo llega ya decodificado, así que su tamaño solo se conoce si
+    # el backend no lo comprimió
+    if "Content-Encoding" not in response.headers:
+        for header in ["Content-Length", "Content-Range", "Accept-Ranges"]:
+            if header in response.headers:
+                headers[header] = response.headers[header]
+
+    if request.method == "HEAD":
+        await response.aclose()
+        return Response(
+            status_code=response.status_code,
+            media_type=content_type,
+            headers=headers
+        )
+
+    # Solo la imagen completa puede guardarse en la caché
+    writer = None
+    if response.status_code == status.HTTP_200_OK:
+        writer = image_cache.writer(str(image_uuid), content_type, filename)
+
+    return StreamingResponse(
+        stream_image(response, writer),
+        status_code=response.status_code,
         media_type=content_type,
-        filename=filename,
-        headers={"X-Accel-Buffering": "no"}
+        headers=headers,
+        # Libera la conexión aunque el cliente se desconecte antes de empezar
+        background=BackgroundTask(close_image_stream, response, writer)
     )
 
 
@@ -207,23 +687,30 @@ def login(
     summary="Endpoint to handle login form submission",
     status_code=status.HTTP_303_SEE_OTHER
 )
-def handle_login(
+async def handle_login(
+    request: Request,
     form: Annotated[LoginForm, Form()],
-    settings: SettingsDependency
+    gateway: GatewayDependency
 ):
     """Endpoint to handle login form submission.
 
+    Besides the access token, a signed session cookie with the ID, role and
+    name of the user is set, so that later requests know who the user is
+    without asking the backend.
+
     \f
 
+    :param request: Request object containing request information.
+    :type request: Request
     :param form: LoginForm object containing the form data.
     :type form: LoginForm
     :return: Redirect response to the home page.
     :rtype: RedirectResponse
     """
 
-    response = requests.post(
-        f"{settings.API_URL}/token",
-        data=form.model_dump()
+    response = await gateway.post(
+        "/token",
+        data=form.model_dump(exclude_none=True)
     )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
@@ -240,10 +727,7 @@ def handle_login(
 
     token = response.json().get("access_token")
     # Obtener información del usuario usando el token
-    user_response = requests.get(
-        f"{settings.API_URL}/info",
-        headers={"Authorization": f"Bearer {token}"}
-    )
+    user_response = await gateway.get_identity("/info", token)
 
     if user_response.status_code != status.HTTP_200_OK:
         raise HTTPException(
@@ -258,9 +742,27 @@ def handle_login(
         url="/home", status_code=status.HTTP_303_SEE_OTHER)
     response.set_cookie(key="access_token", value=token, secure=True)
     response.set_cookie(key="role", value=role)
+    set_session_cookie(
+        request,
+        response,
+        request.app.state.session_signer.principal(user_data, token)
+    )
     return response
 
 
+def set_session_cookie(request: Request, response: Response, principal) -> None:
+    """Helper function to set the signed session cookie of a user."""
+    signer = request.app.state.session_signer
+    response.set_cookie(
+        key="session",
+        value=signer.dumps(principal),
+        max_age=signer.max_age_of(principal),
+        secure=True,
+        httponly=True,
+        samesite="lax"
+    )
+
+
 @app.get(
     "/signup",
     response_class=HTMLResponse,
@@ -298,14 +800,19 @@ def signup(
     summary="Endpoint to retrieve the record assistant page"
 )
 async def record_assistant(
+    principal: Annotated[Principal, Depends(require_role("staff"))],
     request: Request,
     settings: SettingsDependency,
+    gateway: GatewayDependency,
     event_id: Annotated[int, Path()],
     event_date_id: Annotated[int, Path()],
-    role: Annotated[str | None, Cookie()] = None,
 ):
     """Endpoint to retrieve the record assistant page.
 
+    The page lists the queued attendances of the event date that the
+    backend rejected or that could not be sent, so the staff can record
+    them again.
+
     \f
 
     :param request: Request object containing request information.
@@ -313,12 +820,19 @@ async def record_assistant(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
+    # Carga la lista de registrados mientras el navegador muestra la página
+    request.app.state.roster_cache.preload(
+        event_id, lambda: fetch_roster(gateway, event_id)
+    )
 
-    if role != "staff":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
+    # Asistencias de la cola que el backend no aceptó: el personal las revisa
+    failed_attendances = await request.app.state.attendance_queue.failed(
+        event_id, event_date_id
+    )
+    roster = request.app.state.roster_cache.rosters.get(event_id)
+    for attendance in failed_attendances:
+        attendance["assistant"] = roster.people.get(attendance["assistant_id"]) \
+            if roster is not None else None
 
     return templates.TemplateResponse(
         request=request,
@@ -327,9 +841,10 @@ async def record_assistant(
             "request": request,
             "event_id": event_id,
             "event_date_id": event_date_id,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
             "alert_no_face": False,  # Inicializar como False
+            "failed_attendances": failed_attendances,
         }
     )
 
@@ -340,9 +855,10 @@ async def record_assistant(
     summary="Endpoint to retrieve the settings page"
 )
 async def settings(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve the settings page.
 
@@ -353,13 +869,7 @@ async def settings(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    app_settings = requests.get(f"{settings.API_URL}/organizer/get-settings")
+    app_settings = await gateway.get("/organizer/get-settings")
 
     if app_settings.status_code != status.HTTP_200_OK:
         raise HTTPException(
@@ -377,22 +887,140 @@ async def settings(
             "api_url": settings.API_URL,
             "app_settings": app_settings,
             "default_message": "",
-            "role": role,
+            "role": principal.role,
         }
     )
 
 
+async def recognize_assistants(
+    connection: HTTPConnection,
+    gateway,
+    image_file,
+    filename: str | None,
+    content_type: str | None,
+    event_id: int,
+    event_date_id: int
+) -> dict:
+    """Helper function to find the assistants matching a check-in photo.
+
+    The photo is normalized (oriented, shrunk and re-encoded as JPEG)
+    before it is sent to face recognition. If it cannot be decoded it is
+    sent unchanged, straight from its file, and the backend decides.
+
+    When local face detection is enabled, a photo without a face is
+    rejected right away and only the face is sent otherwise.
+
+    A face nearly identical to one of the same event date recognized a few
+    seconds ago, as the staff usually capture the same person several
+    times in a row, gets the previous result right away. Only the face
+    crop is compared: with a fixed camera the background dominates the
+    whole frame, and two different people would look the same.
+
+    Returns the matching assistants and whether no face was found, the
+    person already checked in or the backend failed. Only a transport
+    error raises an exception, `httpx.HTTPError`.
+    """
+    state = connection.app.state
+    normalized = await state.image_normalizer.normalize(image_file)
+
+    scope = (event_id, event_date_id)
+    photo_hash = None
+    if normalized is not None and state.face_detector.enabled:
+        normalized = await state.face_detector.detect(normalized)
+        # Sin rostro no vale la pena llamar al reconocimiento del backend
+        if normalized is None:
+            return {
+                "assistants": [],
+                "alert_no_face": True,
+                "alert_already_assisted": False,
+                "alert_backend_error": False,
+            }
+
+        if state.recognition_cache.window > 0:
+            photo_hash = await asyncio.get_running_loop().run_in_executor(
+                state.image_normalizer.executor, perceptual_hash, normalized
+            )
+            previous = state.recognition_cache.get(scope, photo_hash)
+            if previous is not None:
+                return previous
+
+    if normalized is not None:
+        stem = (filename or "image").rsplit(".", 1)[0]
+        file = {"image": (f"{stem}.jpg", normalized, "image/jpeg")}
+    else:
+        # Se envía directamente desde el archivo temporal, sin copiarlo
+        image_file.seek(0)
+        file = {"image": (filename, image_file, content_type)}
+
+    assistants = await gateway.post(
+        "/assistant/get-by-image",
+        params={"event_id": event_id, "event_date_id": event_date_id},
+        files=file
+    )
+
+    # Un backend caído suele responder HTML o texto; solo se lee JSON
+    body = None
+    if "json" in assistants.headers.get("content-type", ""):
+        try:
+            body = assistants.json()
+        except ValueError:
+            pass
+
+    alert_already_assisted = False
+    if assistants.status_code == status.HTTP_404_NOT_FOUND and isinstance(body, dict) and body.get("detail") == "No similar people found in the main database, but some people have already assisted to the event":
+        alert_already_assisted = True
+
+    alert_no_face = False
+    if assistants.status_code == status.HTTP_400_BAD_REQUEST:
+        alert_no_face = True
+
+    # 200, 400 y 404 son respuestas del reconocimiento; el resto son fallos,
+    # como lo es un 200 o un 404 que no trae JSON (p. ej. de un proxy)
+    alert_backend_error = assistants.status_code not in (
+        status.HTTP_200_OK,
+        status.HTTP_400_BAD_REQUEST,
+        status.HTTP_404_NOT_FOUND,
+    ) or (assistants.status_code != status.HTTP_400_BAD_REQUEST and body is None)
+
+    # Los errores del backend no se guardan, el siguiente intento lo llama
+    cacheable = photo_hash is not None and not alert_backend_error
+
+    # Verifica que si el json no es una lista, mandar una lista vacía
+    assistants = body if assistants.status_code == status.HTTP_200_OK \
+        and isinstance(body, list) else []
+
+    recognition = {
+        "assistants": assistants,
+        "alert_no_face": alert_no_face,
+        "alert_already_assisted": alert_already_assisted,
+        "alert_backend_error": alert_backend_error,
+    }
+    if cacheable:
+        state.recognition_cache.put(scope, photo_hash, recognition)
+    return recognition
+
+
+# Resultado del reconocimiento cuando el backend no responde
+RECOGNITION_BACKEND_ERROR = {
+    "assistants": [],
+    "alert_no_face": False,
+    "alert_already_assisted": False,
+    "alert_backend_error": True,
+}
+
+
 @app.post(
     "/record-assistant/{event_id}/{event_date_id}",
     response_class=HTMLResponse,
 )
 async def record_assistant_with_data(
+    principal: Annotated[Principal, Depends(require_role("staff"))],
     request: Request,
     image: Annotated[UploadFile, Form()],
     settings: SettingsDependency,
+    gateway: GatewayDependency,
     event_id: Annotated[int, Path()],
     event_date_id: Annotated[int, Path()],
-    role: Annotated[str | None, Cookie()] = None,
 ):
     """Endpoint to handle the recording of an assistant.
 
@@ -406,46 +1034,421 @@ async def record_assistant_with_data(
     :rtype: _TemplateResponse
     """
 
-    file = {
-        "image": (image.filename, await image.read(), image.content_type)
-    }
-
-    assistants = requests.post(
-        f"{settings.API_URL}/assistant/get-by-image?event_id={event_id}&event_date_id={event_date_id}",
-        files=file  # type: ignore
-    )
-
-    alert_already_assisted = False
-    if assistants.status_code == status.HTTP_404_NOT_FOUND and assistants.json().get("detail") == "No similar people found in the main database, but some people have already assisted to the event":
-        alert_already_assisted = True
-
-    alert_no_face = False
-    if assistants.status_code == status.HTTP_400_BAD_REQUEST:
-        alert_no_face = True
-
-    assistants = assistants.json()
-
-    # Verifica que si el json no es una lista, mandar una lista vacía
-    if not isinstance(assistants, list):
-        assistants = []
+    try:
+        recognition = await recognize_assistants(
+            request,
+            gateway,
+            image.file,
+            image.filename,
+            image.content_type,
+            event_id,
+            event_date_id
+        )
+    except httpx.HTTPError:
+        recognition = RECOGNITION_BACKEND_ERROR
 
     return templates.TemplateResponse(
         request=request,
         name="record_assistant.html.j2",
         context={
             "request": request,
-            "assistants": assistants,
+            "assistants": recognition["assistants"],
             "event_id": event_id,
             "event_date_id": event_date_id,
             "api_url": settings.API_URL,
             "default_message": "No se puede reconocer el rostro o no coincide con ningún asistente registrado.",
-            "role": role,
-            "alert_no_face": alert_no_face,
-            "alert_already_assisted": alert_already_assisted,
+            "role": principal.role,
+            "alert_no_face": recognition["alert_no_face"],
+            "alert_already_assisted": recognition["alert_already_assisted"],
+            "alert_backend_error": recognition["alert_backend_error"],
         }
     )
 
 
+def compact_assistant(assistant: dict) -> dict:
+    """Helper function to keep only the assistant fields shown at
+    check-in."""
+    details = assistant.get("assistant") or {}
+    return {
+        "id": assistant.get("id"),
+        "first_name": assistant.get("first_name"),
+        "last_name": assistant.get("last_name"),
+        "email": assistant.get("email"),
+        "id_number": details.get("id_number"),
+        "phone": details.get("phone"),
+        "image_uuid": details.get("image_uuid"),
+    }
+
+
+async def fetch_roster(gateway, event_id: int) -> list[dict]:
+    """Helper function to fetch the people registered to an event, with
+    only the fields needed to check them in."""
+    response = await gateway.get(f"/events/registered/{event_id}")
+
+    if response.status_code != status.HTTP_200_OK:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=response.text
+        )
+
+    return [compact_assistant(person) for person in response.json()]
+
+
+@app.get(
+    "/record-assistant/{event_id}/{event_date_id}/lookup",
+    summary="Endpoint to look up the people registered to an event"
+)
+async def lookup_registered_assistant(
+    principal: Annotated[Principal, Depends(require_role("staff", redirect=False))],
+    request: Request,
+    gateway: GatewayDependency,
+    event_id: Annotated[int, Path()],
+    event_date_id: Annotated[int, Path()],
+    q: Annotated[str, Query(max_length=100)] = "",
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+):
+    """Endpoint to look up the people registered to an event by their
+    identification number or the beginning of their identification number
+    or name, for the manual check-in typeahead.
+
+    Answered from the in-memory roster of the event, which is loaded on the
+    first lookup and refreshed in the background afterwards.
+
+    \f
+
+    :param request: Request object containing request information.
+    :type request: Request
+    :param q: Identification number or beginning of a name.
+    :type q: str
+    :param limit: Maximum number of suggestions.
+    :type limit: int
+    :return: Person with exactly that identification number, if any, and
+        the people starting with the query.
+    :rtype: dict
+    """
+    roster = await request.app.state.roster_cache.get(
+        event_id, lambda: fetch_roster(gateway, event_id)
+    )
+
+    return {
+        "match": roster.find(q),
+        "suggestions": roster.search(q, limit),
+    }
+
+
+# Cédula o pasaporte, como los acepta el registro de asistentes
+ID_NUMBER_PATTERN = re.compile(r"[A-Za-z]{0,3}\d{4,10}")
+
+
+async def find_assistant_by_id_number(gateway, id_number: str) -> dict | None:
+    """Helper function to find an assistant by their identification number
+    in the backend. Returns `None` if there is no such assistant.
+
+    Only identification numbers in the formats accepted at signup reach the
+    backend, quoted, so the input cannot point to another endpoint.
+    """
+    if not ID_NUMBER_PATTERN.fullmatch(id_number):
+        return None
+
+    response = await gateway.get(
+        f"/assistant/get-by-id-number/{quote(id_number, safe='')}"
+    )
+
+    if response.status_code == status.HTTP_404_NOT_FOUND:
+        return None
+
+    if response.status_code != status.HTTP_200_OK:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=response.text
+        )
+
+    assistant = response.json()
+    if not isinstance(assistant, dict):
+        return None
+
+    return compact_assistant(assistant)
+
+
+async def record_attendance(
+    gateway,
+    event_id: int,
+    event_date_id: int,
+    assistant_id: int
+) -> dict:
+    """Helper function to record the attendance of an assistant in the
+    backend.
+
+    Returns its status: `registered`, `already_registered`,
+    `not_registered`, `unavailable` if the backend failed, or `error` with
+    the detail given by the backend.
+    """
+    response = await gateway.post(
+        f"/events/add/attendance/{event_date_id}/{event_id}/{assistant_id}"
+    )
+
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED):
+        return {"status": "registered"}
+
+    if response.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+        return {"status": "unavailable"}
+
+    try:
+        detail = response.json().get("detail")
+    except ValueError:
+        detail = response.text
+
+    if detail == "Registration not found":
+        return {"status": "not_registered"}
+
+    if isinstance(detail, str) and "Duplicate entry" in detail:
+        return {"status": "already_registered"}
+
+    return {"status": "error", "detail": detail}
+
+
+async def send_queued_attendance(
+    app: FastAPI,
+    event_id: int,
+    event_date_id: int,
+    assistant_id: int
+) -> bool:
+    """Helper function used by the attendance queue to send an attendance.
+
+    Returns whether the backend accepted it, and raises an exception if it
+    should be retried.
+    """
+    gateway = Gateway(app.state.http_client, get_settings().API_URL)
+    outcome = await record_attendance(
+        gateway, event_id, event_date_id, assistant_id
+    )
+
+    if outcome["status"] == "unavailable":
+        raise RuntimeError("Backend no disponible")
+
+    return outcome["status"] in ("registered", "already_registered")
+
+
+@app.post(
+    "/record-assistant/{event_id}/{event_date_id}/checkin",
+    summary="Endpoint to record the attendance of an assistant"
+)
+async def check_in_assistant(
+    principal: Annotated[Principal, Depends(require_role("staff", redirect=False))],
+    request: Request,
+    gateway: GatewayDependency,
+    event_id: Annotated[int, Path()],
+    event_date_id: Annotated[int, Path()],
+    id_number: Annotated[str | None, Form(max_length=50)] = None,
+    assistant_id: Annotated[int | None, Form()] = None,
+):
+    """Endpoint to record the attendance of an assistant in a single round
+    trip, given their ID (e.g. from face recognition) or their
+    identification number.
+
+    The identification number is resolved from the roster of the event
+    when it is loaded, and from the backend otherwise; the attendance is
+    then recorded from the server, over the pooled backend connection.
+
+    If the backend fails or does not answer within
+    `ATTENDANCE_QUEUE_TIMEOUT` seconds, the attendance is stored in the
+    attendance queue and sent in the background. Otherwise a failed queued
+    attendance of the same assistant is dismissed, as the staff now saw
+    the answer of the backend.
+
+    \f
+
+    :param request: Request object containing request information.
+    :type request: Request
+    :param id_number: Identification number of the assistant.
+    :type id_number: str | None
+    :param assistant_id: ID of the assistant, if already known.
+    :type assistant_id: int | None
+    :return: Outcome of the check-in (`registered`, `already_registered`,
+        `not_registered`, `not_found`, `queued` or `error`) and the
+        assistant.
+    :rtype: dict
+    """
+    assistant = None
+    if assistant_id is None:
+        id_number = (id_number or "").strip()
+        if not id_number:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Se requiere la identificación del asistente"
+            )
+
+        roster = request.app.state.roster_cache.rosters.get(event_id)
+        if roster is not None:
+            assistant = roster.find(id_number)
+        if assistant is None:
+            assistant = await find_assistant_by_id_number(gateway, id_number)
+        if assistant is None:
+            return {"status": "not_found", "assistant": None}
+
+        assistant_id = assistant["id"]
+
+    timeout = request.app.state.attendance_queue_timeout
+    outcome = {"status": "unavailable"}
+    if timeout > 0:
+        try:
+            outcome = await asyncio.wait_for(
+                record_attendance(gateway, event_id, event_date_id, assistant_id),
+                timeout
+            )
+        except (TimeoutError, httpx.TransportError):
+            pass
+
+    # Con el backend lento o caído la asistencia se envía más tarde
+    if outcome["status"] == "unavailable":
+        await request.app.state.attendance_queue.enqueue(
+            event_id, event_date_id, assistant_id
+        )
+        return {"status": "queued", "assistant": assistant}
+
+    # El personal ya vio la respuesta del backend para esta asistencia
+    await request.app.state.attendance_queue.dismiss(
+        event_id, event_date_id, assistant_id
+    )
+    return {**outcome, "assistant": assistant}
+
+
+def is_allowed_origin(connection: HTTPConnection, allowed: list[str]) -> bool:
+    """Helper function to check that a WebSocket connection was opened by a
+    page of this application, or of one of the `allowed` origins.
+
+    Browsers send the cookies of the application with a WebSocket opened by
+    any page, so the `Origin` header is the only way to tell them apart.
+    Clients other than browsers do not send it and are let through.
+    """
+    origin = connection.headers.get("origin")
+    if origin is None:
+        return True
+
+    return origin in allowed \
+        or urlsplit(origin).netloc == connection.headers.get("host")
+
+
+@app.websocket("/record-assistant/{event_id}/{event_date_id}/ws")
+async def record_assistant_ws(
+    websocket: WebSocket,
+    settings: SettingsDependency,
+    gateway: GatewayDependency,
+    event_id: Annotated[int, Path()],
+    event_date_id: Annotated[int, Path()],
+    principal: PrincipalDependency,
+):
+    """WebSocket endpoint for the continuous check-in mode.
+
+    The staff device sends camera frames as binary messages. Only the most
+    recent one is kept and at most one frame per
+    `CHECKIN_WS_MIN_INTERVAL` is sent to face recognition; each result is
+    pushed back as a JSON message with a `status` (`match`, `no_match`,
+    `no_face`, `already_assisted` or `error` when the backend failed) and
+    the matching `assistants`. The connection stays open after an error,
+    so the next frame is tried again.
+
+    Connections opened by pages of other sites are rejected, as are text
+    messages.
+
+    \f
+
+    :param websocket: WebSocket connection with the staff device.
+    :type websocket: WebSocket
+    :param event_id: ID of the event.
+    :type event_id: int
+    :param event_date_id: ID of the event date.
+    :type event_date_id: int
+    """
+    if principal is None or principal.role != "staff" \
+            or not is_allowed_origin(websocket, settings.CHECKIN_WS_ALLOWED_ORIGINS):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    throttle = FrameThrottle(settings.CHECKIN_WS_MIN_INTERVAL)
+
+    async def receive_frames():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+            frame = message.get("bytes")
+            # Los cuadros de la cámara siempre son mensajes binarios
+            if frame is None:
+                await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+                return
+
+            if settings.MAX_UPLOAD_BYTES <= 0 or len(frame) <= settings.MAX_UPLOAD_BYTES:
+                throttle.put(frame)
+
+    receiver = asyncio.create_task(receive_frames())
+    close_code = status.WS_1000_NORMAL_CLOSURE
+    try:
+        while True:
+            next_frame = asyncio.create_task(throttle.next())
+            await asyncio.wait(
+                {receiver, next_frame},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            # El dispositivo se desconectó
+            if receiver.done():
+                next_frame.cancel()
+                break
+
+            # Un fallo del backend con un cuadro no debe cerrar la conexión
+            try:
+                recognition = await recognize_assistants(
+                    websocket,
+                    gateway,
+                    BytesIO(next_frame.result()),
+                    "frame.jpg",
+                    "image/jpeg",
+                    event_id,
+                    event_date_id
+                )
+            except httpx.HTTPError:
+                recognition = RECOGNITION_BACKEND_ERROR
+
+            if recognition["alert_backend_error"]:
+                result = "error"
+            elif recognition["alert_no_face"]:
+                result = "no_face"
+            elif recognition["alert_already_assisted"]:
+                result = "already_assisted"
+            elif recognition["assistants"]:
+                result = "match"
+            else:
+                result = "no_match"
+
+            await websocket.send_json({
+                "status": result,
+                "assistants": [
+                    compact_assistant(assistant)
+                    for assistant in recognition["assistants"]
+                ],
+            })
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        close_code = status.WS_1011_INTERNAL_ERROR
+        raise
+    finally:
+        receiver.cancel()
+        await asyncio.gather(receiver, return_exceptions=True)
+        if not receiver.cancelled() and receiver.exception() is not None:
+            logger.error(
+                "Continuous check-in receiver failed",
+                exc_info=receiver.exception()
+            )
+            close_code = status.WS_1011_INTERNAL_ERROR
+
+        if websocket.application_state == WebSocketState.CONNECTED \
+                and websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.close(code=close_code)
+
+
 @app.get(
     "/events",
     response_class=HTMLResponse,
@@ -454,6 +1457,7 @@ async def record_assistant_with_data(
 async def events(
     request: Request,
     settings: SettingsDependency,
+    gateway: GatewayDependency,
     role: Annotated[str | None, Cookie()] = None,
     message: Annotated[str | None, Query()] = None,
 ):
@@ -467,24 +1471,24 @@ async def events(
     :rtype: _TemplateResponse
     """
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{settings.API_URL}/events/upcoming")
-
-    events = response.json()
-
-    if not events:
-        events = []  # or handle the empty case as needed
+    async def load():
+        events = await get_upcoming_events(request, gateway)
+        prefetch_event_images(request, gateway, events)
+        return {
+            "events": events,
+            "placeholders": await get_image_placeholders(request, events),
+        }
 
-    return templates.TemplateResponse(
-        request=request,
-        name="events.html.j2",
-        context={
+    return await request.app.state.template_streamer.response(
+        request,
+        "events.html.j2",
+        {
             "request": request,
-            "events": events,
             "role": role,
             "api_url": settings.API_URL,
             "message": message
-        }
+        },
+        load
     )
 
 
@@ -494,10 +1498,11 @@ async def events(
     summary="Endpoint to retrieve the select event to record page"
 )
 async def select_event_to_record(
+    principal: Annotated[Principal, Depends(require_role("staff"))],
     request: Request,
     settings: SettingsDependency,
-    access_token: Annotated[str, Cookie()],
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
+    access_token: AccessTokenDependency,
 ):
     """Endpoint to retrieve the select event to record page.
 
@@ -509,40 +1514,36 @@ async def select_event_to_record(
     :rtype: _TemplateResponse
     """
 
-    if role != "staff":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
+    async def load():
+        response = await gateway.get(
+            "/staff/my-events",
+            token=access_token
         )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/staff/my-events",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+        events = response.json()
 
-    events = response.json()
+        if not events:
+            events = []  # or handle the empty case as needed
 
-    if not events:
-        events = []  # or handle the empty case as needed
+        if not isinstance(events, list):
+            events = []
 
-    if not isinstance(events, list):
-        events = []
+        return {"events": events}
 
     # Get today's date for filtering events
     from datetime import date
     today = date.today().strftime('%Y-%m-%d')
 
-    return templates.TemplateResponse(
-        request=request,
-        name="select_event_to_record.html.j2",
-        context={
+    return await request.app.state.template_streamer.response(
+        request,
+        "select_event_to_record.html.j2",
+        {
             "request": request,
-            "events": events,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
             "today": today,
-        }
+        },
+        load
     )
 
 
@@ -561,7 +1562,8 @@ async def event_detail(
         )
     ],
     settings: SettingsDependency,
-    access_token: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
+    access_token: OptionalAccessTokenDependency = None,
 ):
     """Endpoint to retrieve the event detail page.
 
@@ -582,11 +1584,15 @@ async def event_detail(
             status_code=status.HTTP_303_SEE_OTHER
         )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/events/{event_id}",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    plan = FetchPlan(gateway)
+    plan.get("event", f"/events/{event_id}", token=access_token)
+    plan.get("registered", "/assistant/get-registered-events", token=access_token)
+    plan.add("user", lambda: gateway.get_identity(
+        "/assistant/info", access_token
+    ))
+    fetched = await plan.run()
+
+    response = fetched["event"]
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -607,16 +1613,8 @@ async def event_detail(
             detail="Event not found"
         )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/assistant/get-registered-events",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
-
-        user_response = await client.get(
-            f"{settings.API_URL}/assistant/info",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = fetched["registered"]
+    user_response = fetched["user"]
 
     registered_events_ids = []
 
@@ -656,6 +1654,7 @@ async def event_detail(
     summary="Endpoint to retrieve the edit event page"
 )
 async def edit_event(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
     event_id: Annotated[
         int,
@@ -664,9 +1663,9 @@ async def edit_event(
             description="The ID of the event to edit",
         )
     ],
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve the edit event page.
 
@@ -679,18 +1678,10 @@ async def edit_event(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/events/{event_id}",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = await gateway.get(
+        f"/events/{event_id}",
+        token=access_token
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -717,7 +1708,7 @@ async def edit_event(
         context={
             "request": request,
             "event": event,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -737,8 +1728,8 @@ async def register_to_event(
             description="The ID of the event to register to",
         )
     ],
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency
 ):
     """Endpoint to register to an event.
 
@@ -750,9 +1741,9 @@ async def register_to_event(
     :rtype: RedirectResponse
     """
 
-    response = requests.post(
-        f"{settings.API_URL}/assistant/register-to-event/{event_id}",
-        headers={"Authorization": f"Bearer {access_token}"}
+    response = await gateway.post(
+        f"/assistant/register-to-event/{event_id}",
+        token=access_token
     )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
@@ -787,8 +1778,8 @@ async def unregister_from_event(
             description="The ID of the event to unregister from",
         )
     ],
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency
 ):
     """Endpoint to unregister from an event.
 
@@ -800,9 +1791,9 @@ async def unregister_from_event(
     :rtype: RedirectResponse
     """
 
-    response = requests.delete(
-        f"{settings.API_URL}/assistant/unregister-from-event/{event_id}",
-        headers={"Authorization": f"Bearer {access_token}"}
+    response = await gateway.delete(
+        f"/assistant/unregister-from-event/{event_id}",
+        token=access_token
     )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
@@ -829,11 +1820,12 @@ async def unregister_from_event(
     summary="Endpoint to retrieve the add companion page"
 )
 async def add_companion(
+    principal: Annotated[Principal, Depends(require_role("assistant"))],
     request: Request,
     event_id: Annotated[int, Path()],
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve the add companion page.
 
@@ -844,15 +1836,9 @@ async def add_companion(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "assistant":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    response = requests.get(
-        f"{settings.API_URL}/events/{event_id}",
-        headers={"Authorization": f"Bearer {access_token}"}
+    response = await gateway.get(
+        f"/events/{event_id}",
+        token=access_token
     )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
@@ -881,6 +1867,57 @@ async def add_companion(
     )
 
 
+@app.post(
+    "/add-companion/{event_id}",
+    summary="Endpoint to add a companion to an event"
+)
+async def add_companion_to_event(
+    principal: Annotated[Principal, Depends(require_role("assistant", redirect=False))],
+    event_id: Annotated[int, Path()],
+    id_number: Annotated[str, Form(min_length=1, max_length=50)],
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency,
+):
+    """Endpoint to add a companion, given their identification number, to
+    the registration of the assistant in an event in a single round trip.
+
+    \f
+
+    :param id_number: Identification number of the companion.
+    :type id_number: str
+    :return: Outcome (`added`, `not_found` or `error`) and the companion.
+    :rtype: dict
+    """
+    companion = await find_assistant_by_id_number(gateway, id_number.strip())
+    if companion is None:
+        return {"status": "not_found", "companion": None}
+
+    response = await gateway.post(
+        f"/assistant/register-companion-to-event/{event_id}",
+        token=access_token,
+        data={
+            "companion_id": companion["id"],
+            "companion_type": "first_grade",
+        }
+    )
+
+    if response.status_code == status.HTTP_401_UNAUTHORIZED:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Sesión expirada"
+        )
+
+    companion = {
+        "first_name": companion["first_name"],
+        "last_name": companion["last_name"],
+    }
+
+    if response.status_code not in (status.HTTP_200_OK, status.HTTP_201_CREATED):
+        return {"status": "error", "companion": companion}
+
+    return {"status": "added", "companion": companion}
+
+
 @app.get(
     "/profile",
     response_class=HTMLResponse,
@@ -889,7 +1926,9 @@ async def add_companion(
 async def profile(
     request: Request,
     settings: SettingsDependency,
-    access_token: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
+    principal: PrincipalDependency,
+    access_token: OptionalAccessTokenDependency = None,
     role: Annotated[str | None, Cookie()] = None,
 ):
     """Endpoint to retrieve the profile page.
@@ -907,16 +1946,18 @@ async def profile(
             status_code=status.HTTP_303_SEE_OTHER
         )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/info",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    plan = FetchPlan(gateway)
+    plan.add("user", lambda: gateway.get_identity("/info", access_token))
+    plan.get("events_to_react", "/events/events-to-react", token=access_token)
+    # El rol de la sesión permite pedir la información del asistente a la vez
+    if (principal.role if principal else role) == "assistant":
+        plan.add("assistant", lambda: gateway.get_identity(
+            "/assistant/info", access_token
+        ))
+    fetched = await plan.run()
 
-        events_to_react = await client.get(
-            f"{settings.API_URL}/events/events-to-react",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = fetched["user"]
+    events_to_react = fetched["events_to_react"]
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -944,10 +1985,11 @@ async def profile(
     user = response.json()
 
     if user["role"] == "assistant":
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.API_URL}/assistant/info",
-                headers={"Authorization": f"Bearer {access_token}"}
+        response = fetched.get("assistant")
+        if response is None:
+            response = await gateway.get_identity(
+                "/assistant/info",
+                access_token
             )
 
         user = response.json()
@@ -979,8 +2021,9 @@ async def profile(
 )
 async def update_profile(
     request: Request,
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency,
+    principal: PrincipalDependency
 ):
     """Endpoint to handle profile partial update.
 
@@ -989,9 +2032,9 @@ async def update_profile(
     :param request: Request object containing request information.
     :type request: Request
     :param access_token: Access token from cookie.
-    :type access_token: str
-    :param settings: Application settings.
-    :type settings: SettingsDependency
+    :type access_token: str
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
     :return: Redirect response to the profile page.
     :rtype: RedirectResponse
     """
@@ -1037,15 +2080,21 @@ async def update_profile(
             detail="Al menos un campo debe ser proporcionado para actualizar"
         )
 
-    # Obtener información del usuario para determinar el endpoint correcto
-    user_info = await get_user_info(access_token, settings)
-    if isinstance(user_info, RedirectResponse):
-        return user_info
+    # La sesión firmada, ligada al token, ya indica el usuario; sin ella se
+    # pregunta al backend
+    if principal is not None:
+        user_id = principal.id
+        user_role = principal.role
+    else:
+        user_info = await get_user_info(access_token, gateway)
+        if isinstance(user_info, RedirectResponse):
+            return user_info
+
+        user_id = user_info.get("id")
+        user_role = user_info.get("role")
 
-    user_id = user_info.get("id")
-    user_role = user_info.get("role")
+        print(f"User info: {user_info}")
 
-    print(f"User info: {user_info}")
     print(f"User ID: {user_id}, User Role: {user_role}")
 
     if not user_id:
@@ -1056,7 +2105,7 @@ async def update_profile(
 
     # Realizar la actualización según el rol
     response = await perform_profile_update(
-        user_role, user_id, user_data, assistant_data, access_token, settings
+        user_role, user_id, user_data, assistant_data, access_token, gateway
     )
 
     print(f"Response status: {response.status_code}")
@@ -1081,20 +2130,34 @@ async def update_profile(
             detail=f"Error al actualizar perfil: {error_detail}"
         )
 
+    # La información del usuario en caché ya no es válida
+    request.app.state.identity_cache.invalidate(access_token)
+
     print(f"=== DEBUG UPDATE PROFILE SUCCESS ===")
-    return RedirectResponse(
+    response = RedirectResponse(
         url="/profile",
         status_code=status.HTTP_303_SEE_OTHER
     )
 
+    # El nombre guardado en la sesión debe seguir al del perfil. La página
+    # del perfil pide esta misma información, que queda en caché
+    if principal is not None and ("first_name" in user_data or "last_name" in user_data):
+        user_response = await gateway.get_identity("/info", access_token)
+        if user_response.status_code == status.HTTP_200_OK:
+            set_session_cookie(
+                request,
+                response,
+                request.app.state.session_signer.principal(
+                    user_response.json(), access_token
+                )
+            )
+
+    return response
+
 
-async def get_user_info(access_token: str, settings):
+async def get_user_info(access_token: str, gateway):
     """Helper function to get user information."""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/info",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = await gateway.get_identity("/info", access_token)
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -1117,7 +2180,7 @@ async def perform_profile_update(
     user_data: dict,
     assistant_data: dict,
     access_token: str,
-    settings
+    gateway
 ):
     """Helper function to perform the profile update based on user role."""
     print(f"=== DEBUG PROFILE UPDATE ===")
@@ -1126,101 +2189,98 @@ async def perform_profile_update(
     print(f"User Data Raw: {user_data}")
     print(f"Assistant Data Raw: {assistant_data}")
 
-    async with httpx.AsyncClient() as client:
-        if user_role == "staff":
-            update_url = f"{settings.API_URL}/staff/{user_id}"
-            print(f"Staff Update URL: {update_url}")
-            print(f"Staff Payload: {user_data}")
-            return await client.patch(
-                update_url,
-                headers={"Authorization": f"Bearer {access_token}"},
-                json=user_data
-            )
-        elif user_role == "organizer":
-            update_url = f"{settings.API_URL}/organizer/{user_id}"
-            print(f"Organizer Update URL: {update_url}")
-            print(f"Organizer Payload: {user_data}")
-            return await client.patch(
-                update_url,
-                headers={"Authorization": f"Bearer {access_token}"},
-                json=user_data
-            )
-        elif user_role == "assistant":
-            update_url = f"{settings.API_URL}/assistant/{user_id}"
-            print(f"Assistant Update URL: {update_url}")
-
-            # Validar los datos usando los modelos Pydantic antes de enviar
-            try:
-                from models.models import UserUpdate, AssistantUpdate
-                import json
-                from datetime import date
-
-                print(f"Creating UserUpdate with data: {user_data}")
-                print(f"Creating AssistantUpdate with data: {assistant_data}")
-
-                # Crear instancias de los modelos para validación
-                user_update_obj = UserUpdate(
-                    **user_data) if user_data else UserUpdate()
-                assistant_update_obj = AssistantUpdate(
-                    **assistant_data) if assistant_data else AssistantUpdate()
+    if user_role == "staff":
+        update_url = f"/staff/{user_id}"
+        print(f"Staff Update URL: {update_url}")
+        print(f"Staff Payload: {user_data}")
+        return await gateway.patch(
+            update_url,
+            token=access_token,
+            json=user_data
+        )
+    elif user_role == "organizer":
+        update_url = f"/organizer/{user_id}"
+        print(f"Organizer Update URL: {update_url}")
+        print(f"Organizer Payload: {user_data}")
+        return await gateway.patch(
+            update_url,
+            token=access_token,
+            json=user_data
+        )
+    elif user_role == "assistant":
+        update_url = f"/assistant/{user_id}"
+        print(f"Assistant Update URL: {update_url}")
 
-                print(f"UserUpdate object created: {user_update_obj}")
+        # Validar los datos usando los modelos Pydantic antes de enviar
+        try:
+            from models.models import UserUpdate, AssistantUpdate
+            import json
+            from datetime import date
+
+            print(f"Creating UserUpdate with data: {user_data}")
+            print(f"Creating AssistantUpdate with data: {assistant_data}")
+
+            # Crear instancias de los modelos para validación
+            user_update_obj = UserUpdate(
+                **user_data) if user_data else UserUpdate()
+            assistant_update_obj = AssistantUpdate(
+                **assistant_data) if assistant_data else AssistantUpdate()
+
+            print(f"UserUpdate object created: {user_update_obj}")
+            print(
+                f"AssistantUpdate object created: {assistant_update_obj}")
+
+            # Convertir a diccionarios excluyendo valores no configurados
+            user_update_dict = user_update_obj.model_dump(
+                exclude_unset=True)
+            assistant_update_dict = assistant_update_obj.model_dump(
+                exclude_unset=True)
+
+            print(f"UserUpdate dict: {user_update_dict}")
+            print(f"AssistantUpdate dict: {assistant_update_dict}")
+
+            # Convertir fechas a string ISO format si existen
+            if 'date_of_birth' in assistant_update_dict and assistant_update_dict['date_of_birth']:
                 print(
-                    f"AssistantUpdate object created: {assistant_update_obj}")
+                    f"Processing date_of_birth: {assistant_update_dict['date_of_birth']} (type: {type(assistant_update_dict['date_of_birth'])})")
+                if isinstance(assistant_update_dict['date_of_birth'], date):
+                    assistant_update_dict['date_of_birth'] = assistant_update_dict['date_of_birth'].isoformat(
+                    )
+                    print(
+                        f"Converted date_of_birth to: {assistant_update_dict['date_of_birth']}")
 
-                # Convertir a diccionarios excluyendo valores no configurados
-                user_update_dict = user_update_obj.model_dump(
-                    exclude_unset=True)
-                assistant_update_dict = assistant_update_obj.model_dump(
-                    exclude_unset=True)
+            # Crear el payload
+            payload = {}
+            if user_update_dict:
+                payload["user_update"] = user_update_dict
+            if assistant_update_dict:
+                payload["assistant_update"] = assistant_update_dict
 
-                print(f"UserUpdate dict: {user_update_dict}")
-                print(f"AssistantUpdate dict: {assistant_update_dict}")
+            print(f"Final payload: {payload}")
+            print(f"Payload JSON: {json.dumps(payload, default=str)}")
 
-                # Convertir fechas a string ISO format si existen
-                if 'date_of_birth' in assistant_update_dict and assistant_update_dict['date_of_birth']:
-                    print(
-                        f"Processing date_of_birth: {assistant_update_dict['date_of_birth']} (type: {type(assistant_update_dict['date_of_birth'])})")
-                    if isinstance(assistant_update_dict['date_of_birth'], date):
-                        assistant_update_dict['date_of_birth'] = assistant_update_dict['date_of_birth'].isoformat(
-                        )
-                        print(
-                            f"Converted date_of_birth to: {assistant_update_dict['date_of_birth']}")
-
-                # Crear el payload
-                payload = {}
-                if user_update_dict:
-                    payload["user_update"] = user_update_dict
-                if assistant_update_dict:
-                    payload["assistant_update"] = assistant_update_dict
-
-                print(f"Final payload: {payload}")
-                print(f"Payload JSON: {json.dumps(payload, default=str)}")
-
-                return await client.patch(
-                    update_url,
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": "application/json"
-                    },
-                    json=payload
-                )
+            return await gateway.patch(
+                update_url,
+                token=access_token,
+                headers={"Content-Type": "application/json"},
+                json=payload
+            )
 
-            except Exception as validation_error:
-                print(f"Validation error: {str(validation_error)}")
-                print(f"Error type: {type(validation_error)}")
-                import traceback
-                print(f"Traceback: {traceback.format_exc()}")
-                # Si hay un error de validación, manejarlo
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Error de validación: {str(validation_error)}"
-                )
-        else:
+        except Exception as validation_error:
+            print(f"Validation error: {str(validation_error)}")
+            print(f"Error type: {type(validation_error)}")
+            import traceback
+            print(f"Traceback: {traceback.format_exc()}")
+            # Si hay un error de validación, manejarlo
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Rol de usuario no soportado para actualización"
+                detail=f"Error de validación: {str(validation_error)}"
             )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Rol de usuario no soportado para actualización"
+        )
 
 
 @app.delete(
@@ -1229,8 +2289,9 @@ async def perform_profile_update(
 )
 async def delete_profile(
     request: Request,
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency,
+    principal: PrincipalDependency
 ):
     """Endpoint to delete user profile.
 
@@ -1240,41 +2301,42 @@ async def delete_profile(
     :type request: Request
     :param access_token: Access token from cookie.
     :type access_token: str
-    :param settings: Application settings.
-    :type settings: SettingsDependency
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
     :return: JSON response or redirect response depending on request type.
     :rtype: dict | RedirectResponse
     """
 
-    # Primero obtener información del usuario para determinar el endpoint correcto
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/info",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    # La sesión firmada, ligada al token, ya indica el usuario; sin ella se
+    # pregunta al backend
+    if principal is not None:
+        user_id = principal.id
+        user_role = principal.role
+    else:
+        response = await gateway.get_identity("/info", access_token)
 
-    if response.status_code == status.HTTP_401_UNAUTHORIZED:
-        # Si es una request AJAX/JavaScript, devolver JSON
-        if request.headers.get("accept") == "application/json":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="No autorizado"
+        if response.status_code == status.HTTP_401_UNAUTHORIZED:
+            # Si es una request AJAX/JavaScript, devolver JSON
+            if request.headers.get("accept") == "application/json":
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="No autorizado"
+                )
+            # Si es una request normal, redireccionar
+            return RedirectResponse(
+                url="/login",
+                status_code=status.HTTP_303_SEE_OTHER
             )
-        # Si es una request normal, redireccionar
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
 
-    if response.status_code != status.HTTP_200_OK:
-        raise HTTPException(
-            status_code=response.status_code,
-            detail="Error al obtener información del usuario"
-        )
+        if response.status_code != status.HTTP_200_OK:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail="Error al obtener información del usuario"
+            )
 
-    user_info = response.json()
-    user_id = user_info.get("id")
-    user_role = user_info.get("role")
+        user_info = response.json()
+        user_id = user_info.get("id")
+        user_role = user_info.get("role")
 
     if not user_id:
         raise HTTPException(
@@ -1284,23 +2346,22 @@ async def delete_profile(
 
     # Determinar el endpoint basado en el rol del usuario
     if user_role == "staff":
-        delete_url = f"{settings.API_URL}/staff/{user_id}"
+        delete_url = f"/staff/{user_id}"
     elif user_role == "organizer":
-        delete_url = f"{settings.API_URL}/organizer/{user_id}"
+        delete_url = f"/organizer/{user_id}"
     elif user_role == "assistant":
         # Para assistants, necesitamos usar un endpoint diferente si existe
-        delete_url = f"{settings.API_URL}/assistant/{user_id}"
+        delete_url = f"/assistant/{user_id}"
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Rol de usuario no soportado para eliminación"
         )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(
-            delete_url,
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = await gateway.delete(
+        delete_url,
+        token=access_token
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         # Si es una request AJAX/JavaScript, devolver JSON
@@ -1326,6 +2387,9 @@ async def delete_profile(
             detail=f"Error al eliminar perfil: {error_detail}"
         )
 
+    # El usuario ya no existe, su información en caché tampoco debe
+    request.app.state.identity_cache.invalidate(access_token)
+
     # Si es una request AJAX/JavaScript, devolver JSON de éxito
     if request.headers.get("accept") == "application/json":
         # También limpiar las cookies al eliminar el perfil
@@ -1345,10 +2409,10 @@ async def delete_profile(
     summary="Endpoint to retrieve the create staff page"
 )
 async def create_staff(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
 ):
     """Endpoint to retrieve the create staff page.
 
@@ -1359,19 +2423,12 @@ async def create_staff(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
     return templates.TemplateResponse(
         request=request,
         name="add_staff.html.j2",
         context={
             "request": request,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -1388,8 +2445,8 @@ async def handle_create_staff(
         Staff,
         Form()
     ],
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency,
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency,
 ):
     """Endpoint to handle create staff form submission.
 
@@ -1401,9 +2458,9 @@ async def handle_create_staff(
     :rtype: RedirectResponse
     """
 
-    response = requests.post(
-        f"{settings.API_URL}/staff/add",
-        headers={"Authorization": f"Bearer {access_token}"},
+    response = await gateway.post(
+        "/staff/add",
+        token=access_token,
         data=form.model_dump()
     )
 
@@ -1431,10 +2488,11 @@ async def handle_create_staff(
     summary="Endpoint to retrieve the staff management page"
 )
 async def staff_list(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve the staff management page with all staff members.
 
@@ -1449,18 +2507,10 @@ async def staff_list(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/staff/all",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = await gateway.get(
+        "/staff/all",
+        token=access_token
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -1483,7 +2533,7 @@ async def staff_list(
             "request": request,
             "staff_members": staff_members,
             "api_url": settings.API_URL,
-            "role": role,
+            "role": principal.role,
         }
     )
 
@@ -1494,11 +2544,12 @@ async def staff_list(
     summary="Endpoint to retrieve the edit staff page"
 )
 async def edit_staff_form(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
     staff_id: Annotated[int, Path()],
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve the edit staff page.
 
@@ -1515,19 +2566,11 @@ async def edit_staff_form(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        # Obtener información del staff específico
-        response = await client.get(
-            f"{settings.API_URL}/staff/all",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    # Obtener información del staff específico
+    response = await gateway.get(
+        "/staff/all",
+        token=access_token
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -1557,7 +2600,7 @@ async def edit_staff_form(
         context={
             "request": request,
             "staff_member": staff_member,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -1572,8 +2615,8 @@ async def edit_staff_form(
 async def update_staff(
     request: Request,
     staff_id: Annotated[int, Path()],
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency
 ):
     """Endpoint to handle staff update.
 
@@ -1585,8 +2628,8 @@ async def update_staff(
     :type staff_id: int
     :param access_token: Access token from cookie.
     :type access_token: str
-    :param settings: Application settings.
-    :type settings: SettingsDependency
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
     :return: Redirect response to the staff page.
     :rtype: RedirectResponse
     """
@@ -1621,12 +2664,11 @@ async def update_staff(
             detail=f"Error de validación: {str(validation_error)}"
         )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(
-            f"{settings.API_URL}/staff/{staff_id}",
-            headers={"Authorization": f"Bearer {access_token}"},
-            json=user_update_dict
-        )
+    response = await gateway.patch(
+        f"/staff/{staff_id}",
+        token=access_token,
+        json=user_update_dict
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -1658,8 +2700,8 @@ async def update_staff(
 async def delete_staff(
     request: Request,
     staff_id: Annotated[int, Path()],
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency
 ):
     """Endpoint to delete staff member.
 
@@ -1671,17 +2713,16 @@ async def delete_staff(
     :type staff_id: int
     :param access_token: Access token from cookie.
     :type access_token: str
-    :param settings: Application settings.
-    :type settings: SettingsDependency
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
     :return: JSON response or redirect response depending on request type.
     :rtype: dict | RedirectResponse
     """
 
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(
-            f"{settings.API_URL}/staff/{staff_id}",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = await gateway.delete(
+        f"/staff/{staff_id}",
+        token=access_token
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         # Si es una request AJAX/JavaScript, devolver JSON
@@ -1724,10 +2765,11 @@ async def delete_staff(
     summary="Endpoint to retrieve the organizers management page"
 )
 async def organizer_list(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve the organizers management page with all organizers.
 
@@ -1742,18 +2784,10 @@ async def organizer_list(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/organizer/all",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = await gateway.get(
+        "/organizer/all",
+        token=access_token
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -1776,7 +2810,7 @@ async def organizer_list(
             "request": request,
             "organizers": organizers,
             "api_url": settings.API_URL,
-            "role": role,
+            "role": principal.role,
         }
     )
 
@@ -1787,10 +2821,10 @@ async def organizer_list(
     summary="Endpoint to retrieve the create organizer page"
 )
 async def create_organizer(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
 ):
     """Endpoint to retrieve the create organizer page.
 
@@ -1801,18 +2835,12 @@ async def create_organizer(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
     return templates.TemplateResponse(
         request=request,
         name="add_organizer.html.j2",
         context={
             "request": request,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -1877,8 +2905,8 @@ async def handle_create_organizer(
     last_name: Annotated[str, Form()],
     email: Annotated[str, Form()],
     password: Annotated[str, Form()],
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency,
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency,
 ):
     """Endpoint to handle create organizer form submission.
 
@@ -1894,8 +2922,8 @@ async def handle_create_organizer(
     :type password: str
     :param access_token: Access token from cookie.
     :type access_token: str
-    :param settings: Application settings.
-    :type settings: SettingsDependency
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
     :return: Redirect response to the organizer page.
     :rtype: RedirectResponse
     """
@@ -1907,9 +2935,9 @@ async def handle_create_organizer(
         "password": password
     }
 
-    response = requests.post(
-        f"{settings.API_URL}/organizer/add",
-        headers={"Authorization": f"Bearer {access_token}"},
+    response = await gateway.post(
+        "/organizer/add",
+        token=access_token,
         data=organizer_data
     )
 
@@ -1937,19 +2965,30 @@ async def handle_create_organizer(
     summary="Endpoint to handle logout",
     status_code=status.HTTP_303_SEE_OTHER
 )
-async def logout():
+async def logout(
+    request: Request,
+    access_token: Annotated[str | None, Cookie()] = None,
+):
     """Endpoint to handle logout.
 
     \f
 
+    :param request: Request object containing request information.
+    :type request: Request
+    :param access_token: Access token from cookie.
+    :type access_token: str | None
     :return: Redirect response to the home page.
     :rtype: RedirectResponse
     """
 
+    if access_token:
+        request.app.state.identity_cache.invalidate(access_token)
+
     response = RedirectResponse(
         url="/home", status_code=status.HTTP_303_SEE_OTHER)
     response.delete_cookie(key="access_token")
     response.delete_cookie(key="role")
+    response.delete_cookie(key="session")
     return response
 
 
@@ -1987,11 +3026,12 @@ async def logout():
     summary="Endpoint to retrieve the edit organizer page"
 )
 async def edit_organizer_form(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
     organizer_id: Annotated[int, Path()],
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve the edit organizer page.
 
@@ -2008,18 +3048,11 @@ async def edit_organizer_form(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        # Primero obtenemos todos los organizadores
-        response = await client.get(
-            f"{settings.API_URL}/organizer/all",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    # Primero obtenemos todos los organizadores
+    response = await gateway.get(
+        "/organizer/all",
+        token=access_token
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -2055,7 +3088,7 @@ async def edit_organizer_form(
             "request": request,
             "organizer": organizer,
             "organizer_id": organizer_id,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -2069,8 +3102,8 @@ async def edit_organizer_form(
 )
 async def handle_edit_organizer(
     organizer_id: Annotated[int, Path()],
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency,
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency,
     first_name: Annotated[str, Form()] = "",
     last_name: Annotated[str, Form()] = "",
     email: Annotated[str, Form()] = "",
@@ -2092,8 +3125,8 @@ async def handle_edit_organizer(
     :type password: str
     :param access_token: Access token from cookie.
     :type access_token: str
-    :param settings: Application settings.
-    :type settings: SettingsDependency
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
     :return: Redirect response to the organizer page.
     :rtype: RedirectResponse
     """
@@ -2115,12 +3148,11 @@ async def handle_edit_organizer(
             detail="Debe proporcionar al menos un campo para actualizar"
         )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(
-            f"{settings.API_URL}/organizer/{organizer_id}",
-            headers={"Authorization": f"Bearer {access_token}"},
-            json=organizer_data
-        )
+    response = await gateway.patch(
+        f"/organizer/{organizer_id}",
+        token=access_token,
+        json=organizer_data
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -2147,8 +3179,8 @@ async def handle_edit_organizer(
 async def delete_organizer(
     request: Request,
     organizer_id: Annotated[int, Path()],
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency
 ):
     """Endpoint to delete an organizer.
 
@@ -2160,17 +3192,16 @@ async def delete_organizer(
     :type organizer_id: int
     :param access_token: Access token from cookie.
     :type access_token: str
-    :param settings: Application settings.
-    :type settings: SettingsDependency
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
     :return: JSON response or redirect response depending on request type.
     :rtype: dict | RedirectResponse
     """
 
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(
-            f"{settings.API_URL}/organizer/{organizer_id}",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = await gateway.delete(
+        f"/organizer/{organizer_id}",
+        token=access_token
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         # Si es una request AJAX/JavaScript, devolver JSON
@@ -2213,10 +3244,10 @@ async def delete_organizer(
     summary="Endpoint to retrieve the create event page"
 )
 async def create_event_page(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
 ):
     """Endpoint to retrieve the create event page.
 
@@ -2227,12 +3258,6 @@ async def create_event_page(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
     # Check if the user is an organizer
     # This is a placeholder, replace with actual logic to check user role
     # For example, decode the access_token or call an API endpoint
@@ -2242,7 +3267,7 @@ async def create_event_page(
         name="add_event.html.j2",
         context={
             "request": request,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -2255,8 +3280,9 @@ async def create_event_page(
     status_code=status.HTTP_303_SEE_OTHER
 )
 async def handle_create_event(
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency,
+    request: Request,
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency,
     name: Annotated[str, Form()],
     description: Annotated[str, Form()],
     location: Annotated[str, Form()],
@@ -2269,6 +3295,8 @@ async def handle_create_event(
 
     \\f
 
+    :param request: Request object containing request information.
+    :type request: Request
     :param name: Event name.
     :type name: str
     :param description: Event description.
@@ -2296,13 +3324,12 @@ async def handle_create_event(
     }
     files = {"image": (image.filename, image.file, image.content_type)}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{settings.API_URL}/events/add",
-            headers={"Authorization": f"Bearer {access_token}"},
-            data=event_data,
-            files=files
-        )
+    response = await gateway.post(
+        "/events/add",
+        token=access_token,
+        data=event_data,
+        files=files
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -2316,6 +3343,9 @@ async def handle_create_event(
             detail=response.text
         )
 
+    # El nuevo evento debe aparecer en la lista de próximos eventos
+    request.app.state.upcoming_events_cache.clear()
+
     return RedirectResponse(
         url="/all-events-view",  # Or perhaps a detail page for the newly created event
         status_code=status.HTTP_303_SEE_OTHER
@@ -2328,9 +3358,10 @@ async def handle_create_event(
     summary="Endpoint to retrieve the all events view page"
 )
 async def all_events_view(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None
+    gateway: GatewayDependency
 ):
     """Endpoint to retrieve the all events view page.
 
@@ -2341,32 +3372,29 @@ async def all_events_view(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{settings.API_URL}/events/all")
+    async def load():
+        response = await gateway.shared_get("/events/all")
 
-    events = response.json()
+        events = response.json()
 
-    if not events:
-        events = []
+        if not events:
+            events = []
 
-    if not isinstance(events, list):
-        events = []
+        if not isinstance(events, list):
+            events = []
 
-    return templates.TemplateResponse(
-        request=request,
-        name="all_events_view.html.j2",
-        context={
+        return {"events": events}
+
+    return await request.app.state.template_streamer.response(
+        request,
+        "all_events_view.html.j2",
+        {
             "request": request,
-            "events": events,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
-        }
+        },
+        load
     )
 
 
@@ -2377,22 +3405,20 @@ async def all_events_view(
 )
 async def staff(
     request: Request,
-    access_token: Annotated[str, Cookie()] = None,
+    gateway: GatewayDependency,
+    access_token: OptionalAccessTokenDependency = None,
     settings: SettingsDependency = None
 ):
     """Página de staff con todos los usuarios staff."""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/users/staff",
-            headers={
-                "Authorization": f"Bearer {access_token}"} if access_token else None
-        )
+    response = await gateway.get(
+        "/users/staff",
+        token=access_token
+    )
 
-        response = await client.get(
-            f"{settings.API_URL}/staff/all",
-            headers={
-                "Authorization": f"Bearer {access_token}"} if access_token else None
-        )
+    response = await gateway.get(
+        "/staff/all",
+        token=access_token
+    )
     organizers = response.json() if response.status_code == 200 else []
     return templates.TemplateResponse(
         request=request,
@@ -2411,10 +3437,11 @@ async def staff(
     summary="Endpoint to retrieve the event dates page"
 )
 async def event_dates_view(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
     event_id: int,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve the event dates page.
 
@@ -2427,14 +3454,7 @@ async def event_dates_view(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{settings.API_URL}/events/{event_id}/dates")
+    response = await gateway.get(f"/events/{event_id}/dates")
 
     event_dates = response.json()
 
@@ -2445,7 +3465,7 @@ async def event_dates_view(
             "request": request,
             "event_dates": event_dates,
             "event_id": event_id,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -2458,11 +3478,11 @@ async def event_dates_view(
     summary="Endpoint to retrieve the create event date page"
 )
 async def create_event_date_page(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
     event_id: int,
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
 ):
     """Endpoint to retrieve the create event date page.
 
@@ -2475,19 +3495,13 @@ async def create_event_date_page(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
     return templates.TemplateResponse(
         request=request,
         name="add_event_date.html.j2",
         context={
             "request": request,
             "event_id": event_id,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -2502,8 +3516,8 @@ async def create_event_date_page(
 async def handle_create_event_date(
     request: Request,
     event_id: int,
-    access_token: Annotated[str, Cookie()],
-    settings: SettingsDependency,
+    access_token: AccessTokenDependency,
+    gateway: GatewayDependency,
     day_date: Annotated[str, Form()],
     start_time: Annotated[str, Form()],
     end_time: Annotated[str, Form()],
@@ -2532,12 +3546,11 @@ async def handle_create_event_date(
         "end_time": end_time,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{settings.API_URL}/events/{event_id}/date/add",
-            headers={"Authorization": f"Bearer {access_token}"},
-            data=data
-        )
+    response = await gateway.post(
+        f"/events/{event_id}/date/add",
+        token=access_token,
+        data=data
+    )
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -2551,6 +3564,9 @@ async def handle_create_event_date(
             detail=response.text
         )
 
+    # La nueva fecha puede cambiar la lista de próximos eventos
+    request.app.state.upcoming_events_cache.clear()
+
     return RedirectResponse(
         url=f"/{event_id}/event-dates",
         status_code=status.HTTP_303_SEE_OTHER
@@ -2563,10 +3579,11 @@ async def handle_create_event_date(
     summary="Endpoint to retrieve the add staff to event page"
 )
 async def add_staff_to_event_page(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
-    access_token: Annotated[str, Cookie()],
+    access_token: AccessTokenDependency,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve the add staff to event page.
 
@@ -2577,18 +3594,13 @@ async def add_staff_to_event_page(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
     # Envía todos los staff al template y también todos los eventos
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/staff/all",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    plan = FetchPlan(gateway)
+    plan.get("staff", "/staff/all", token=access_token)
+    plan.get("events", "/events/upcoming", token=access_token)
+    fetched = await plan.run()
+
+    response = fetched["staff"]
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -2604,11 +3616,7 @@ async def add_staff_to_event_page(
 
     staff = response.json()
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/events/upcoming",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    response = fetched["events"]
 
     if response.status_code == status.HTTP_401_UNAUTHORIZED:
         return RedirectResponse(
@@ -2631,7 +3639,7 @@ async def add_staff_to_event_page(
             "request": request,
             "staff_list": staff,
             "events_list": events,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -2643,9 +3651,10 @@ async def add_staff_to_event_page(
     summary="Endpoint to retrieve all registered events"
 )
 async def all_registered_events(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve all registered events.
 
@@ -2656,16 +3665,9 @@ async def all_registered_events(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/events/registered/all"
-        )
+    response = await gateway.get(
+        "/events/registered/all"
+    )
 
     if response.status_code != status.HTTP_200_OK:
         raise HTTPException(
@@ -2681,7 +3683,7 @@ async def all_registered_events(
         context={
             "request": request,
             "registered_events": registered_events,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -2693,10 +3695,11 @@ async def all_registered_events(
     summary="Endpoint to retrieve registered users for a specific event"
 )
 async def registered_users_for_event(
+    principal: Annotated[Principal, Depends(require_role("organizer", "staff"))],
     event_id: Annotated[int, Path()],
     request: Request,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve registered users for a specific event.
 
@@ -2707,16 +3710,9 @@ async def registered_users_for_event(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role not in ["organizer", "staff"]:
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/events/registered/{event_id}"
-        )
+    response = await gateway.get(
+        f"/events/registered/{event_id}"
+    )
 
     if response.status_code != status.HTTP_200_OK:
         raise HTTPException(
@@ -2732,7 +3728,7 @@ async def registered_users_for_event(
         context={
             "request": request,
             "registered_events": registered_users,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -2744,9 +3740,10 @@ async def registered_users_for_event(
     summary="Endpoint to retrieve all event attendances"
 )
 async def all_event_attendances(
+    principal: Annotated[Principal, Depends(require_role("organizer"))],
     request: Request,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve all event attendances.
 
@@ -2757,16 +3754,9 @@ async def all_event_attendances(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role != "organizer":
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/events/attendances-users/all"
-        )
+    response = await gateway.get(
+        "/events/attendances-users/all"
+    )
 
     if response.status_code != status.HTTP_200_OK:
         raise HTTPException(
@@ -2782,7 +3772,7 @@ async def all_event_attendances(
         context={
             "request": request,
             "registered_events": event_attendances,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
         }
     )
@@ -2794,10 +3784,11 @@ async def all_event_attendances(
     summary="Endpoint to retrieve users who attended a specific event date"
 )
 async def users_attended_event_date(
+    principal: Annotated[Principal, Depends(require_role("organizer", "staff"))],
     event_date_id: Annotated[int, Path()],
     request: Request,
     settings: SettingsDependency,
-    role: Annotated[str | None, Cookie()] = None,
+    gateway: GatewayDependency,
 ):
     """Endpoint to retrieve users who attended a specific event date.
 
@@ -2810,25 +3801,15 @@ async def users_attended_event_date(
     :return: HTML response with the rendered template.
     :rtype: _TemplateResponse
     """
-    if role not in ["organizer", "staff"]:
-        return RedirectResponse(
-            url="/login",
-            status_code=status.HTTP_303_SEE_OTHER
-        )
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.API_URL}/events/attendances-users/{event_date_id}"
-        )
+    plan = FetchPlan(gateway)
+    plan.get("attendees", f"/events/attendances-users/{event_date_id}")
+    plan.get("event", f"/events/info-event-by-date/{event_date_id}")
+    plan.get("date", f"/events/info-event-date/{event_date_id}")
+    fetched = await plan.run()
 
-        # /info-event-by-date/{event_date_id}
-        event = await client.get(
-            f"{settings.API_URL}/events/info-event-by-date/{event_date_id}"
-        )
-        # /info-event-by-date/{event_date_id}
-        date = await client.get(
-            f"{settings.API_URL}/events/info-event-date/{event_date_id}"
-        )
+    response = fetched["attendees"]
+    event = fetched["event"]
+    date = fetched["date"]
 
     if response.status_code != status.HTTP_200_OK:
         raise HTTPException(
@@ -2846,9 +3827,48 @@ async def users_attended_event_date(
         context={
             "request": request,
             "registered_events": attendees,
-            "role": role,
+            "role": principal.role,
             "api_url": settings.API_URL,
             "event_info": event_info,
             "date_info": date_info,
         }
     )
+
+
+@app.get(
+    "/metrics",
+    summary="Endpoint to retrieve the performance counters of the worker"
+)
+async def metrics(
+    principal: Annotated[Principal, Depends(require_role("organizer", redirect=False))],
+    request: Request,
+):
+    """Endpoint to retrieve the performance counters of the worker. Only
+    organizers can read them, as they reveal the load and the backend
+    health.
+
+    \f
+
+    :param request: Request object containing request information.
+    :type request: Request
+    :return: Counters of the upstream optimizations of this worker.
+    :rtype: dict
+    """
+
+    return {
+        "single_flight": request.app.state.single_flight.stats(),
+        "upcoming_events_cache": request.app.state.upcoming_events_cache.stats(),
+        "identity_cache": request.app.state.identity_cache.stats(),
+        "image_cache": request.app.state.image_cache.stats(),
+        "placeholder_cache": request.app.state.placeholder_cache.stats(),
+        "image_prefetcher": request.app.state.image_prefetcher.stats(),
+        "image_normalizer": request.app.state.image_normalizer.stats(),
+        "face_detector": request.app.state.face_detector.stats(),
+        "recognition_cache": request.app.state.recognition_cache.stats(),
+        "roster_cache": request.app.state.roster_cache.stats(),
+        "attendance_queue": await request.app.state.attendance_queue.stats(),
+        "session": request.app.state.session_signer.stats(),
+        "token_guard": request.app.state.token_guard.stats(),
+        "templates": getattr(request.app.state, "template_stats", None),
+        "template_streamer": request.app.state.template_streamer.stats(),
+    }
@@ -0,0 +1,368 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attendance (
+    event_id INTEGER NOT NULL,
+    event_date_id INTEGER NOT NULL,
+    assistant_id INTEGER NOT NULL,
+    queued_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT,
+    PRIMARY KEY (event_date_id, event_id, assistant_id)
+)
+"""
+
+# Espera máxima, en segundos, entre dos reintentos de una asistencia
+MAX_BACKOFF = 60
+
+
+class AttendanceQueue:
+    """Durable queue of the attendances waiting to be sent to the backend.
+
+    When the backend is slow or unavailable, check-ins are stored in a
+    SQLite file and a background worker sends them in batches of
+    `batch_size`, every `flush_interval` seconds or as soon as a new one is
+    queued. An attendance is queued at most once: queuing it again while it
+    is pending does nothing.
+
+    The `send` function given to `start` returns whether the backend
+    accepted the attendance (an attendance already recorded counts as
+    accepted) and raises an exception if it should be retried; retries are
+    spaced exponentially and, after `max_attempts`, the attendance is kept
+    as failed. Failed attendances, including the ones the backend rejected,
+    are listed by `failed` until they are queued again or dismissed.
+
+    \f
+
+    :param path: Path of the SQLite file.
+    :type path: Path
+    :param batch_size: Maximum number of attendances sent at the same time.
+    :type batch_size: int
+    :param flush_interval: Seconds between two flushes when nothing new is
+        queued.
+    :type flush_interval: float
+    :param max_attempts: Attempts before an attendance is given up.
+    :type max_attempts: int
+    :param clock: Function returning the current time in seconds, since
+        the epoch, as the file outlives the process.
+    :type clock: Callable[[], float]
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int,
+        flush_interval: float,
+        max_attempts: int,
+        clock: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.connection: sqlite3.Connection | None = None
+        self.lock = threading.Lock()
+        self.wakeup = asyncio.Event()
+        self.worker: asyncio.Task | None = None
+        self.queued = 0
+        self.duplicates = 0
+        self.delivered = 0
+        self.rejected = 0
+        self.retries = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def execute(self, sql: str, parameters: Any = ()) -> tuple[int, list]:
+        """Runs a statement in its own transaction. This blocks on the file,
+        so it must be run outside of the event loop.
+
+        :param sql: SQL statement.
+        :type sql: str
+        :param parameters: Parameters of the statement, or a list of them to
+            run it once per item.
+        :type parameters: Any
+        :return: Number of rows changed and rows returned.
+        :rtype: tuple[int, list]
+        """
+        with self.lock:
+            if self.connection is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.connection = sqlite3.connect(
+                    self.path,
+                    check_same_thread=False
+                )
+                self.connection.execute("PRAGMA journal_mode=WAL")
+                self.connection.execute(SCHEMA)
+
+            with self.connection:
+                if isinstance(parameters, list):
+                    cursor = self.connection.executemany(sql, parameters)
+                else:
+                    cursor = self.connection.execute(sql, parameters)
+                return cursor.rowcount, cursor.fetchall()
+
+    async def enqueue(
+        self,
+        event_id: int,
+        event_date_id: int,
+        assistant_id: int
+    ) -> bool:
+        """Queues an attendance, unless it is already pending.
+
+        :param event_id: ID of the event.
+        :type event_id: int
+        :param event_date_id: ID of the event date.
+        :type event_date_id: int
+        :param assistant_id: ID of the assistant.
+        :type assistant_id: int
+        :return: Whether the attendance was queued.
+        :rtype: bool
+        """
+        now = self.clock()
+        changed, _ = await asyncio.to_thread(
+            self.execute,
+            """
+            INSERT INTO attendance
+                (event_id, event_date_id, assistant_id, queued_at, next_attempt_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT DO UPDATE SET
+                queued_at = excluded.queued_at,
+                next_attempt_at = excluded.next_attempt_at,
+                attempts = 0,
+                status = 'pending',
+                last_error = NULL
+            WHERE status = 'failed'
+            """,
+            (event_id, event_date_id, assistant_id, now, now)
+        )
+
+        if changed == 0:
+            self.duplicates += 1
+            return False
+
+        self.queued += 1
+        self.wakeup.set()
+        return True
+
+    async def flush(
+        self,
+        send: Callable[[int, int, int], Awaitable[bool]]
+    ) -> int:
+        """Sends a batch of the pending attendances that are due.
+
+        :param send: Function returning the awaitable that sends an
+            attendance (event, event date and assistant IDs).
+        :type send: Callable[[int, int, int], Awaitable[bool]]
+        :return: Number of attendances sent.
+        :rtype: int
+        """
+        now = self.clock()
+        _, rows = await asyncio.to_thread(
+            self.execute,
+            """
+            SELECT event_id, event_date_id, assistant_id, queued_at, attempts
+            FROM attendance
+            WHERE status = 'pending' AND next_attempt_at <= ?
+            ORDER BY queued_at
+            LIMIT ?
+            """,
+            (now, self.batch_size)
+        )
+        if not rows:
+            return 0
+
+        results = await asyncio.gather(
+            *(send(event_id, event_date_id, assistant_id)
+              for event_id, event_date_id, assistant_id, _, _ in rows),
+            return_exceptions=True
+        )
+
+        now = self.clock()
+        done = []
+        updates = []
+        for (event_id, event_date_id, assistant_id, queued_at, attempts), result \
+                in zip(rows, results):
+            key = (event_date_id, event_id, assistant_id)
+            if result is True:
+                self.delivered += 1
+                latency = now - queued_at
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+                done.append(key)
+            elif result is False or attempts + 1 >= self.max_attempts:
+                self.rejected += 1
+                error = "rejected" if result is False else repr(result)
+                updates.append(("failed", attempts + 1, now, error, *key))
+            else:
+                self.retries += 1
+                backoff = min(2 ** attempts, MAX_BACKOFF)
+                updates.append(
+                    ("pending", attempts + 1, now + backoff, repr(result), *key)
+                )
+
+        if done:
+            await asyncio.to_thread(
+                self.execute,
+                """
+                DELETE FROM attendance
+                WHERE event_date_id = ? AND event_id = ? AND assistant_id = ?
+                """,
+                done
+            )
+        if updates:
+            await asyncio.to_thread(
+                self.execute,
+                """
+                UPDATE attendance
+                SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+                WHERE event_date_id = ? AND event_id = ? AND assistant_id = ?
+                """,
+                updates
+            )
+
+        return len(rows)
+
+    async def failed(self, event_id: int, event_date_id: int) -> list[dict]:
+        """Returns the attendances of an event date that were given up, so
+        the staff can record them again.
+
+        :param event_id: ID of the event.
+        :type event_id: int
+        :param event_date_id: ID of the event date.
+        :type event_date_id: int
+        :return: Assistant ID, attempts, last error and queuing time of each
+            failed attendance, oldest first.
+        :rtype: list[dict]
+        """
+        _, rows = await asyncio.to_thread(
+            self.execute,
+            """
+            SELECT assistant_id, attempts, last_error, queued_at
+            FROM attendance
+            WHERE event_date_id = ? AND event_id = ? AND status = 'failed'
+            ORDER BY queued_at
+            """,
+            (event_date_id, event_id)
+        )
+        return [
+            {
+                "assistant_id": assistant_id,
+                "attempts": attempts,
+                "rejected": last_error == "rejected",
+                "last_error": last_error,
+                "queued_at": queued_at,
+            }
+            for assistant_id, attempts, last_error, queued_at in rows
+        ]
+
+    async def dismiss(
+        self,
+        event_id: int,
+        event_date_id: int,
+        assistant_id: int
+    ) -> bool:
+        """Removes a failed attendance, once the staff recorded it again.
+
+        :param event_id: ID of the event.
+        :type event_id: int
+        :param event_date_id: ID of the event date.
+        :type event_date_id: int
+        :param assistant_id: ID of the assistant.
+        :type assistant_id: int
+        :return: Whether a failed attendance was removed.
+        :rtype: bool
+        """
+        changed, _ = await asyncio.to_thread(
+            self.execute,
+            """
+            DELETE FROM attendance
+            WHERE event_date_id = ? AND event_id = ? AND assistant_id = ?
+                AND status = 'failed'
+            """,
+            (event_date_id, event_id, assistant_id)
+        )
+        return changed > 0
+
+    async def work(
+        self,
+        send: Callable[[int, int, int], Awaitable[bool]]
+    ) -> None:
+        """Flushes the queue until it is cancelled.
+
+        :param send: Function returning the awaitable that sends an
+            attendance.
+        :type send: Callable[[int, int, int], Awaitable[bool]]
+        """
+        while True:
+            self.wakeup.clear()
+            try:
+                sent = await self.flush(send)
+            except sqlite3.Error:
+                sent = 0
+
+            # Si el lote estaba lleno puede haber más asistencias pendientes
+            if sent >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.flush_interval)
+            except TimeoutError:
+                pass
+
+    def start(self, send: Callable[[int, int, int], Awaitable[bool]]) -> None:
+        """Starts the background worker, which also sends the attendances
+        left pending by a previous run.
+
+        :param send: Function returning the awaitable that sends an
+            attendance.
+        :type send: Callable[[int, int, int], Awaitable[bool]]
+        """
+        if self.worker is None:
+            self.wakeup = asyncio.Event()
+            self.worker = asyncio.ensure_future(self.work(send))
+
+    async def close(self) -> None:
+        """Stops the background worker and closes the file."""
+        if self.worker is not None:
+            self.worker.cancel()
+            await asyncio.gather(self.worker, return_exceptions=True)
+            self.worker = None
+
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    async def stats(self) -> dict[str, Any]:
+        """Returns the queue depth and the flush counters.
+
+        :return: Pending and failed attendances, queued, duplicate,
+            delivered, rejected and retried attendances, and the average and
+            maximum seconds from queuing to delivery.
+        :rtype: dict[str, Any]
+        """
+        # La tabla solo guarda las asistencias pendientes, así que es pequeña
+        _, rows = await asyncio.to_thread(
+            self.execute,
+            "SELECT status, COUNT(*) FROM attendance GROUP BY status"
+        )
+        counts = dict(rows)
+        return {
+            "pending": counts.get("pending", 0),
+            "failed": counts.get("failed", 0),
+            "queued": self.queued,
+            "duplicates": self.duplicates,
+            "delivered": self.delivered,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "latency_avg": self.latency_total / self.delivered if self.delivered else 0.0,
+            "latency_max": self.latency_max,
+        }
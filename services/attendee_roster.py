@@ -0,0 +1,328 @@
+import asyncio
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes a name or identification for searching: without accents,
+    case insensitive and with single spaces.
+
+    :param text: Text to normalize.
+    :type text: str
+    :return: Normalized text.
+    :rtype: str
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+    return " ".join(stripped.casefold().split())
+
+
+class Roster:
+    """In-memory index of the people registered to an event.
+
+    People are found by their exact identification number, or by a prefix
+    of their identification number, "first last" name or "last first" name,
+    using a sorted list of search keys and binary search.
+
+    Each person is a dict with at least `id`, `first_name`, `last_name` and
+    `id_number`.
+    """
+
+    def __init__(self):
+        self.people: dict[int, dict] = {}
+        self.by_id_number: dict[str, int] = {}
+        self.keys: list[tuple[str, int]] = []
+        self.loaded_at: float | None = None
+
+    def search_keys(self, person: dict) -> list[tuple[str, int]]:
+        """Returns the search keys of a person.
+
+        :param person: Registered person.
+        :type person: dict
+        :return: Sorted list entries pointing to the person.
+        :rtype: list[tuple[str, int]]
+        """
+        first_name = person.get("first_name") or ""
+        last_name = person.get("last_name") or ""
+        texts = {
+            person.get("id_number") or "",
+            f"{first_name} {last_name}",
+            f"{last_name} {first_name}",
+        }
+        return [
+            (key, person["id"])
+            for key in {normalize_text(text) for text in texts}
+            if key
+        ]
+
+    def add(self, person: dict) -> None:
+        """Indexes a person.
+
+        :param person: Registered person.
+        :type person: dict
+        """
+        self.people[person["id"]] = person
+        if person.get("id_number"):
+            self.by_id_number[person["id_number"]] = person["id"]
+        for key in self.search_keys(person):
+            insort(self.keys, key)
+
+    def remove(self, person_id: int) -> None:
+        """Removes a person from the index.
+
+        :param person_id: ID of the person.
+        :type person_id: int
+        """
+        person = self.people.pop(person_id)
+        if self.by_id_number.get(person.get("id_number")) == person_id:
+            del self.by_id_number[person["id_number"]]
+        for key in self.search_keys(person):
+            index = bisect_left(self.keys, key)
+            if index < len(self.keys) and self.keys[index] == key:
+                del self.keys[index]
+
+    def update(self, people: list[dict]) -> int:
+        """Applies a fresh list of registered people, touching only the
+        people added, changed or no longer registered.
+
+        :param people: Every person registered to the event.
+        :type people: list[dict]
+        :return: Number of people added, changed or removed.
+        :rtype: int
+        """
+        changes = 0
+        current = {person["id"]: person for person in people}
+
+        for person_id in self.people.keys() - current.keys():
+            self.remove(person_id)
+            changes += 1
+
+        for person_id, person in current.items():
+            previous = self.people.get(person_id)
+            if previous == person:
+                continue
+            if previous is not None:
+                self.remove(person_id)
+            self.add(person)
+            changes += 1
+
+        return changes
+
+    def find(self, id_number: str) -> dict | None:
+        """Returns the person with an identification number.
+
+        :param id_number: Identification number.
+        :type id_number: str
+        :return: Registered person or `None`.
+        :rtype: dict | None
+        """
+        person_id = self.by_id_number.get(id_number.strip())
+        return self.people.get(person_id) if person_id is not None else None
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """Returns the people whose identification number or name starts
+        with the query.
+
+        :param query: Beginning of an identification number or name.
+        :type query: str
+        :param limit: Maximum number of people returned.
+        :type limit: int
+        :return: Matching people, in alphabetical order of the matched key.
+        :rtype: list[dict]
+        """
+        prefix = normalize_text(query)
+        if not prefix:
+            return []
+
+        found: dict[int, dict] = {}
+        index = bisect_left(self.keys, (prefix,))
+        while index < len(self.keys) and len(found) < limit:
+            key, person_id = self.keys[index]
+            if not key.startswith(prefix):
+                break
+            found.setdefault(person_id, self.people[person_id])
+            index += 1
+
+        return list(found.values())
+
+
+class RosterCache:
+    """Keeps the roster of the events being checked in.
+
+    The first lookup of an event waits for its roster to be loaded; after
+    that, lookups are answered from memory. Once a roster is older than
+    `refresh_interval` seconds a lookup schedules a refresh in the
+    background and is answered with the current roster, and the refresh
+    only re-indexes the people that changed. Only the `max_events` events
+    used most recently are kept.
+
+    \f
+
+    :param refresh_interval: Seconds after which a roster is refreshed.
+    :type refresh_interval: float
+    :param max_events: Maximum number of rosters kept. `0` disables the
+        cache and every lookup loads the roster.
+    :type max_events: int
+    :param clock: Function returning the current time in seconds.
+    :type clock: Callable[[], float]
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float,
+        max_events: int,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.refresh_interval = refresh_interval
+        self.max_events = max_events
+        self.clock = clock
+        self.rosters: OrderedDict[int, Roster] = OrderedDict()
+        self.tasks: dict[int, asyncio.Task] = {}
+        self.lookups = 0
+        self.loads = 0
+        self.refreshes = 0
+        self.changes = 0
+        self.failed = 0
+
+    async def get(
+        self,
+        event_id: int,
+        fetch: Callable[[], Awaitable[list[dict]]]
+    ) -> Roster:
+        """Returns the roster of an event, loading it if it is missing.
+
+        :param event_id: ID of the event.
+        :type event_id: int
+        :param fetch: Function returning the awaitable that fetches the
+            people registered to the event.
+        :type fetch: Callable[[], Awaitable[list[dict]]]
+        :return: Roster of the event.
+        :rtype: Roster
+        """
+        self.lookups += 1
+
+        if self.max_events <= 0:
+            roster = Roster()
+            roster.update(await fetch())
+            self.loads += 1
+            return roster
+
+        roster = self.rosters.get(event_id)
+        if roster is None:
+            return await asyncio.shield(self.schedule(event_id, fetch))
+
+        self.rosters.move_to_end(event_id)
+        self.preload(event_id, fetch)
+        return roster
+
+    def preload(
+        self,
+        event_id: int,
+        fetch: Callable[[], Awaitable[list[dict]]]
+    ) -> None:
+        """Loads or refreshes the roster of an event in the background if it
+        is missing or stale.
+
+        :param event_id: ID of the event.
+        :type event_id: int
+        :param fetch: Function returning the awaitable that fetches the
+            people registered to the event.
+        :type fetch: Callable[[], Awaitable[list[dict]]]
+        """
+        if self.max_events <= 0:
+            return
+
+        roster = self.rosters.get(event_id)
+        if roster is not None \
+                and roster.loaded_at + self.refresh_interval > self.clock():
+            return
+
+        self.schedule(event_id, fetch)
+
+    def schedule(
+        self,
+        event_id: int,
+        fetch: Callable[[], Awaitable[list[dict]]]
+    ) -> asyncio.Task:
+        """Starts loading the roster of an event, or returns the load that
+        is already running.
+
+        :param event_id: ID of the event.
+        :type event_id: int
+        :param fetch: Function returning the awaitable that fetches the
+            people registered to the event.
+        :type fetch: Callable[[], Awaitable[list[dict]]]
+        :return: Task resolving to the roster.
+        :rtype: asyncio.Task
+        """
+        task = self.tasks.get(event_id)
+        if task is None:
+            task = asyncio.ensure_future(self.load(event_id, fetch))
+            self.tasks[event_id] = task
+            task.add_done_callback(lambda _: self.tasks.pop(event_id, None))
+            # Evita el aviso de excepción no recuperada en las recargas
+            task.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+        return task
+
+    async def load(
+        self,
+        event_id: int,
+        fetch: Callable[[], Awaitable[list[dict]]]
+    ) -> Roster:
+        """Fetches the people registered to an event and applies them to its
+        roster.
+
+        :param event_id: ID of the event.
+        :type event_id: int
+        :param fetch: Function returning the awaitable that fetches them.
+        :type fetch: Callable[[], Awaitable[list[dict]]]
+        :return: Updated roster.
+        :rtype: Roster
+        """
+        try:
+            people = await fetch()
+        except Exception:
+            self.failed += 1
+            raise
+
+        roster = self.rosters.get(event_id)
+        if roster is None:
+            roster = Roster()
+            roster.update(people)
+            self.loads += 1
+        else:
+            self.changes += roster.update(people)
+            self.refreshes += 1
+
+        roster.loaded_at = self.clock()
+        self.rosters[event_id] = roster
+        self.rosters.move_to_end(event_id)
+
+        while len(self.rosters) > self.max_events:
+            self.rosters.popitem(last=False)
+
+        return roster
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the roster counters.
+
+        :return: Lookups, full loads, refreshes, people re-indexed by the
+            refreshes, failed loads and the size of the cache.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "lookups": self.lookups,
+            "loads": self.loads,
+            "refreshes": self.refreshes,
+            "changes": self.changes,
+            "failed": self.failed,
+            "events": len(self.rosters),
+            "people": sum(len(roster.people) for roster in self.rosters.values()),
+        }
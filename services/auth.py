@@ -0,0 +1,97 @@
+from typing import Annotated, Callable
+
+from fastapi import Cookie, Depends, HTTPException, status
+from fastapi.requests import HTTPConnection
+
+from services.gateway import GatewayDependency
+from services.session import Principal
+from services.token_guard import OptionalAccessTokenDependency, SessionExpired
+
+
+class LoginRequired(Exception):
+    """Raised when a page needs a user with another role, or logged in."""
+
+
+class SessionMismatch(SessionExpired):
+    """Raised when the session cookie was issued with another access token,
+    so the user it names is not the one the token acts as."""
+
+
+async def get_principal(
+    request: HTTPConnection,
+    gateway: GatewayDependency,
+    access_token: OptionalAccessTokenDependency = None,
+    session: Annotated[str | None, Cookie()] = None
+) -> Principal | None:
+    """Returns the user logged in.
+
+    The user is read from the signed session cookie. Sessions started
+    before it existed only have the access token, and are resolved with
+    the identity cache. The result is kept in `request.state.principal`, so
+    it is resolved once per request and templates can use it.
+
+    A session cookie issued with another access token than the one sent is
+    rejected, as the routes would act on one user with the token of
+    another.
+
+    :param request: Request or WebSocket connection being handled.
+    :type request: HTTPConnection
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
+    :param access_token: Access token cookie, if any.
+    :type access_token: str | None
+    :param session: Session cookie, if any.
+    :type session: str | None
+    :raises SessionMismatch: If the session belongs to another token.
+    :return: Principal of the user, or `None` if nobody is logged in.
+    :rtype: Principal | None
+    """
+    if hasattr(request.state, "principal"):
+        return request.state.principal
+
+    signer = request.app.state.session_signer
+    principal = signer.loads(session) if session else None
+
+    if principal is not None and access_token \
+            and not signer.matches(principal, access_token):
+        raise SessionMismatch()
+
+    if principal is None and access_token:
+        response = await gateway.get_identity("/info", access_token)
+        if response.status_code == status.HTTP_200_OK:
+            principal = signer.principal(response.json(), access_token)
+
+    request.state.principal = principal
+    return principal
+
+
+PrincipalDependency = Annotated[Principal | None, Depends(get_principal)]
+
+
+def require_role(
+    *roles: str,
+    redirect: bool = True
+) -> Callable[..., Principal]:
+    """Builds a dependency that only lets through users with one of the
+    roles, e.g. `Depends(require_role("organizer", "staff"))`.
+
+    :param roles: Roles allowed.
+    :type roles: str
+    :param redirect: Whether other users are sent to the login page, as
+        pages do, or answered with `403 Forbidden`, as API endpoints do.
+    :type redirect: bool
+    :return: Dependency returning the principal of the user.
+    :rtype: Callable[..., Principal]
+    """
+
+    async def guard(principal: PrincipalDependency) -> Principal:
+        if principal is None or principal.role not in roles:
+            if redirect:
+                raise LoginRequired()
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="No autorizado"
+            )
+        return principal
+
+    return guard
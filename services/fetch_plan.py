@@ -0,0 +1,88 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import httpx
+from fastapi import status
+
+from services.gateway import Gateway
+
+
+class FetchPlan:
+    """Independent backend calls needed to render a page.
+
+    The calls are declared first and then run concurrently, so that the
+    latency of the page is the one of the slowest call instead of the sum
+    of all of them.
+
+    Errors are handled per call: a call that fails to reach the backend
+    does not cancel the others, its result is a `502 Bad Gateway` response
+    that the handler can check like any other status code.
+
+    \f
+
+    :param gateway: Gateway to the backend API.
+    :type gateway: Gateway
+    """
+
+    def __init__(self, gateway: Gateway):
+        self.gateway = gateway
+        self.calls: dict[str, Callable[[], Awaitable[Any]]] = {}
+
+    def add(
+        self,
+        name: str,
+        call: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """Adds a call to the plan.
+
+        :param name: Name used to retrieve the result of the call.
+        :type name: str
+        :param call: Function returning the awaitable to run.
+        :type call: Callable[[], Awaitable[Any]]
+        """
+        self.calls[name] = call
+
+    def get(
+        self,
+        name: str,
+        path: str,
+        token: str | None = None,
+        **kwargs: Any
+    ) -> None:
+        """Adds a GET request to the backend API to the plan.
+
+        :param name: Name used to retrieve the response.
+        :type name: str
+        :param path: Path of the endpoint, starting with `/`.
+        :type path: str
+        :param token: Access token of the user, if any.
+        :type token: str | None
+        """
+        self.add(
+            name,
+            lambda: self.gateway.get(path, token=token, **kwargs)
+        )
+
+    async def run(self) -> dict[str, Any]:
+        """Runs all the calls of the plan concurrently.
+
+        :return: Results of the calls by name.
+        :rtype: dict[str, Any]
+        """
+        results = await asyncio.gather(
+            *(call() for call in self.calls.values()),
+            return_exceptions=True
+        )
+
+        fetched = {}
+        for name, result in zip(self.calls, results):
+            if isinstance(result, httpx.HTTPError):
+                result = httpx.Response(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    json={"detail": f"Error al contactar el backend: {result}"}
+                )
+            elif isinstance(result, BaseException):
+                raise result
+            fetched[name] = result
+
+        return fetched
@@ -0,0 +1,130 @@
+import time
+from io import BytesIO
+from typing import Any, Callable
+
+from PIL import Image
+
+HASH_SIZE = 8
+
+
+def perceptual_hash(content: bytes) -> int:
+    """Computes the difference hash (dHash) of an image: 64 bits telling
+    whether each pixel of a tiny grayscale version is brighter than its
+    right neighbour. Near-identical photos get hashes differing in only a
+    few bits. This is CPU bound, so it must be run outside of the event
+    loop.
+
+    :param content: Bytes of the image.
+    :type content: bytes
+    :return: 64-bit perceptual hash.
+    :rtype: int
+    """
+    with Image.open(BytesIO(content)) as image:
+        # Decodifica a menor resolución cuando el formato lo permite (JPEG)
+        image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+        pixels = list(
+            image.convert("L")
+            .resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR)
+            .getdata()
+        )
+
+    value = 0
+    for row in range(HASH_SIZE):
+        for column in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + column]
+            right = pixels[row * (HASH_SIZE + 1) + column + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+class RecognitionCache:
+    """Short-lived cache of the face recognition results of each event
+    date, keyed by the perceptual hash of the face cropped from the photo.
+
+    Staff often capture the same person several times in a row; a face
+    whose hash is within `max_distance` bits of one recognized less than
+    `window` seconds ago gets the same result without calling the backend.
+    The hash must be of the face alone: on whole frames from a fixed camera
+    the background dominates and different people hash alike.
+
+    \f
+
+    :param window: Seconds a result is reused. `0` disables the cache.
+    :type window: float
+    :param max_distance: Maximum number of differing hash bits for two
+        photos to be considered the same.
+    :type max_distance: int
+    :param clock: Function returning the current time in seconds.
+    :type clock: Callable[[], float]
+    """
+
+    def __init__(
+        self,
+        window: float,
+        max_distance: int,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.window = window
+        self.max_distance = max_distance
+        self.clock = clock
+        self.entries: dict[Any, list[tuple[float, int, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, scope: Any, photo_hash: int) -> Any | None:
+        """Returns the result of a recent near-identical photo, if any.
+
+        :param scope: Event date the photo belongs to.
+        :type scope: Any
+        :param photo_hash: Perceptual hash of the photo.
+        :type photo_hash: int
+        :return: Previous result or `None`.
+        :rtype: Any | None
+        """
+        now = self.clock()
+        entries = [
+            entry for entry in self.entries.get(scope, []) if entry[0] > now
+        ]
+        if entries:
+            self.entries[scope] = entries
+        else:
+            self.entries.pop(scope, None)
+
+        for _, entry_hash, result in reversed(entries):
+            if (entry_hash ^ photo_hash).bit_count() <= self.max_distance:
+                self.hits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    def put(self, scope: Any, photo_hash: int, result: Any) -> None:
+        """Stores the result of a photo.
+
+        :param scope: Event date the photo belongs to.
+        :type scope: Any
+        :param photo_hash: Perceptual hash of the photo.
+        :type photo_hash: int
+        :param result: Recognition result.
+        :type result: Any
+        """
+        if self.window <= 0:
+            return
+
+        self.entries.setdefault(scope, []).append(
+            (self.clock() + self.window, photo_hash, result)
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the hit and miss counters.
+
+        :return: Hits, misses, hit ratio and number of stored results.
+        :rtype: dict[str, Any]
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": sum(len(entries) for entries in self.entries.values()),
+        }
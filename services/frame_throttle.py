@@ -0,0 +1,89 @@
+import asyncio
+import hashlib
+import time
+from typing import Any, Callable
+
+
+class FrameThrottle:
+    """Paces the camera frames of a continuous check-in connection.
+
+    The staff device sends frames faster than face recognition can answer,
+    so only the most recent frame is kept: a frame arriving while another
+    is waiting replaces it. Frames identical to the last forwarded one are
+    dropped, and forwarded frames are spaced at least `min_interval`
+    seconds apart.
+
+    \f
+
+    :param min_interval: Minimum seconds between two forwarded frames.
+    :type min_interval: float
+    :param clock: Function returning the current time in seconds.
+    :type clock: Callable[[], float]
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.min_interval = min_interval
+        self.clock = clock
+        self.pending: bytes | None = None
+        self.available = asyncio.Event()
+        self.last_forwarded_at: float | None = None
+        self.last_digest: bytes | None = None
+        self.received = 0
+        self.forwarded = 0
+        self.dropped = 0
+
+    def put(self, frame: bytes) -> None:
+        """Offers a new frame, replacing the one waiting, if any.
+
+        :param frame: Bytes of the frame.
+        :type frame: bytes
+        """
+        self.received += 1
+
+        if hashlib.sha256(frame).digest() == self.last_digest:
+            self.dropped += 1
+            return
+
+        if self.pending is not None:
+            self.dropped += 1
+        self.pending = frame
+        self.available.set()
+
+    async def next(self) -> bytes:
+        """Waits for the next frame to forward.
+
+        :return: Most recent frame once the minimum interval has passed.
+        :rtype: bytes
+        """
+        await self.available.wait()
+
+        if self.last_forwarded_at is not None:
+            wait = self.last_forwarded_at + self.min_interval - self.clock()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        # Durante la espera pudo llegar un cuadro más reciente
+        frame = self.pending
+        self.pending = None
+        self.available.clear()
+
+        self.last_forwarded_at = self.clock()
+        self.last_digest = hashlib.sha256(frame).digest()
+        self.forwarded += 1
+        return frame
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the frame counters.
+
+        :return: Received, forwarded and dropped frames.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "received": self.received,
+            "forwarded": self.forwarded,
+            "dropped": self.dropped,
+        }
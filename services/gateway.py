@@ -0,0 +1,254 @@
+from typing import Annotated, Any
+
+import httpx
+from fastapi import Depends
+from fastapi.requests import HTTPConnection
+
+from config import SettingsDependency
+from services.http_client import HttpClientDependency
+from services.identity_cache import IdentityCache
+from services.single_flight import SingleFlight
+
+
+# Endpoints de identidad, que solo se piden a través de la caché
+IDENTITY_PATHS = frozenset({"/info", "/assistant/info"})
+
+
+class Gateway:
+    """Asynchronous gateway to the backend API.
+
+    Every call made by the routes to the backend goes through this class, so
+    that they all share the pooled client and never block the event loop.
+
+    \f
+
+    :param client: Shared asynchronous HTTP client.
+    :type client: httpx.AsyncClient
+    :param api_url: Base URL of the backend API.
+    :type api_url: str
+    :param single_flight: Coalescer shared by the requests of the worker.
+    :type single_flight: SingleFlight | None
+    :param identity_cache: Identity cache shared by the requests of the worker.
+    :type identity_cache: IdentityCache | None
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        api_url: str,
+        single_flight: SingleFlight | None = None,
+        identity_cache: IdentityCache | None = None
+    ):
+        self.client = client
+        self.api_url = api_url
+        self.single_flight = single_flight or SingleFlight()
+        self.identity_cache = identity_cache or IdentityCache(
+            ttl=0,
+            max_entries=0
+        )
+
+    def url(self, path: str) -> str:
+        """Builds the absolute URL of a backend endpoint.
+
+        :param path: Path of the endpoint, starting with `/`.
+        :type path: str
+        :return: Absolute URL of the endpoint.
+        :rtype: str
+        """
+        return f"{self.api_url}{path}"
+
+    @staticmethod
+    def headers(
+        token: str | None,
+        headers: dict[str, str] | None = None
+    ) -> dict[str, str]:
+        """Adds the bearer token to the request headers.
+
+        :param token: Access token of the user, if any.
+        :type token: str | None
+        :param headers: Extra headers to send.
+        :type headers: dict[str, str] | None
+        :return: Headers to send to the backend.
+        :rtype: dict[str, str]
+        """
+        headers = dict(headers or {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return headers
+
+    async def get(
+        self,
+        path: str,
+        token: str | None = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a GET request to the backend API.
+
+        :param path: Path of the endpoint, starting with `/`.
+        :type path: str
+        :param token: Access token of the user, if any.
+        :type token: str | None
+        :raises ValueError: If the path is an identity endpoint, which must
+            be requested with `get_identity`.
+        :return: Response of the backend.
+        :rtype: httpx.Response
+        """
+        if path in IDENTITY_PATHS:
+            raise ValueError(f"{path} must be requested with get_identity")
+
+        return await self.client.get(
+            self.url(path),
+            headers=self.headers(token, kwargs.pop("headers", None)),
+            **kwargs
+        )
+
+    async def shared_get(self, path: str, **kwargs: Any) -> httpx.Response:
+        """Sends a GET request for a resource that is the same for every user.
+
+        Identical requests in flight at the same time are collapsed into a
+        single backend call whose response is shared by all the callers, so
+        the response must not be modified. No access token is sent.
+
+        :param path: Path of the endpoint, starting with `/`.
+        :type path: str
+        :return: Response of the backend.
+        :rtype: httpx.Response
+        """
+        key = str(httpx.URL(self.url(path), params=kwargs.get("params")))
+        return await self.single_flight.do(
+            key,
+            lambda: self.get(path, **kwargs)
+        )
+
+    async def stream(
+        self,
+        path: str,
+        token: str | None = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a GET request to the backend API without reading the body.
+
+        The body is read chunk by chunk with `aiter_bytes`, and the caller
+        must release the connection with `aclose` when done.
+
+        :param path: Path of the endpoint, starting with `/`.
+        :type path: str
+        :param token: Access token of the user, if any.
+        :type token: str | None
+        :return: Response of the backend, with its body still unread.
+        :rtype: httpx.Response
+        """
+        request = self.client.build_request(
+            "GET",
+            self.url(path),
+            headers=self.headers(token, kwargs.pop("headers", None)),
+            **kwargs
+        )
+        return await self.client.send(request, stream=True)
+
+    async def get_identity(self, path: str, token: str) -> httpx.Response:
+        """Sends a GET request to an identity endpoint (`/info` or
+        `/assistant/info`), reusing the recent answer for the same token.
+
+        :param path: Path of the identity endpoint.
+        :type path: str
+        :param token: Access token of the user.
+        :type token: str
+        :return: Response of the backend, or the cached one.
+        :rtype: httpx.Response
+        """
+        return await self.identity_cache.get(
+            path,
+            token,
+            lambda: self.client.get(self.url(path), headers=self.headers(token))
+        )
+
+    async def post(
+        self,
+        path: str,
+        token: str | None = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a POST request to the backend API.
+
+        :param path: Path of the endpoint, starting with `/`.
+        :type path: str
+        :param token: Access token of the user, if any.
+        :type token: str | None
+        :return: Response of the backend.
+        :rtype: httpx.Response
+        """
+        return await self.client.post(
+            self.url(path),
+            headers=self.headers(token, kwargs.pop("headers", None)),
+            **kwargs
+        )
+
+    async def patch(
+        self,
+        path: str,
+        token: str | None = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a PATCH request to the backend API.
+
+        :param path: Path of the endpoint, starting with `/`.
+        :type path: str
+        :param token: Access token of the user, if any.
+        :type token: str | None
+        :return: Response of the backend.
+        :rtype: httpx.Response
+        """
+        return await self.client.patch(
+            self.url(path),
+            headers=self.headers(token, kwargs.pop("headers", None)),
+            **kwargs
+        )
+
+    async def delete(
+        self,
+        path: str,
+        token: str | None = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a DELETE request to the backend API.
+
+        :param path: Path of the endpoint, starting with `/`.
+        :type path: str
+        :param token: Access token of the user, if any.
+        :type token: str | None
+        :return: Response of the backend.
+        :rtype: httpx.Response
+        """
+        return await self.client.delete(
+            self.url(path),
+            headers=self.headers(token, kwargs.pop("headers", None)),
+            **kwargs
+        )
+
+
+def get_gateway(
+    request: HTTPConnection,
+    client: HttpClientDependency,
+    settings: SettingsDependency
+) -> Gateway:
+    """Returns the gateway to the backend API for the current request.
+
+    :param request: Request or WebSocket connection being handled.
+    :type request: HTTPConnection
+    :param client: Shared asynchronous HTTP client.
+    :type client: httpx.AsyncClient
+    :param settings: Settings object containing the API URL.
+    :type settings: Settings
+    :return: Gateway to the backend API.
+    :rtype: Gateway
+    """
+    return Gateway(
+        client,
+        settings.API_URL,
+        request.app.state.single_flight,
+        request.app.state.identity_cache
+    )
+
+
+GatewayDependency = Annotated[Gateway, Depends(get_gateway)]
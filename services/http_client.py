@@ -0,0 +1,46 @@
+from typing import Annotated
+
+import httpx
+from fastapi import Depends
+from fastapi.requests import HTTPConnection
+
+from config import Settings
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """Creates the HTTP client shared by all the requests to the backend API.
+    The client keeps a pool of keep-alive connections so that each page view
+    does not pay a new TCP (and TLS) handshake.
+
+    :param settings: Settings object containing the pool limits and timeouts.
+    :type settings: Settings
+    :return: Configured asynchronous HTTP client.
+    :rtype: httpx.AsyncClient
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=settings.HTTP_READ_TIMEOUT,
+            write=settings.HTTP_WRITE_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        ),
+    )
+
+
+def get_http_client(request: HTTPConnection) -> httpx.AsyncClient:
+    """Returns the HTTP client created in the application lifespan.
+
+    :param request: Request or WebSocket connection being handled.
+    :type request: HTTPConnection
+    :return: Shared asynchronous HTTP client.
+    :rtype: httpx.AsyncClient
+    """
+    return request.app.state.http_client
+
+
+HttpClientDependency = Annotated[httpx.AsyncClient, Depends(get_http_client)]
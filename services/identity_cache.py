@@ -0,0 +1,118 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+import httpx
+from fastapi import status
+
+
+class IdentityCache:
+    """Short-lived cache of the identity lookups (`/info`, `/assistant/info`)
+    made with the access token of a user.
+
+    Entries are keyed by a SHA-256 hash of the token, so the raw token is
+    never kept in memory, and only the JSON body of successful responses is
+    stored. When the cache is full the least recently used entry is evicted.
+
+    \f
+
+    :param ttl: Seconds an entry is kept. `0` disables the cache.
+    :type ttl: float
+    :param max_entries: Maximum number of entries kept.
+    :type max_entries: int
+    :param clock: Function returning the current time in seconds.
+    :type clock: Callable[[], float]
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def token_hash(token: str) -> str:
+        """Returns the hash used to key the entries of a token.
+
+        :param token: Access token of the user.
+        :type token: str
+        :return: Hexadecimal SHA-256 hash of the token.
+        :rtype: str
+        """
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    async def get(
+        self,
+        path: str,
+        token: str,
+        fetch: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Returns the identity of the user, fetching it if missing or
+        expired. Only `200 OK` responses are cached.
+
+        :param path: Path of the identity endpoint.
+        :type path: str
+        :param token: Access token of the user.
+        :type token: str
+        :param fetch: Function returning the awaitable that calls the backend.
+        :type fetch: Callable[[], Awaitable[httpx.Response]]
+        :return: Cached or fresh response of the backend.
+        :rtype: httpx.Response
+        """
+        key = (self.token_hash(token), path)
+
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > self.clock():
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return httpx.Response(status_code=status.HTTP_200_OK, json=entry[1])
+
+        self.misses += 1
+        response = await fetch()
+
+        if response.status_code == status.HTTP_200_OK and self.ttl > 0:
+            self.entries[key] = (self.clock() + self.ttl, response.json())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        elif entry is not None:
+            # Otra petición pudo borrar la entrada mientras se esperaba al backend
+            self.entries.pop(key, None)
+
+        return response
+
+    def invalidate(self, token: str) -> None:
+        """Removes the cached identity of a token, e.g. after the profile was
+        updated or deleted, or the user logged out.
+
+        :param token: Access token of the user.
+        :type token: str
+        """
+        token_hash = self.token_hash(token)
+        for key in [key for key in self.entries if key[0] == token_hash]:
+            self.entries.pop(key, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the hit, miss and eviction counters.
+
+        :return: Hits, misses, hit ratio, evictions and number of entries.
+        :rtype: dict[str, Any]
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+        }
@@ -0,0 +1,341 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+# Segundos tras los que un archivo temporal se considera abandonado
+TEMP_MAX_AGE = 3600
+
+
+@dataclass
+class CachedImage:
+    """Image stored in the image cache.
+
+    \f
+
+    :param path: Path of the file holding the image bytes.
+    :type path: Path
+    :param size: Size of the image in bytes.
+    :type size: int
+    :param media_type: Content type sent by the backend.
+    :type media_type: str
+    :param filename: File name sent by the backend.
+    :type filename: str
+    """
+
+    path: Path
+    size: int
+    media_type: str
+    filename: str
+
+
+class ImageCache:
+    """On-disk cache of the event images, keyed by their UUID.
+
+    An image UUID always points to the same content, so cached images never
+    expire; they are only evicted, least recently used first, when the
+    cache grows beyond its byte budget.
+
+    Each image is stored as `<uuid>` with its content type and file name in
+    `<uuid>.json`. Files are written to a temporary file first and then
+    renamed, so a reader never sees a partial image. The index of the
+    cached images is kept in memory and rebuilt from the directory when the
+    worker starts.
+
+    The directory may be shared by several workers, each with its own
+    index, so an indexed image can disappear when another worker evicts
+    it; `get` then reports it as not cached.
+
+    \f
+
+    :param directory: Directory where the images are stored.
+    :type directory: Path
+    :param max_bytes: Maximum size of the cached images. `0` disables the
+        cache.
+    :type max_bytes: int
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, CachedImage] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.max_bytes > 0:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.load()
+
+    def load(self) -> None:
+        """Rebuilds the index from the images already on disk, oldest
+        accessed first. Temporary files older than `TEMP_MAX_AGE` are
+        leftovers of interrupted writes and are removed; newer ones, and
+        images without metadata yet, may belong to another worker still
+        writing them and are left alone."""
+        found = []
+        for meta_path in self.directory.glob("*.json"):
+            path = meta_path.with_suffix("")
+            try:
+                meta = json.loads(meta_path.read_text())
+                stat = path.stat()
+            except (OSError, ValueError):
+                meta_path.unlink(missing_ok=True)
+                continue
+            found.append((stat.st_mtime, path.name, CachedImage(
+                path=path,
+                size=stat.st_size,
+                media_type=meta.get("media_type", ""),
+                filename=meta.get("filename", "image"),
+            )))
+
+        for _, key, image in sorted(found, key=lambda item: item[0]):
+            self.entries[key] = image
+            self.size += image.size
+
+        # Restos de escrituras interrumpidas
+        expired = time.time() - TEMP_MAX_AGE
+        for path in self.directory.glob("*.tmp"):
+            try:
+                if path.stat().st_mtime < expired:
+                    path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+        self.evict()
+
+    def get(self, key: str) -> CachedImage | None:
+        """Returns the cached image, if any.
+
+        :param key: UUID of the image.
+        :type key: str
+        :return: Cached image or `None` if it is not cached.
+        :rtype: CachedImage | None
+        """
+        image = self.entries.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+
+        try:
+            # La fecha de modificación conserva el orden LRU entre reinicios
+            os.utime(image.path)
+        except FileNotFoundError:
+            # Otro worker que comparte el directorio la expulsó
+            del self.entries[key]
+            self.size -= image.size
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return image
+
+    def writer(
+        self,
+        key: str,
+        media_type: str,
+        filename: str
+    ) -> "ImageWriter | None":
+        """Starts storing an image whose bytes arrive in chunks.
+
+        :param key: UUID of the image.
+        :type key: str
+        :param media_type: Content type sent by the backend.
+        :type media_type: str
+        :param filename: File name sent by the backend.
+        :type filename: str
+        :return: Writer of the image or `None` if the cache is disabled.
+        :rtype: ImageWriter | None
+        """
+        if self.max_bytes <= 0:
+            return None
+        return ImageWriter(self, key, media_type, filename)
+
+    async def put(
+        self,
+        key: str,
+        content: bytes,
+        media_type: str,
+        filename: str
+    ) -> CachedImage | None:
+        """Stores an image. Images bigger than the whole budget are not
+        stored.
+
+        :param key: UUID of the image.
+        :type key: str
+        :param content: Bytes of the image.
+        :type content: bytes
+        :param media_type: Content type sent by the backend.
+        :type media_type: str
+        :param filename: File name sent by the backend.
+        :type filename: str
+        :return: Cached image or `None` if it was not stored.
+        :rtype: CachedImage | None
+        """
+        writer = self.writer(key, media_type, filename)
+        if writer is None:
+            return None
+
+        await writer.write(content)
+        return await writer.commit()
+
+    def add(self, image: CachedImage) -> None:
+        """Adds an image already written to disk to the index.
+
+        :param image: Image to add.
+        :type image: CachedImage
+        """
+        previous = self.entries.pop(image.path.name, None)
+        if previous is not None:
+            self.size -= previous.size
+
+        self.entries[image.path.name] = image
+        self.size += image.size
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used images until the cache fits in
+        its byte budget."""
+        while self.size > self.max_bytes and self.entries:
+            _, image = self.entries.popitem(last=False)
+            self.size -= image.size
+            self.evictions += 1
+            image.path.with_suffix(".json").unlink(missing_ok=True)
+            image.path.unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the hit, miss and eviction counters.
+
+        :return: Hits, misses, hit ratio, evictions, number of images and
+            bytes used.
+        :rtype: dict[str, Any]
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.size,
+        }
+
+
+class ImageWriter:
+    """Writes an image to the cache as its bytes arrive.
+
+    The bytes go to a temporary file in the cache directory that is only
+    renamed to its final name by `commit`, so an interrupted download never
+    leaves a partial image behind. If the image turns out to be bigger than
+    the whole budget the writer stops storing it.
+
+    \f
+
+    :param cache: Cache the image is stored in.
+    :type cache: ImageCache
+    :param key: UUID of the image.
+    :type key: str
+    :param media_type: Content type sent by the backend.
+    :type media_type: str
+    :param filename: File name sent by the backend.
+    :type filename: str
+    """
+
+    def __init__(
+        self,
+        cache: ImageCache,
+        key: str,
+        media_type: str,
+        filename: str
+    ):
+        self.cache = cache
+        self.path = cache.directory / key
+        self.media_type = media_type
+        self.filename = filename
+        self.size = 0
+        fd, temp_name = tempfile.mkstemp(dir=cache.directory, suffix=".tmp")
+        self.temp_path = Path(temp_name)
+        self.file: BinaryIO | None = os.fdopen(fd, "wb")
+
+    async def write(self, chunk: bytes) -> None:
+        """Appends a chunk of the image.
+
+        :param chunk: Bytes of the image.
+        :type chunk: bytes
+        """
+        if self.file is None:
+            return
+
+        self.size += len(chunk)
+        if self.size > self.cache.max_bytes:
+            self.abort()
+            return
+
+        # La escritura a disco no debe bloquear el event loop
+        await asyncio.to_thread(self.file.write, chunk)
+
+    async def commit(self) -> CachedImage | None:
+        """Moves the image to its final name and adds it to the index.
+
+        :return: Cached image or `None` if it was not stored.
+        :rtype: CachedImage | None
+        """
+        if self.file is None:
+            return None
+
+        file, self.file = self.file, None
+        meta = json.dumps({
+            "media_type": self.media_type,
+            "filename": self.filename
+        })
+        try:
+            await asyncio.to_thread(self.finish, file, meta)
+        except BaseException:
+            self.temp_path.unlink(missing_ok=True)
+            raise
+
+        image = CachedImage(
+            path=self.path,
+            size=self.size,
+            media_type=self.media_type,
+            filename=self.filename
+        )
+        self.cache.add(image)
+        return image
+
+    def finish(self, file: BinaryIO, meta: str) -> None:
+        """Closes the temporary file and atomically renames it, then
+        writes the metadata of the image.
+
+        :param file: Temporary file holding the image.
+        :type file: BinaryIO
+        :param meta: JSON metadata of the image.
+        :type meta: str
+        """
+        file.close()
+        os.replace(self.temp_path, self.path)
+
+        fd, temp_name = tempfile.mkstemp(dir=self.cache.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as meta_file:
+                meta_file.write(meta.encode())
+            os.replace(temp_name, self.path.with_suffix(".json"))
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    def abort(self) -> None:
+        """Discards the image."""
+        if self.file is None:
+            return
+
+        self.file.close()
+        self.file = None
+        self.temp_path.unlink(missing_ok=True)
@@ -0,0 +1,119 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, BinaryIO
+
+from PIL import Image, ImageOps
+
+
+def normalize_image(file: BinaryIO, max_dimension: int, quality: int) -> bytes:
+    """Decodes an image, applies its EXIF orientation, shrinks it to fit in
+    a square of `max_dimension` pixels and re-encodes it as JPEG. This is
+    CPU bound, so it must be run outside of the event loop.
+
+    :param file: File holding the original image.
+    :type file: BinaryIO
+    :param max_dimension: Maximum width and height in pixels.
+    :type max_dimension: int
+    :param quality: JPEG quality, from 1 to 95.
+    :type quality: int
+    :return: Bytes of the normalized JPEG image.
+    :rtype: bytes
+    :raises OSError: If the image cannot be decoded.
+    """
+    with Image.open(file) as original:
+        # Decodifica a menor resolución cuando el formato lo permite (JPEG)
+        original.draft("RGB", (max_dimension, max_dimension))
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=quality, optimize=True)
+
+    return buffer.getvalue()
+
+
+class ImageNormalizer:
+    """Normalizes the check-in photos before they are sent to face
+    recognition.
+
+    Phone cameras produce full-resolution captures, often as PNG, while
+    recognition only needs a few hundred pixels of face. Normalizing them
+    cuts the upload to the backend and its decoding time. The work runs in
+    a dedicated thread pool, so that at most `workers` photos are processed
+    at once and the event loop is never blocked.
+
+    \f
+
+    :param max_dimension: Maximum width and height in pixels. `0` disables
+        the normalization.
+    :type max_dimension: int
+    :param quality: JPEG quality, from 1 to 95.
+    :type quality: int
+    :param workers: Number of threads processing photos.
+    :type workers: int
+    """
+
+    def __init__(self, max_dimension: int, quality: int, workers: int):
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(workers, 1),
+            thread_name_prefix="image-normalizer"
+        )
+        self.normalized = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def normalize(self, file: BinaryIO) -> bytes | None:
+        """Normalizes a photo.
+
+        :param file: File holding the original photo.
+        :type file: BinaryIO
+        :return: Bytes of the normalized JPEG photo, or `None` if the
+            normalization is disabled or the photo cannot be decoded.
+        :rtype: bytes | None
+        """
+        if self.max_dimension <= 0:
+            return None
+
+        size = file.seek(0, 2)
+        file.seek(0)
+
+        try:
+            content = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                normalize_image,
+                file,
+                self.max_dimension,
+                self.quality
+            )
+        except (OSError, Image.DecompressionBombError):
+            # UnidentifiedImageError es un OSError; una bomba de descompresión no
+            self.failed += 1
+            file.seek(0)
+            return None
+
+        self.normalized += 1
+        self.bytes_in += size
+        self.bytes_out += len(content)
+        return content
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the normalization counters.
+
+        :return: Normalized and failed photos, bytes received and sent and
+            the resulting size ratio.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "normalized": self.normalized,
+            "failed": self.failed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "size_ratio": self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+        }
@@ -0,0 +1,122 @@
+import asyncio
+import base64
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageOps
+
+from services.image_cache import ImageCache
+
+PLACEHOLDER_WIDTH = 20
+
+
+def render_placeholder(path: Path) -> str:
+    """Renders a tiny JPEG version of an image as a data URI. This is CPU
+    bound, so it must be run outside of the event loop.
+
+    :param path: Path of the original image.
+    :type path: Path
+    :return: Data URI of the placeholder.
+    :rtype: str
+    """
+    with Image.open(path) as original:
+        # Decodifica a menor resolución cuando el formato lo permite (JPEG)
+        original.draft("RGB", (PLACEHOLDER_WIDTH * 8, PLACEHOLDER_WIDTH * 8))
+        image = ImageOps.exif_transpose(original).convert("RGB")
+        image.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH * 4))
+
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=50)
+
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return f"data:image/jpeg;base64,{encoded}"
+
+
+class PlaceholderCache:
+    """In-memory cache of the low-quality placeholders of the event images,
+    keyed by their UUID.
+
+    A placeholder is only computed from an original already in the image
+    cache, so rendering a listing never waits for the backend. Images whose
+    original is not cached yet simply get no placeholder. When the cache is
+    full the least recently used placeholder is evicted.
+
+    \f
+
+    :param image_cache: Cache holding the original images.
+    :type image_cache: ImageCache
+    :param max_entries: Maximum number of placeholders kept. `0` disables
+        the placeholders.
+    :type max_entries: int
+    """
+
+    def __init__(self, image_cache: ImageCache, max_entries: int):
+        self.image_cache = image_cache
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> str | None:
+        """Returns the placeholder of an image, computing it if the original
+        is cached.
+
+        :param key: UUID of the image.
+        :type key: str
+        :return: Data URI of the placeholder or `None` if not available.
+        :rtype: str | None
+        """
+        placeholder = self.entries.get(key)
+        if placeholder is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return placeholder
+
+        self.misses += 1
+        original = self.image_cache.entries.get(key)
+        if original is None or self.max_entries <= 0:
+            return None
+
+        try:
+            placeholder = await asyncio.to_thread(
+                render_placeholder, original.path
+            )
+        except (OSError, Image.DecompressionBombError):
+            return None
+
+        self.entries[key] = placeholder
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return placeholder
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Returns the available placeholders of several images.
+
+        :param keys: UUIDs of the images.
+        :type keys: list[str]
+        :return: Data URIs of the placeholders by UUID.
+        :rtype: dict[str, str]
+        """
+        placeholders = await asyncio.gather(*(self.get(key) for key in keys))
+        return {
+            key: placeholder
+            for key, placeholder in zip(keys, placeholders)
+            if placeholder is not None
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the hit and miss counters.
+
+        :return: Hits, misses, hit ratio and number of placeholders.
+        :rtype: dict[str, Any]
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+        }
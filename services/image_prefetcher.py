@@ -0,0 +1,142 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from services.image_cache import ImageCache
+
+# Imágenes precargadas recordadas para medir cuántas se usaron después
+MAX_TRACKED = 4096
+
+
+class ImagePrefetcher:
+    """Downloads event images into the image cache in the background.
+
+    When a listing page is rendered the browser asks for every card image
+    shortly after, so the handlers schedule those images here and the
+    browser requests find them already cached. At most `concurrency`
+    downloads run at the same time, and images already cached or already
+    scheduled are skipped.
+
+    An image counts as used when it is requested after being scheduled,
+    whether its download already finished (it is then served from the
+    cache) or is still running (the request joins it). The ratio of used to
+    scheduled images is the prefetch hit rate.
+
+    \f
+
+    :param image_cache: Cache the images are downloaded into.
+    :type image_cache: ImageCache
+    :param concurrency: Maximum number of simultaneous downloads. `0`
+        disables the prefetching.
+    :type concurrency: int
+    """
+
+    def __init__(self, image_cache: ImageCache, concurrency: int):
+        self.image_cache = image_cache
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self.tasks: dict[str, asyncio.Task] = {}
+        self.prefetched: OrderedDict[str, None] = OrderedDict()
+        self.scheduled = 0
+        self.fetched = 0
+        self.failed = 0
+        self.used = 0
+
+    def schedule(
+        self,
+        keys: list[str],
+        fetch: Callable[[str], Awaitable[Any]]
+    ) -> None:
+        """Schedules the download of the images not cached yet.
+
+        :param keys: UUIDs of the images.
+        :type keys: list[str]
+        :param fetch: Function returning the awaitable that downloads an
+            image into the cache, or returns `None` if it was not stored.
+        :type fetch: Callable[[str], Awaitable[Any]]
+        """
+        if self.concurrency <= 0 or self.image_cache.max_bytes <= 0:
+            return
+
+        for key in keys:
+            if key in self.image_cache.entries or key in self.tasks:
+                continue
+
+            self.scheduled += 1
+            self.track(key)
+            task = asyncio.ensure_future(self.run(key, fetch))
+            self.tasks[key] = task
+            task.add_done_callback(lambda _, key=key: self.tasks.pop(key, None))
+
+    async def run(
+        self,
+        key: str,
+        fetch: Callable[[str], Awaitable[Any]]
+    ) -> None:
+        """Downloads an image once a download slot is free.
+
+        :param key: UUID of the image.
+        :type key: str
+        :param fetch: Function returning the awaitable that downloads it.
+        :type fetch: Callable[[str], Awaitable[Any]]
+        """
+        async with self.semaphore:
+            # Pudo haberse descargado mientras esperaba su turno
+            if key in self.image_cache.entries:
+                return
+
+            try:
+                image = await fetch(key)
+            except Exception:
+                image = None
+
+        if image is None:
+            self.failed += 1
+            self.prefetched.pop(key, None)
+            return
+
+        self.fetched += 1
+
+    def track(self, key: str) -> None:
+        """Remembers a scheduled image until it is requested.
+
+        :param key: UUID of the image.
+        :type key: str
+        """
+        self.prefetched[key] = None
+        while len(self.prefetched) > MAX_TRACKED:
+            self.prefetched.popitem(last=False)
+
+    def claim(self, key: str) -> None:
+        """Records that an image was requested, counting it as used if it
+        was scheduled.
+
+        :param key: UUID of the image.
+        :type key: str
+        """
+        if key in self.prefetched:
+            del self.prefetched[key]
+            self.used += 1
+
+    async def close(self) -> None:
+        """Cancels the pending downloads."""
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the prefetch counters.
+
+        :return: Scheduled, fetched, failed, pending and used prefetches,
+            and the hit rate of the scheduled ones.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "scheduled": self.scheduled,
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "pending": len(self.tasks),
+            "used": self.used,
+            "hit_rate": self.used / self.scheduled if self.scheduled else 0.0,
+        }
@@ -0,0 +1,113 @@
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageOps, features
+
+# Anchos en los que se generan variantes, para acotar cuántas se guardan
+WIDTHS = (320, 400, 640, 800, 1200, 1600)
+
+PRESETS = {
+    "thumbnail": 320,
+    "card": 800,
+    "detail": 1200,
+}
+
+# Formatos que se negocian con el encabezado Accept, en orden de preferencia
+FORMATS = {
+    "avif": ("image/avif", "AVIF", {"quality": 60}),
+    "webp": ("image/webp", "WEBP", {"quality": 80, "method": 4}),
+}
+
+FALLBACK_OPTIONS = {
+    "JPEG": {"quality": 85, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+}
+
+
+def variant_width(width: int | None, preset: str | None) -> int | None:
+    """Returns the width of the variant to generate.
+
+    The requested width is rounded up to the next width in `WIDTHS`, so
+    that arbitrary widths do not fill the cache with near-identical images.
+
+    :param width: Requested width in pixels, if any.
+    :type width: int | None
+    :param preset: Name of a preset in `PRESETS`, if any.
+    :type preset: str | None
+    :return: Width of the variant or `None` for the original image.
+    :rtype: int | None
+    """
+    if preset is not None:
+        return PRESETS[preset]
+
+    if width is None:
+        return None
+
+    return next((allowed for allowed in WIDTHS if allowed >= width), WIDTHS[-1])
+
+
+def negotiate_format(accept: str | None) -> str | None:
+    """Returns the best modern format accepted by the client.
+
+    :param accept: `Accept` header of the request.
+    :type accept: str | None
+    :return: Key of `FORMATS` or `None` to keep the original format.
+    :rtype: str | None
+    """
+    accepted = set()
+    for item in (accept or "").split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        if "q=0" in params or "q=0.0" in params:
+            continue
+        accepted.add(media_type.lower())
+
+    for name, (media_type, pil_format, _) in FORMATS.items():
+        if media_type in accepted and features.check(pil_format.lower()):
+            return name
+
+    return None
+
+
+def render_variant(
+    path: Path,
+    width: int,
+    image_format: str | None
+) -> tuple[bytes, str, str]:
+    """Resizes and re-encodes an image. This is CPU bound, so it must be
+    run outside of the event loop.
+
+    Images narrower than the width are only re-encoded, never enlarged.
+
+    :param path: Path of the original image.
+    :type path: Path
+    :param width: Maximum width of the variant in pixels.
+    :type width: int
+    :param image_format: Key of `FORMATS` or `None` to keep the original
+        format.
+    :type image_format: str | None
+    :return: Bytes, content type and file extension of the variant.
+    :rtype: tuple[bytes, str, str]
+    """
+    with Image.open(path) as original:
+        pil_format = original.format or "PNG"
+        image = ImageOps.exif_transpose(original)
+
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        if image_format is not None:
+            media_type, pil_format, options = FORMATS[image_format]
+        else:
+            if pil_format not in FALLBACK_OPTIONS:
+                pil_format = "PNG" if "A" in image.getbands() else "JPEG"
+            media_type = Image.MIME[pil_format]
+            options = FALLBACK_OPTIONS[pil_format]
+
+        if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        buffer = BytesIO()
+        image.save(buffer, format=pil_format, **options)
+
+    return buffer.getvalue(), media_type, pil_format.lower()
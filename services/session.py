@@ -0,0 +1,178 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from itsdangerous import BadSignature, URLSafeSerializer
+
+
+@dataclass(frozen=True)
+class Principal:
+    """User authenticated by the session cookie."""
+
+    id: int
+    role: str
+    name: str
+    expires_at: int
+    token_digest: str
+
+
+def token_digest(token: str) -> str:
+    """Digest of an access token, stored in the session cookie to tie it to
+    the token it was issued with.
+
+    :param token: Access token issued by the backend.
+    :type token: str
+    :return: Hexadecimal SHA-256 digest of the token.
+    :rtype: str
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_expiry(token: str) -> int | None:
+    """Reads the expiry (`exp` claim) of a JWT access token, without
+    verifying its signature: only the backend can do that, this is just to
+    know when the session ends.
+
+    :param token: Access token issued by the backend.
+    :type token: str
+    :return: Expiry as a Unix timestamp, or `None` if the token is not a
+        JWT or has no expiry.
+    :rtype: int | None
+    """
+    try:
+        payload = token.split(".")[1]
+        padding = "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload + padding))
+        return int(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class SessionSigner:
+    """Signs and verifies the session cookie.
+
+    The cookie holds the ID, role and display name of the user, the expiry
+    of their access token and a digest of it, signed with `secret`, so that
+    the routes know who is logged in without asking the backend. The digest
+    ties the cookie to the access token cookie sent along with it.
+
+    \f
+
+    :param secret: Key used to sign the cookie.
+    :type secret: str
+    :param max_age: Seconds a session lasts when the access token has no
+        expiry.
+    :type max_age: int
+    :param clock: Function returning the current Unix time in seconds.
+    :type clock: Callable[[], float]
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        max_age: int,
+        clock: Callable[[], float] = time.time
+    ):
+        self.serializer = URLSafeSerializer(secret, salt="session")
+        self.max_age = max_age
+        self.clock = clock
+        self.verified = 0
+        self.rejected = 0
+
+    def principal(self, user: dict, token: str) -> Principal:
+        """Builds the principal of a user just logged in.
+
+        :param user: User information returned by the backend (`/info`).
+        :type user: dict
+        :param token: Access token of the user.
+        :type token: str
+        :return: Principal of the user.
+        :rtype: Principal
+        """
+        name = f"{user.get('first_name') or ''} {user.get('last_name') or ''}"
+        return Principal(
+            id=user["id"],
+            role=user["role"],
+            name=name.strip(),
+            expires_at=token_expiry(token) or int(self.clock()) + self.max_age,
+            token_digest=token_digest(token)
+        )
+
+    def dumps(self, principal: Principal) -> str:
+        """Signs a principal into a cookie value.
+
+        :param principal: Principal of the user.
+        :type principal: Principal
+        :return: Signed cookie value.
+        :rtype: str
+        """
+        return self.serializer.dumps([
+            principal.id,
+            principal.role,
+            principal.name,
+            principal.expires_at,
+            principal.token_digest,
+        ])
+
+    def loads(self, value: str) -> Principal | None:
+        """Verifies a cookie value.
+
+        :param value: Signed cookie value.
+        :type value: str
+        :return: Principal of the user, or `None` if the signature is not
+            valid or the session expired.
+        :rtype: Principal | None
+        """
+        try:
+            principal = Principal(*self.serializer.loads(value))
+        except (BadSignature, TypeError):
+            self.rejected += 1
+            return None
+
+        if principal.expires_at <= self.clock():
+            self.rejected += 1
+            return None
+
+        self.verified += 1
+        return principal
+
+    def matches(self, principal: Principal, token: str) -> bool:
+        """Checks whether a session was issued with an access token.
+
+        :param principal: Principal read from the session cookie.
+        :type principal: Principal
+        :param token: Access token sent along with the session cookie.
+        :type token: str
+        :return: Whether the session belongs to the token.
+        :rtype: bool
+        """
+        if hmac.compare_digest(principal.token_digest, token_digest(token)):
+            return True
+        self.rejected += 1
+        return False
+
+    def max_age_of(self, principal: Principal) -> int:
+        """Returns the seconds left in a session, for the cookie max age.
+
+        :param principal: Principal of the user.
+        :type principal: Principal
+        :return: Seconds until the session expires.
+        :rtype: int
+        """
+        return max(principal.expires_at - int(self.clock()), 0)
+
+    def stats(self) -> dict[str, int]:
+        """Returns the verification counters.
+
+        :return: Cookies verified locally and cookies rejected.
+        :rtype: dict[str, int]
+        """
+        return {
+            "verified": self.verified,
+            "rejected": self.rejected,
+        }
+
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """Collapses identical concurrent calls into a single execution.
+
+    While a call for a key is in flight, every other caller asking for the
+    same key waits for that call and receives its result instead of
+    starting a new one.
+
+    The call runs in its own task, so a caller that is cancelled (e.g. the
+    browser closed the connection) does not cancel the other waiters.
+    """
+
+    def __init__(self):
+        self.in_flight: dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs the call, or joins the one already in flight for the key.
+
+        :param key: Key identifying identical calls.
+        :type key: str
+        :param call: Function returning the awaitable to run.
+        :type call: Callable[[], Awaitable[Any]]
+        :return: Result of the call.
+        :rtype: Any
+        """
+        self.calls += 1
+
+        task = self.in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(call())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the coalescing counters.
+
+        :return: Calls received, backend executions, calls served by another
+            caller's execution and the resulting fan-in ratio.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.calls - self.executions,
+            "in_flight": len(self.in_flight),
+            "fan_in_ratio": self.calls / self.executions if self.executions else 0.0,
+        }
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import jinja2
+from fastapi import Request
+from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.templating import Jinja2Templates
+
+TEMPLATE_SUFFIX = ".html.j2"
+
+logger = logging.getLogger(__name__)
+
+# Marca que el bloque diferido entrega antes de renderizarse
+DEFERRED = object()
+
+STREAM_ERROR = (
+    '<p class="stream-error">No se pudo cargar el contenido. '
+    'Intente recargar la página.</p>'
+)
+
+# Cierra el documento cuando la página falla después del bloque
+STREAM_ERROR_END = STREAM_ERROR + "</main></body></html>"
+
+
+def create_templates(
+    directory: str,
+    production: bool,
+    cache_dir: Path,
+    context_processors: list[Callable[[Request], dict[str, Any]]] | None = None
+) -> Jinja2Templates:
+    """Creates the template renderer of the application.
+
+    In production mode the templates are never checked for changes on
+    disk, every compiled template is kept in memory and the compiled
+    bytecode is stored in `cache_dir`, so that a restarted worker loads it
+    instead of compiling the templates again. Otherwise templates are
+    reloaded when they change, which is what is wanted while editing them.
+
+    :param directory: Directory of the templates.
+    :type directory: str
+    :param production: Whether to use the production mode.
+    :type production: bool
+    :param cache_dir: Directory of the bytecode cache.
+    :type cache_dir: Path
+    :param context_processors: Functions adding variables to the context of
+        every template.
+    :type context_processors: list[Callable[[Request], dict[str, Any]]] | None
+    :return: Template renderer.
+    :rtype: Jinja2Templates
+    """
+    options: dict[str, Any] = {}
+    if production:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        options = {
+            "auto_reload": False,
+            "cache_size": -1,
+            "bytecode_cache": jinja2.FileSystemBytecodeCache(str(cache_dir)),
+        }
+
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(directory),
+        autoescape=jinja2.select_autoescape(),
+        **options
+    )
+    return Jinja2Templates(env=env, context_processors=context_processors)
+
+
+def precompile_templates(env: jinja2.Environment) -> dict[str, Any]:
+    """Loads every page template, so that no request pays for compiling
+    one. It must run once the filters used by the templates are registered.
+
+    :param env: Environment of the templates.
+    :type env: jinja2.Environment
+    :return: Number of templates loaded and seconds it took.
+    :rtype: dict[str, Any]
+    """
+    start = time.perf_counter()
+    names = env.list_templates(
+        filter_func=lambda name: name.endswith(TEMPLATE_SUFFIX)
+    )
+    for name in names:
+        env.get_template(name)
+
+    return {
+        "templates": len(names),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+class TemplateStreamer:
+    """Renders pages in two parts: the head and navigation of the base
+    template are sent as soon as the request arrives, and the main block
+    once the data it needs is loaded.
+
+    The browser starts fetching the stylesheets and scripts of the head
+    while the backend answers, instead of waiting for the whole page. The
+    data is loaded concurrently with the rendering of the head and merged
+    into the context right before the block is rendered, so the block can
+    use it as any other variable; the title and the `head` block cannot.
+    Since the status line is already sent, a failure loading the data or
+    rendering the block replaces the block with an error message instead of
+    an error page, and a failure after it ends the page with that message.
+
+    \f
+
+    :param templates: Template renderer of the application.
+    :type templates: Jinja2Templates
+    :param enabled: Whether pages are streamed; otherwise the data is
+        loaded first and the page rendered at once, as before.
+    :type enabled: bool
+    :param block: Name of the block waiting for the data.
+    :type block: str
+    """
+
+    def __init__(
+        self,
+        templates: Jinja2Templates,
+        enabled: bool,
+        block: str = "main"
+    ):
+        self.templates = templates
+        self.enabled = enabled
+        self.block = block
+        self.streamed = 0
+        self.failed = 0
+        self.waited = 0.0
+
+    async def response(
+        self,
+        request: Request,
+        name: str,
+        context: dict[str, Any],
+        load: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> HTMLResponse | StreamingResponse:
+        """Builds the response of a page.
+
+        :param request: Request being handled.
+        :type request: Request
+        :param name: Name of the template, which must define the block.
+        :type name: str
+        :param context: Variables available from the start, including those
+            used by the base template (e.g. `role`).
+        :type context: dict[str, Any]
+        :param load: Function loading the rest of the variables.
+        :type load: Callable[[], Awaitable[dict[str, Any]]]
+        :return: Response with the page.
+        :rtype: HTMLResponse | StreamingResponse
+        """
+        if not self.enabled:
+            return self.templates.TemplateResponse(
+                request=request,
+                name=name,
+                context={**context, **await load()}
+            )
+
+        self.streamed += 1
+        return StreamingResponse(
+            self.render(request, name, context, load),
+            media_type="text/html"
+        )
+
+    async def render(
+        self,
+        request: Request,
+        name: str,
+        context: dict[str, Any],
+        load: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> AsyncIterator[str]:
+        """Renders a page, yielding the part before the block as soon as it
+        is rendered and the rest once the data is loaded.
+
+        :param request: Request being handled.
+        :type request: Request
+        :param name: Name of the template.
+        :type name: str
+        :param context: Variables available from the start.
+        :type context: dict[str, Any]
+        :param load: Function loading the rest of the variables.
+        :type load: Callable[[], Awaitable[dict[str, Any]]]
+        :return: Parts of the page.
+        :rtype: AsyncIterator[str]
+        """
+        task = asyncio.ensure_future(load())
+
+        context = {"request": request, **context}
+        for processor in self.templates.context_processors:
+            context.update(processor(request))
+
+        template = self.templates.get_template(name)
+        ctx = template.new_context(context)
+
+        # El bloque del hijo es el primero; se envuelve solo en este contexto
+        blocks = ctx.blocks[self.block]
+        render_block = blocks[0]
+        failed = False
+
+        def deferred_block(block_ctx):
+            nonlocal failed
+            yield DEFERRED
+            if failed:
+                yield STREAM_ERROR
+                return
+
+            # Se renderiza aparte, para no enviar un bloque a medias
+            try:
+                rendered = list(render_block(block_ctx))
+            except Exception:
+                logger.exception("Error rendering the %s block of %s", self.block, name)
+                self.failed += 1
+                failed = True
+                yield STREAM_ERROR
+            else:
+                yield from rendered
+
+        blocks[0] = deferred_block
+
+        try:
+            parts = []
+            for part in template.root_render_func(ctx):
+                if part is not DEFERRED:
+                    parts.append(part)
+                    continue
+
+                yield "".join(parts)
+                parts = []
+
+                start = time.perf_counter()
+                try:
+                    ctx.vars.update(await task)
+                except Exception:
+                    logger.exception("Error loading the data of %s", name)
+                    self.failed += 1
+                    failed = True
+                self.waited += time.perf_counter() - start
+
+            yield "".join(parts)
+        except Exception:
+            # El estado ya se envió: se descarta lo pendiente y se cierra
+            logger.exception("Error rendering %s", name)
+            if not failed:
+                self.failed += 1
+            yield STREAM_ERROR_END
+        finally:
+            task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the streaming counters.
+
+        :return: Pages streamed, pages whose data failed to load or render
+            and average seconds the block waited for its data after the head
+            was sent.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "enabled": self.enabled,
+            "streamed": self.streamed,
+            "failed": self.failed,
+            "wait_avg": self.waited / self.streamed if self.streamed else 0.0,
+        }
@@ -0,0 +1,114 @@
+import time
+from typing import Annotated, Any, Callable
+
+from fastapi import Cookie, Depends
+from fastapi.requests import HTTPConnection
+
+from services.session import token_expiry
+
+
+class SessionExpired(Exception):
+    """Raised when the access token of the request has already expired."""
+
+
+class TokenGuard:
+    """Checks locally whether an access token has expired.
+
+    The expiry is read from the `exp` claim of the token, without verifying
+    its signature, so that a request with an expired token is sent back to
+    the login page before any backend call, instead of finding out from a
+    `401` answer. Tokens expiring in less than `leeway` seconds are already
+    considered expired, to absorb the clock difference with the backend.
+    Tokens without an expiry are always let through.
+
+    \f
+
+    :param leeway: Seconds before the expiry a token is rejected.
+    :type leeway: float
+    :param clock: Function returning the current Unix time in seconds.
+    :type clock: Callable[[], float]
+    """
+
+    def __init__(
+        self,
+        leeway: float,
+        clock: Callable[[], float] = time.time
+    ):
+        self.leeway = leeway
+        self.clock = clock
+        self.checked = 0
+        self.expired = 0
+
+    def is_expired(self, token: str) -> bool:
+        """Checks whether a token has expired.
+
+        :param token: Access token issued by the backend.
+        :type token: str
+        :return: Whether the token has expired.
+        :rtype: bool
+        """
+        self.checked += 1
+
+        expires_at = token_expiry(token)
+        if expires_at is not None and expires_at <= self.clock() + self.leeway:
+            self.expired += 1
+            return True
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the token counters.
+
+        :return: Tokens checked and expired tokens rejected; every rejected
+            request saved at least one backend call.
+        :rtype: dict[str, Any]
+        """
+        return {
+            "checked": self.checked,
+            "expired": self.expired,
+        }
+
+
+def get_access_token(
+    request: HTTPConnection,
+    access_token: Annotated[str, Cookie()]
+) -> str:
+    """Returns the access token of the request, checking that it has not
+    expired.
+
+    :param request: Request or WebSocket connection being handled.
+    :type request: HTTPConnection
+    :param access_token: Access token cookie.
+    :type access_token: str
+    :raises SessionExpired: If the token has expired.
+    :return: Access token.
+    :rtype: str
+    """
+    if request.app.state.token_guard.is_expired(access_token):
+        raise SessionExpired()
+    return access_token
+
+
+def get_optional_access_token(
+    request: HTTPConnection,
+    access_token: Annotated[str | None, Cookie()] = None
+) -> str | None:
+    """Returns the access token of the request, if any, checking that it
+    has not expired.
+
+    :param request: Request or WebSocket connection being handled.
+    :type request: HTTPConnection
+    :param access_token: Access token cookie.
+    :type access_token: str | None
+    :raises SessionExpired: If the token has expired.
+    :return: Access token or `None`.
+    :rtype: str | None
+    """
+    if access_token is None:
+        return None
+    return get_access_token(request, access_token)
+
+
+AccessTokenDependency = Annotated[str, Depends(get_access_token)]
+OptionalAccessTokenDependency = Annotated[
+    str | None, Depends(get_optional_access_token)
+]
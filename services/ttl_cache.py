@@ -0,0 +1,69 @@
+import time
+from typing import Any, Awaitable, Callable
+
+
+class TTLCache:
+    """In-process cache whose entries expire after a fixed time.
+
+    \f
+
+    :param ttl: Seconds an entry is kept. `0` disables the cache.
+    :type ttl: float
+    :param clock: Function returning the current time in seconds.
+    :type clock: Callable[[], float]
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: dict[str, tuple[float, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Returns the cached value for the key, fetching it if missing or
+        expired. Nothing is cached if the fetch raises an exception.
+
+        :param key: Key of the cached value.
+        :type key: str
+        :param fetch: Function returning the awaitable that fetches the value.
+        :type fetch: Callable[[], Awaitable[Any]]
+        :return: Cached or freshly fetched value.
+        :rtype: Any
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > self.clock():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = await fetch()
+        if self.ttl > 0:
+            self.entries[key] = (self.clock() + self.ttl, value)
+        return value
+
+    def clear(self) -> None:
+        """Removes all the cached values."""
+        self.entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the hit and miss counters.
+
+        :return: Hits, misses, hit ratio and number of cached entries.
+        :rtype: dict[str, Any]
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+        }
@@ -0,0 +1,61 @@
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class UploadLimitMiddleware:
+    """Rejects request bodies larger than a fixed size.
+
+    A request announcing a bigger `Content-Length` is answered with `413
+    Content Too Large` before its body is read. Bodies without a length
+    (chunked uploads) are counted while they are read, and reading stops
+    as soon as they go over the limit, so an oversized upload is never
+    spooled completely.
+
+    \f
+
+    :param app: ASGI application to protect.
+    :type app: ASGIApp
+    :param max_bytes: Maximum size of a request body. `0` disables the
+        limit.
+    :type max_bytes: int
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() \
+                and int(content_length) > self.max_bytes:
+            await send({
+                "type": "http.response.start",
+                "status": status.HTTP_413_CONTENT_TOO_LARGE,
+                "headers": [(b"content-type", b"text/plain; charset=utf-8")],
+            })
+            await send({
+                "type": "http.response.body",
+                "body": "Archivo demasiado grande".encode(),
+            })
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                        detail="Archivo demasiado grande"
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -3,9 +3,6 @@ async function addCompanion(eventId) {
         "companion_identification"
     ).value;
 
-    // curl -X 'GET' \
-    //   'http://127.0.0.1:8000/assistant/get-by-id-number/1750319731' \
-    //   -H 'accept: application/json'
     if (!companionIdentification) {
         Swal.fire({
             title: "Identificación requerida",
@@ -16,50 +13,14 @@ async function addCompanion(eventId) {
         return;
     }
 
-    let acompañante;
-
-    await fetch(
-        `${API_URL}/assistant/get-by-id-number/${companionIdentification}`
-    )
-        .then((response) => {
-            if (!response.ok) {
-                throw new Error("Error en la solicitud");
-            }
-            return response.json();
-        })
-        .then((data) => {
-            acompañante = data;
-            Swal.fire({
-                title: "Acompañante encontrado",
-                text: `Acompañante encontrado: ${data.first_name} ${data.last_name}.`,
-                icon: "success",
-                confirmButtonText: "Continuar",
-            });
-        })
-        .catch((error) => {
-            console.error(error);
-            Swal.fire({
-                title: "Error de búsqueda",
-                text: "Ocurrió un error al añadir el acompañante. Revise si la identificación es correcta.",
-                icon: "error",
-                confirmButtonText: "Entendido",
-            });
-            return;
-        });
-
-    // Obtener la cookie de sesión access_token
-    const accessToken = document.cookie
-        .split("; ")
-        .find((row) => row.startsWith("access_token="))
-        ?.split("=")[1];
-
-    fetch(`${API_URL}/assistant/register-companion-to-event/${eventId}`, {
+    // La búsqueda del acompañante y su registro se hacen en el servidor,
+    // en una sola petición
+    fetch(`/add-companion/${eventId}`, {
         method: "POST",
         headers: {
-            Authorization: `Bearer ${accessToken}`,
-            "Content-Type": "application/x-www-form-urlencoded",
+            accept: "application/json",
         },
-        body: `companion_id=${acompañante.id}&companion_type=first_grade`,
+        body: new URLSearchParams({ id_number: companionIdentification }),
     })
         .then((response) => {
             if (!response.ok) {
@@ -68,12 +29,23 @@ async function addCompanion(eventId) {
             return response.json();
         })
         .then((data) => {
-            Swal.fire({
-                title: "Acompañante añadido",
-                text: "Acompañante añadido al evento con éxito.",
-                icon: "success",
-                confirmButtonText: "OK",
-            });
+            if (data.status === "not_found") {
+                Swal.fire({
+                    title: "Error de búsqueda",
+                    text: "Ocurrió un error al añadir el acompañante. Revise si la identificación es correcta.",
+                    icon: "error",
+                    confirmButtonText: "Entendido",
+                });
+            } else if (data.status === "added") {
+                Swal.fire({
+                    title: "Acompañante añadido",
+                    text: `${data.companion.first_name} ${data.companion.last_name} fue añadido al evento con éxito.`,
+                    icon: "success",
+                    confirmButtonText: "OK",
+                });
+            } else {
+                throw new Error("Error al añadir el acompañante");
+            }
         })
         .catch((error) => {
             console.error(error);
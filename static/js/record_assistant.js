@@ -1,67 +1,62 @@
+async function lookupRegistered(eventId, eventDateId, query) {
+    const response = await fetch(
+        `/record-assistant/${eventId}/${eventDateId}/lookup?q=${encodeURIComponent(query)}`
+    );
+    if (!response.ok) {
+        throw new Error("Error en la solicitud");
+    }
+    return response.json();
+}
+
 async function sendAttendance(eventDateId, eventId, assistantId) {
-    //    curl -X 'POST' \
-    //   'http://127.0.0.1:8000/events/add/attendance/1/5/3' \
-    //   -H 'accept: application/json' \
-    //   -d ''
-    if (!assistantId) {
-        const assistantIdentification =
-            document.getElementById("assistant_id").value;
+    // La búsqueda del asistente y el registro de la asistencia se hacen en
+    // el servidor, en una sola petición
+    const body = new URLSearchParams();
+    if (assistantId) {
+        body.append("assistant_id", assistantId);
+    } else {
+        body.append(
+            "id_number",
+            document.getElementById("assistant_id").value
+        );
+    }
 
-        await fetch(
-            `${API_URL}/assistant/get-by-id-number/${assistantIdentification}`
-        )
-            .then((response) => {
-                if (!response.ok) {
-                    throw new Error("Error en la solicitud");
-                }
-                return response.json();
-            })
-            .then((data) => {
-                assistantId = data.id;
-            })
-            .catch((error) => {
-                console.error(error);
+    await fetch(`/record-assistant/${eventId}/${eventDateId}/checkin`, {
+        method: "POST",
+        headers: {
+            accept: "application/json",
+        },
+        body: body,
+    })
+        .then((response) => {
+            if (!response.ok) {
+                throw new Error("Error en la solicitud");
+            }
+            return response.json();
+        })
+        .then((data) => {
+            if (data.status === "not_found") {
                 Swal.fire({
                     title: "Error de búsqueda",
                     text: "Ocurrió un error al buscar el asistente. Revise si la identificación es correcta.",
                     icon: "error",
                     confirmButtonText: "Entendido",
                 });
-                throw new Error(
-                    "Error al buscar el asistente: " + error.message
-                );
-            });
-    }
-
-    await fetch(
-        `${API_URL}/events/add/attendance/${eventDateId}/${eventId}/${assistantId}`,
-        {
-            method: "POST",
-            headers: {
-                accept: "application/json",
-            },
-        }
-    )
-        .then((response) => response.json())
-        .then((data) => {
-            if (data.detail == "Registration not found") {
+            } else if (data.status === "not_registered") {
                 Swal.fire({
                     title: "No registrado",
                     text: "La persona no se encuentra registrada en el evento.",
                     icon: "warning",
                     confirmButtonText: "Entendido",
                 });
-            } else if (
-                typeof data.detail === "string" &&
-                data.detail.includes("Duplicate entry")
-            ) {
+            } else if (data.status === "already_registered") {
                 Swal.fire({
                     title: "Ya registrado",
                     text: "La persona ya se encuentra registrada en el evento.",
                     icon: "info",
                     confirmButtonText: "Entendido",
                 });
-            } else {
+            } else if (data.status === "registered") {
                 Swal.fire({
                     title: "Asistencia registrada",
                     text: "Asistencia registrada correctamente.",
@@ -70,6 +65,17 @@ async function sendAttendance(eventDateId, eventId, assistantId) {
                 }).then(() => {
                     window.location.href = `/record-assistant/${eventId}/${eventDateId}`;
                 });
+            } else if (data.status === "queued") {
+                Swal.fire({
+                    title: "Asistencia recibida",
+                    text: "El servidor está lento; la asistencia se registrará en unos momentos.",
+                    icon: "success",
+                    confirmButtonText: "OK",
+                }).then(() => {
+                    window.location.href = `/record-assistant/${eventId}/${eventDateId}`;
+                });
+            } else {
+                throw new Error(data.detail || "Error al registrar la asistencia");
             }
         })
         .catch((error) => {
@@ -83,6 +89,41 @@ async function sendAttendance(eventDateId, eventId, assistantId) {
                 location.reload();
             });
         });
-
-    // location.reload();
 }
+
+document.addEventListener("DOMContentLoaded", () => {
+    const input = document.getElementById("assistant_id");
+    const suggestions = document.getElementById("assistant_suggestions");
+    if (!input || !suggestions) {
+        return;
+    }
+
+    let timer;
+    input.addEventListener("input", () => {
+        clearTimeout(timer);
+        const query = input.value.trim();
+        if (query.length < 2) {
+            suggestions.replaceChildren();
+            return;
+        }
+
+        timer = setTimeout(() => {
+            lookupRegistered(
+                input.dataset.eventId,
+                input.dataset.eventDateId,
+                query
+            )
+                .then((data) => {
+                    suggestions.replaceChildren(
+                        ...data.suggestions.map((person) => {
+                            const option = document.createElement("option");
+                            option.value = person.id_number;
+                            option.label = `${person.first_name} ${person.last_name}`;
+                            return option;
+                        })
+                    );
+                })
+                .catch((error) => console.error(error));
+        }, 150);
+    });
+});
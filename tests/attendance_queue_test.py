@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from services.attendance_queue import AttendanceQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return AttendanceQueue(tmp_path / "queue.sqlite3", 10, 0.01, 3, clock=lambda: 100.0)
+
+
+@pytest.mark.anyio
+async def test_pending_attendance_is_queued_once(queue):
+    assert await queue.enqueue(1, 2, 7)
+    assert not await queue.enqueue(1, 2, 7)
+
+    stats = await queue.stats()
+    assert stats["pending"] == 1
+    assert stats["duplicates"] == 1
+
+
+@pytest.mark.anyio
+async def test_flush_delivers_rejects_and_retries(queue):
+    outcomes = {7: True, 8: False, 9: RuntimeError("503")}
+
+    async def send(event_id, event_date_id, assistant_id):
+        outcome = outcomes[assistant_id]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    for assistant_id in outcomes:
+        await queue.enqueue(1, 2, assistant_id)
+
+    assert await queue.flush(send) == 3
+    stats = await queue.stats()
+    assert (stats["pending"], stats["failed"]) == (1, 1)
+    assert (stats["delivered"], stats["rejected"], stats["retries"]) == (1, 1, 1)
+
+    # El reintento espera a que pase el tiempo de espera
+    assert await queue.flush(send) == 0
+
+
+@pytest.mark.anyio
+async def test_queue_survives_a_restart(tmp_path):
+    queue = AttendanceQueue(tmp_path / "queue.sqlite3", 10, 0.01, 3)
+    await queue.enqueue(1, 2, 7)
+    await queue.close()
+
+    sent = []
+
+    async def send(*ids):
+        sent.append(ids)
+        return True
+
+    queue = AttendanceQueue(tmp_path / "queue.sqlite3", 10, 0.01, 3)
+    queue.start(send)
+    for _ in range(100):
+        if sent:
+            break
+        await asyncio.sleep(0.01)
+    await queue.close()
+
+    assert sent == [(1, 2, 7)]
+    assert (await queue.stats())["pending"] == 0
+
+
+@pytest.mark.anyio
+async def test_rejected_attendance_is_listed_until_queued_again(queue):
+    async def reject(*ids):
+        return False
+
+    await queue.enqueue(1, 2, 7)
+    await queue.enqueue(1, 3, 8)
+    await queue.flush(reject)
+
+    failed = await queue.failed(1, 2)
+    assert [(item["assistant_id"], item["rejected"]) for item in failed] == [(7, True)]
+
+    # Registrarla de nuevo la devuelve a la cola
+    assert await queue.enqueue(1, 2, 7)
+    assert await queue.failed(1, 2) == []
@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from services.attendee_roster import Roster, RosterCache
+
+ANA = {"id": 1, "first_name": "Ana", "last_name": "Pérez", "id_number": "1712345678"}
+LUIS = {"id": 2, "first_name": "Luis", "last_name": "Andrade", "id_number": "1798765432"}
+
+
+def test_people_are_found_by_id_number_and_name_prefix():
+    roster = Roster()
+    roster.update([ANA, LUIS])
+
+    assert roster.find("1712345678") == ANA
+    assert roster.find("17") is None
+    assert roster.search("17") == [ANA, LUIS]
+    assert roster.search("perez a") == [ANA]
+    assert roster.search("LUIS") == [LUIS]
+    assert roster.search("") == []
+
+
+def test_update_only_touches_changed_people():
+    roster = Roster()
+    roster.update([ANA, LUIS])
+
+    changes = roster.update([{**ANA, "last_name": "Pazmiño"}])
+
+    assert changes == 2
+    assert roster.search("luis") == []
+    assert roster.search("paz") == [{**ANA, "last_name": "Pazmiño"}]
+    assert roster.search("perez") == []
+
+
+@pytest.mark.anyio
+async def test_stale_roster_is_refreshed_in_the_background():
+    now = 0.0
+    fetches = []
+
+    async def fetch():
+        fetches.append(now)
+        return [ANA] if len(fetches) == 1 else [ANA, LUIS]
+
+    cache = RosterCache(60, 8, clock=lambda: now)
+    roster = await cache.get(1, fetch)
+    assert await cache.get(1, fetch) is roster
+
+    now = 61.0
+    await cache.get(1, fetch)
+    await asyncio.gather(*cache.tasks.values())
+
+    assert fetches == [0.0, 61.0]
+    assert roster.find("1798765432") == LUIS
+    assert cache.stats()["refreshes"] == 1
+    assert cache.stats()["changes"] == 1
+
+
+@pytest.fixture
+def backend_requests(use_backend):
+    requests = []
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(200, json=[{
+            "id": 7,
+            "first_name": "Ana",
+            "last_name": "Pérez",
+            "email": "ana@example.com",
+            "assistant": {"id_number": "1712345678", "phone": "0999999999", "image_uuid": "uuid"},
+        }])
+
+    use_backend(backend)
+    return requests
+
+
+def test_lookup_endpoint_answers_from_the_roster(backend_requests, session_cookie):
+    client = TestClient(app)
+    client.cookies.set("session", session_cookie())
+
+    first = client.get("/record-assistant/9001/1/lookup", params={"q": "1712345678"})
+    second = client.get("/record-assistant/9001/1/lookup", params={"q": "ana"})
+
+    assert first.json()["match"]["id"] == 7
+    assert second.json()["match"] is None
+    assert [person["id"] for person in second.json()["suggestions"]] == [7]
+    assert backend_requests == ["/events/registered/9001"]
+
+
+def test_lookup_endpoint_is_only_for_staff(backend_requests):
+    response = TestClient(app).get("/record-assistant/9001/1/lookup", params={"q": "ana"})
+
+    assert response.status_code == 403
+    assert backend_requests == []
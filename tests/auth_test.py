@@ -0,0 +1,75 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from services.gateway import Gateway
+
+
+@pytest.fixture
+def backend_requests(use_backend):
+    requests = []
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/info":
+            return httpx.Response(200, json={
+                "id": 3, "role": "organizer", "first_name": "Luis", "last_name": "Andrade",
+            })
+        return httpx.Response(200, json={})
+
+    use_backend(backend)
+    return requests
+
+
+def test_role_cookie_alone_does_not_grant_access(backend_requests):
+    client = TestClient(app)
+    client.cookies.set("role", "organizer")
+
+    response = client.get("/settings", follow_redirects=False)
+
+    assert response.status_code == 303
+    assert response.headers["location"] == "/login"
+    assert backend_requests == []
+
+
+def test_other_roles_are_sent_to_login(backend_requests, session_cookie):
+    client = TestClient(app)
+    client.cookies.set("session", session_cookie("assistant"))
+
+    response = client.get("/settings", follow_redirects=False)
+
+    assert response.status_code == 303
+    assert backend_requests == []
+
+
+@pytest.mark.parametrize("role", [None, "staff", "assistant"])
+def test_metrics_are_only_for_organizers(backend_requests, session_cookie, role):
+    client = TestClient(app)
+    if role is not None:
+        client.cookies.set("session", session_cookie(role))
+
+    assert client.get("/metrics").status_code == 403
+
+    client.cookies.set("session", session_cookie("organizer"))
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "attendance_queue" in response.json()
+
+
+def test_session_from_token_is_resolved_once_through_the_cache(backend_requests):
+    client = TestClient(app)
+    client.cookies.set("access_token", "auth-test-token")
+
+    response = client.get("/settings")
+
+    assert response.status_code == 200
+    assert backend_requests.count("/info") == 1
+
+
+@pytest.mark.anyio
+async def test_identity_endpoints_cannot_bypass_the_cache():
+    gateway = Gateway(httpx.AsyncClient(), "http://backend")
+
+    with pytest.raises(ValueError):
+        await gateway.get("/info", token="token")
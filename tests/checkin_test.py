@@ -0,0 +1,172 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from services.attendance_queue import AttendanceQueue
+
+ASSISTANT = {
+    "id": 7,
+    "first_name": "Ana",
+    "last_name": "Pérez",
+    "email": "ana@example.com",
+    "assistant": {"id_number": "1712345678", "phone": "0999999999", "image_uuid": "uuid"},
+}
+
+
+@pytest.fixture
+def attendance_response():
+    return httpx.Response(200, json={"ok": True})
+
+
+@pytest.fixture
+def backend_requests(attendance_response, use_backend):
+    requests = []
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        if request.url.path == "/assistant/get-by-id-number/1712345678":
+            return httpx.Response(200, json=ASSISTANT)
+        if request.url.path.startswith("/assistant/get-by-id-number/"):
+            return httpx.Response(404, json={"detail": "Assistant not found"})
+        if request.url.path.startswith("/assistant/register-companion-to-event/"):
+            return httpx.Response(200, json={"ok": True})
+        return attendance_response
+
+    use_backend(backend)
+    return requests
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    queue = AttendanceQueue(tmp_path / "queue.sqlite3", 10, 5.0, 3)
+    monkeypatch.setattr(app.state, "attendance_queue", queue)
+    return queue
+
+
+@pytest.fixture
+def client(session_cookie, queue):
+    client = TestClient(app)
+    client.cookies.set("session", session_cookie())
+    return client
+
+
+def test_check_in_resolves_the_id_number_and_records_attendance(client, backend_requests):
+    response = client.post("/record-assistant/9101/3/checkin", data={"id_number": "1712345678"})
+
+    assert response.json()["status"] == "registered"
+    assert response.json()["assistant"]["id"] == 7
+    assert backend_requests == [
+        ("GET", "/assistant/get-by-id-number/1712345678"),
+        ("POST", "/events/add/attendance/3/9101/7"),
+    ]
+
+
+def test_check_in_with_a_known_assistant_skips_the_lookup(client, backend_requests):
+    response = client.post("/record-assistant/9101/3/checkin", data={"assistant_id": 7})
+
+    assert response.json()["status"] == "registered"
+    assert backend_requests == [("POST", "/events/add/attendance/3/9101/7")]
+
+
+def test_check_in_of_an_unknown_id_number(client, backend_requests):
+    response = client.post("/record-assistant/9101/3/checkin", data={"id_number": "0000000000"})
+
+    assert response.json() == {"status": "not_found", "assistant": None}
+
+
+@pytest.mark.parametrize("id_number", ["../../events/all", "17123%2F45678", "1" * 40])
+def test_malformed_id_number_never_reaches_the_backend(client, backend_requests, id_number):
+    response = client.post("/record-assistant/9101/3/checkin", data={"id_number": id_number})
+
+    assert response.json() == {"status": "not_found", "assistant": None}
+    assert backend_requests == []
+
+
+@pytest.mark.parametrize("attendance_response, outcome", [
+    (httpx.Response(404, json={"detail": "Registration not found"}), "not_registered"),
+    (httpx.Response(400, json={"detail": "(1062, \"Duplicate entry '3-7'\")"}), "already_registered"),
+])
+def test_check_in_reports_the_backend_outcome(client, backend_requests, outcome):
+    response = client.post("/record-assistant/9101/3/checkin", data={"assistant_id": 7})
+
+    assert response.json()["status"] == outcome
+
+
+def test_only_staff_can_check_in(backend_requests):
+    response = TestClient(app).post("/record-assistant/9101/3/checkin", data={"assistant_id": 7})
+
+    assert response.status_code == 403
+    assert backend_requests == []
+
+
+def test_companion_is_added_in_one_request(backend_requests, session_cookie):
+    client = TestClient(app)
+    client.cookies.set("session", session_cookie("assistant"))
+    client.cookies.set("access_token", "token")
+
+    response = client.post("/add-companion/9101", data={"id_number": "1712345678"})
+
+    assert response.json() == {
+        "status": "added",
+        "companion": {"first_name": "Ana", "last_name": "Pérez"},
+    }
+    assert backend_requests[-1] == ("POST", "/assistant/register-companion-to-event/9101")
+
+
+@pytest.mark.parametrize("attendance_response", [httpx.Response(503, text="Service Unavailable")])
+def test_check_in_is_queued_when_the_backend_fails(client, backend_requests, queue):
+    response = client.post("/record-assistant/9101/3/checkin", data={"assistant_id": 7})
+
+    assert response.json()["status"] == "queued"
+    assert asyncio.run(queue.stats())["pending"] == 1
+
+
+def test_rejected_queued_check_in_is_shown_until_recorded_again(client, backend_requests, queue):
+    async def reject(*ids):
+        return False
+
+    async def queue_and_reject():
+        await queue.enqueue(9101, 3, 7)
+        await queue.flush(reject)
+
+    asyncio.run(queue_and_reject())
+
+    page = client.get("/record-assistant/9101/3")
+    assert "Asistente #7" in page.text
+    assert "rechazada por el servidor" in page.text
+
+    response = client.post("/record-assistant/9101/3/checkin", data={"assistant_id": 7})
+    assert response.json()["status"] == "registered"
+    assert asyncio.run(queue.failed(9101, 3)) == []
+
+
+@pytest.mark.parametrize("attendance_response", [
+    httpx.Response(503, text="<html>Service Unavailable</html>"),
+    httpx.Response(200, text="<html>Bad Gateway</html>"),
+])
+def test_photo_check_in_reports_a_failing_backend(client, backend_requests):
+    response = client.post(
+        "/record-assistant/9101/3",
+        files={"image": ("face.jpg", b"not an image", "image/jpeg")}
+    )
+
+    assert response.status_code == 200
+    assert "Error del servidor" in response.text
+    assert ("POST", "/assistant/get-by-image") in backend_requests
+
+
+def test_photo_check_in_reports_an_unreachable_backend(client, use_backend):
+    def backend(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("backend caído")
+
+    use_backend(backend)
+    response = client.post(
+        "/record-assistant/9101/3",
+        files={"image": ("face.jpg", b"not an image", "image/jpeg")}
+    )
+
+    assert response.status_code == 200
+    assert "Error del servidor" in response.text
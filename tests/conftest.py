@@ -0,0 +1,55 @@
+import os
+from typing import Callable
+
+import httpx
+import pytest
+
+# La aplicación exige el secreto de la sesión fuera del modo desarrollo
+os.environ.setdefault("SESSION_SECRET", "test-session-secret")
+
+from main import app  # noqa: E402
+from services.http_client import get_http_client  # noqa: E402
+from services.session import Principal, token_digest  # noqa: E402
+
+# Expira en 2100, así que la sesión de los tests siempre es válida
+SESSION_EXPIRES_AT = 4102444800
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def use_backend():
+    """Points the shared HTTP client of the app to a stand-in backend.
+
+    Returns a function taking the handler of the stand-in backend and
+    returning the client; the override is removed after the test.
+    """
+
+    def use(handler: Callable) -> httpx.AsyncClient:
+        upstream = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        app.dependency_overrides[get_http_client] = lambda: upstream
+        return upstream
+
+    yield use
+    app.dependency_overrides.pop(get_http_client, None)
+
+
+@pytest.fixture
+def session_cookie():
+    """Returns a function building a signed session cookie for a role,
+    issued with the access token `token`."""
+
+    def build(
+        role: str = "staff",
+        id: int = 1,
+        name: str = "Ana",
+        token: str = "token"
+    ) -> str:
+        return app.state.session_signer.dumps(
+            Principal(id, role, name, SESSION_EXPIRES_AT, token_digest(token))
+        )
+
+    return build
@@ -0,0 +1,191 @@
+from io import BytesIO
+
+import httpx
+import pytest
+from PIL import Image
+
+from main import app
+from services.image_cache import ImageCache
+
+IMAGE_URL = "/event/image/12345678-1234-5678-1234-567812345678"
+IMAGE = b"PNG" * 1000
+
+
+def png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def backend_requests():
+    return []
+
+
+@pytest.fixture
+def backend_image():
+    return IMAGE
+
+
+@pytest.fixture
+async def upstream(use_backend, backend_requests, backend_image):
+    """Shared client pointing to a stand-in backend serving one image."""
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        backend_requests.append(request)
+        return httpx.Response(
+            200,
+            content=backend_image,
+            headers={
+                "Content-Type": "image/png",
+                "Content-Length": str(len(backend_image)),
+            }
+        )
+
+    client = use_backend(backend)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def image_cache(tmp_path):
+    previous = app.state.image_cache
+    app.state.image_cache = ImageCache(tmp_path, 1024 * 1024)
+    yield app.state.image_cache
+    app.state.image_cache = previous
+
+
+@pytest.fixture
+async def client(upstream, image_cache):
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://testserver"
+    ) as client:
+        yield client
+
+
+@pytest.mark.anyio
+async def test_image_is_streamed_then_served_from_the_cache(
+    client, backend_requests, tmp_path
+):
+    first = await client.get(IMAGE_URL)
+    second = await client.get(IMAGE_URL)
+
+    assert first.content == second.content == IMAGE
+    assert first.headers["content-type"] == "image/png"
+    assert first.headers["content-length"] == str(len(IMAGE))
+    assert len(backend_requests) == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.anyio
+async def test_image_evicted_by_another_worker_is_fetched_again(
+    client, backend_requests, image_cache
+):
+    await client.get(IMAGE_URL)
+    # Otro worker que comparte el directorio la expulsa
+    for path in image_cache.directory.iterdir():
+        path.unlink()
+
+    response = await client.get(IMAGE_URL)
+
+    assert response.status_code == 200
+    assert response.content == IMAGE
+    assert len(backend_requests) == 2
+
+
+@pytest.mark.anyio
+async def test_head_sends_no_body(client):
+    response = await client.head(IMAGE_URL)
+
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(IMAGE))
+    assert response.content == b""
+
+
+@pytest.mark.anyio
+async def test_cached_image_supports_byte_ranges(client):
+    await client.get(IMAGE_URL)
+
+    response = await client.get(IMAGE_URL, headers={"Range": "bytes=0-9"})
+
+    assert response.status_code == 206
+    assert response.content == IMAGE[:10]
+
+
+@pytest.mark.anyio
+async def test_image_is_sent_with_immutable_cache_headers(client):
+    first = await client.get(IMAGE_URL)
+    second = await client.get(IMAGE_URL)
+
+    assert first.headers["etag"] == second.headers["etag"]
+    assert "immutable" in first.headers["cache-control"]
+    assert "immutable" in second.headers["cache-control"]
+
+
+@pytest.mark.anyio
+async def test_matching_etag_is_answered_with_not_modified(
+    client, backend_requests
+):
+    etag = (await client.get(IMAGE_URL)).headers["etag"]
+
+    response = await client.get(IMAGE_URL, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert len(backend_requests) == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("backend_image", [png(1600, 900)])
+async def test_resized_variant_is_negotiated_and_cached(
+    client, backend_requests
+):
+    response = await client.get(
+        IMAGE_URL,
+        params={"width": 400},
+        headers={"Accept": "image/webp,image/*"}
+    )
+    again = await client.get(
+        IMAGE_URL,
+        params={"width": 400},
+        headers={"Accept": "image/webp,image/*"}
+    )
+
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["vary"] == "Accept"
+    assert Image.open(BytesIO(response.content)).size == (400, 225)
+    assert again.content == response.content
+    assert len(backend_requests) == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("backend_image", [png(1600, 900)])
+async def test_variant_keeps_the_original_format_by_default(client):
+    response = await client.get(IMAGE_URL, params={"preset": "thumbnail"})
+
+    assert response.headers["content-type"] == "image/png"
+    assert Image.open(BytesIO(response.content)).width == 320
+
+
+@pytest.mark.anyio
+async def test_undecodable_image_falls_back_to_the_original(client):
+    response = await client.get(IMAGE_URL, params={"width": 400})
+
+    assert response.status_code == 200
+    assert response.content == IMAGE
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("backend_image", [png(400, 300)])
+async def test_oversized_image_falls_back_to_the_original(
+    client, backend_image, monkeypatch
+):
+    # Más del doble del límite de píxeles: Pillow se niega a decodificarla
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+
+    response = await client.get(IMAGE_URL, params={"width": 200})
+
+    assert response.status_code == 200
+    assert response.content == backend_image
@@ -0,0 +1,28 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from services.face_detector import FaceDetector
+
+cv2 = pytest.importorskip("cv2")
+if not hasattr(cv2, "CascadeClassifier"):
+    pytest.skip("OpenCV without Haar cascades", allow_module_level=True)
+
+
+def blank_photo() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (640, 480), "white").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.mark.anyio
+async def test_photo_without_a_face_is_rejected():
+    detector = FaceDetector(True, 0.4, 85)
+
+    assert await detector.detect(blank_photo()) is None
+    assert detector.stats()["rejected"] == 1
+
+
+def test_detector_is_disabled_unless_requested():
+    assert not FaceDetector(False, 0.4, 85).enabled
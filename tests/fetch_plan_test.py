@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from services.fetch_plan import FetchPlan
+from services.gateway import Gateway
+
+UPSTREAM_SECONDS = 0.3
+
+
+async def backend(request: httpx.Request) -> httpx.Response:
+    """Stand-in backend where every call takes the same time."""
+    if request.url.path == "/down":
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    await asyncio.sleep(UPSTREAM_SECONDS)
+    return httpx.Response(200, json={"path": request.url.path})
+
+
+@pytest.fixture
+async def gateway():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(backend))
+    yield Gateway(client, "http://backend")
+    await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_calls_run_concurrently(gateway):
+    plan = FetchPlan(gateway)
+    plan.get("event", "/events/1")
+    plan.get("registered", "/assistant/get-registered-events")
+    plan.get("user", "/events/events-to-react")
+
+    start = time.perf_counter()
+    fetched = await plan.run()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < UPSTREAM_SECONDS * 2
+    assert fetched["event"].json() == {"path": "/events/1"}
+    assert fetched["user"].json() == {"path": "/events/events-to-react"}
+
+
+@pytest.mark.anyio
+async def test_failed_call_does_not_cancel_the_others(gateway):
+    plan = FetchPlan(gateway)
+    plan.get("event", "/events/1")
+    plan.get("down", "/down")
+
+    fetched = await plan.run()
+
+    assert fetched["event"].status_code == 200
+    assert fetched["down"].status_code == 502
+    assert "detail" in fetched["down"].json()
@@ -0,0 +1,153 @@
+from io import BytesIO
+
+import httpx
+from fastapi.testclient import TestClient
+from PIL import Image, ImageDraw
+
+from main import app
+from services.frame_dedup import RecognitionCache, perceptual_hash
+
+FACE_BOX = (280, 120, 360, 220)
+
+
+def photo(shift: int = 0, quality: int = 90) -> bytes:
+    image = Image.new("RGB", (320, 240), "white")
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((100 + shift, 40, 220 + shift, 200), fill="sienna")
+    draw.rectangle((0, 180, 320, 240), fill="navy")
+    output = BytesIO()
+    image.save(output, "JPEG", quality=quality)
+    return output.getvalue()
+
+
+def kiosk_photo(person: str, quality: int = 90) -> bytes:
+    """Photo from a fixed camera: the same background, one face."""
+    image = Image.new("RGB", (640, 480), "white")
+    draw = ImageDraw.Draw(image)
+    for x in range(0, 640, 40):
+        draw.rectangle((x, 0, x + 20, 480), fill="lightsteelblue")
+    draw.rectangle((0, 360, 640, 480), fill="navy")
+
+    left, top, right, bottom = FACE_BOX
+    if person == "ana":
+        draw.ellipse(FACE_BOX, fill="sienna")
+        draw.rectangle((left + 15, top + 30, left + 30, top + 40), fill="black")
+        draw.rectangle((right - 30, top + 30, right - 15, top + 40), fill="black")
+    else:
+        draw.rectangle((left + 10, top, right - 10, bottom), fill="peachpuff")
+        draw.rectangle((left + 10, top, right - 10, top + 25), fill="black")
+        draw.rectangle((left + 25, bottom - 30, right - 25, bottom - 20), fill="maroon")
+
+    output = BytesIO()
+    image.save(output, "JPEG", quality=quality)
+    return output.getvalue()
+
+
+def crop_face(content: bytes) -> bytes:
+    with Image.open(BytesIO(content)) as image:
+        output = BytesIO()
+        image.crop(FACE_BOX).save(output, "JPEG")
+        return output.getvalue()
+
+
+class FakeFaceDetector:
+    enabled = True
+
+    async def detect(self, content: bytes) -> bytes:
+        return crop_face(content)
+
+
+def distance(first: int, second: int) -> int:
+    return (first ^ second).bit_count()
+
+
+def test_similar_photos_have_close_hashes():
+    original = perceptual_hash(photo())
+
+    assert distance(original, perceptual_hash(photo(quality=60))) <= 6
+    assert distance(original, perceptual_hash(photo(shift=90))) > 6
+
+
+def test_recent_similar_photo_reuses_the_result():
+    cache = RecognitionCache(5.0, 6, clock=lambda: 0.0)
+    cache.put((1, 2), 0b1111, {"assistants": [7]})
+
+    assert cache.get((1, 2), 0b1110) == {"assistants": [7]}
+    assert cache.get((1, 3), 0b1110) is None
+    assert cache.get((1, 2), 0b1111 ^ 0xFFFF) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_results_expire_after_the_window():
+    now = 0.0
+    cache = RecognitionCache(5.0, 6, clock=lambda: now)
+    cache.put((1, 2), 0b1111, {"assistants": [7]})
+
+    now = 5.0
+
+    assert cache.get((1, 2), 0b1111) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = RecognitionCache(0, 6)
+    cache.put((1, 2), 0b1111, {"assistants": [7]})
+
+    assert cache.get((1, 2), 0b1111) is None
+
+
+def test_different_faces_on_the_same_background_are_not_deduplicated():
+    ana, luis = kiosk_photo("ana"), kiosk_photo("luis")
+    cache = RecognitionCache(5.0, 2, clock=lambda: 0.0)
+    cache.put((1, 2), perceptual_hash(crop_face(ana)), {"assistants": [7]})
+
+    # El fondo domina el cuadro completo: dos personas casi no se distinguen
+    assert distance(perceptual_hash(ana), perceptual_hash(luis)) <= 2
+    assert cache.get((1, 2), perceptual_hash(crop_face(luis))) is None
+    assert cache.get((1, 2), perceptual_hash(crop_face(kiosk_photo("ana", 60)))) == {"assistants": [7]}
+
+
+def test_check_in_photos_are_deduplicated_on_the_face(monkeypatch, use_backend, session_cookie):
+    requests = []
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(200, json=[])
+
+    use_backend(backend)
+    monkeypatch.setattr(app.state, "face_detector", FakeFaceDetector())
+    monkeypatch.setattr(app.state, "recognition_cache", RecognitionCache(5.0, 2))
+    client = TestClient(app)
+    client.cookies.set("session", session_cookie())
+
+    for person in ("ana", "ana", "luis"):
+        client.post(
+            "/record-assistant/1/2",
+            files={"image": ("face.jpg", kiosk_photo(person), "image/jpeg")}
+        )
+
+    assert requests == ["/assistant/get-by-image"] * 2
+
+
+def test_check_in_photos_are_not_deduplicated_without_a_face_crop(monkeypatch, use_backend, session_cookie):
+    requests = []
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(200, json=[])
+
+    use_backend(backend)
+    monkeypatch.setattr(app.state.face_detector, "enabled", False)
+    monkeypatch.setattr(app.state, "recognition_cache", RecognitionCache(5.0, 2))
+    client = TestClient(app)
+    client.cookies.set("session", session_cookie())
+
+    # Sin recorte, el fondo haría pasar a Luis por Ana
+    for person in ("ana", "luis"):
+        client.post(
+            "/record-assistant/1/2",
+            files={"image": ("face.jpg", kiosk_photo(person), "image/jpeg")}
+        )
+
+    assert requests == ["/assistant/get-by-image"] * 2
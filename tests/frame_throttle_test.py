@@ -0,0 +1,46 @@
+import pytest
+
+from services.frame_throttle import FrameThrottle
+
+
+@pytest.mark.anyio
+async def test_only_the_latest_frame_is_forwarded():
+    throttle = FrameThrottle(0)
+
+    throttle.put(b"frame-1")
+    throttle.put(b"frame-2")
+
+    assert await throttle.next() == b"frame-2"
+    assert throttle.stats()["dropped"] == 1
+
+
+@pytest.mark.anyio
+async def test_repeated_frame_is_dropped():
+    throttle = FrameThrottle(0)
+
+    throttle.put(b"frame")
+    await throttle.next()
+    throttle.put(b"frame")
+
+    assert not throttle.available.is_set()
+    assert throttle.stats()["dropped"] == 1
+
+
+@pytest.mark.anyio
+async def test_forwarded_frames_are_spaced(monkeypatch):
+    now = 10.0
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr("services.frame_throttle.asyncio.sleep", fake_sleep)
+    throttle = FrameThrottle(1.0, clock=lambda: now)
+
+    throttle.put(b"frame-1")
+    await throttle.next()
+    now = 10.25
+    throttle.put(b"frame-2")
+    await throttle.next()
+
+    assert slept == [0.75]
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from main import app
+
+SLOW_UPSTREAM_SECONDS = 1.0
+
+
+async def backend(request: httpx.Request) -> httpx.Response:
+    """Stand-in backend where face recognition is slow."""
+    if request.url.path == "/assistant/get-by-image":
+        await asyncio.sleep(SLOW_UPSTREAM_SECONDS)
+        return httpx.Response(200, json=[])
+
+    return httpx.Response(200, json=[])
+
+
+@pytest.fixture
+async def upstream(use_backend):
+    """Shared client pointing to the stand-in backend."""
+    client = use_backend(backend)
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_slow_upstream_does_not_block_other_requests(upstream, session_cookie):
+    """A slow recognition call must not delay an unrelated page."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://testserver"
+    ) as client:
+
+        async def timed(coroutine):
+            start = time.perf_counter()
+            response = await coroutine
+            return response, time.perf_counter() - start
+
+        slow = asyncio.create_task(timed(client.post(
+            "/record-assistant/1/1",
+            files={"image": ("face.png", b"image", "image/png")},
+            cookies={"session": session_cookie()}
+        )))
+        # Let the slow request reach the upstream call first.
+        await asyncio.sleep(0.1)
+        fast = asyncio.create_task(timed(client.get("/home")))
+
+        (slow_response, slow_elapsed), (fast_response, fast_elapsed) = \
+            await asyncio.gather(slow, fast)
+
+    assert slow_response.status_code == 200
+    assert fast_response.status_code == 200
+    assert slow_elapsed >= SLOW_UPSTREAM_SECONDS
+    assert fast_elapsed < SLOW_UPSTREAM_SECONDS / 2
@@ -0,0 +1,119 @@
+import httpx
+import pytest
+
+from services.identity_cache import IdentityCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBackend:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return httpx.Response(
+            self.status_code,
+            json={"id": 1, "role": "assistant"}
+        )
+
+
+@pytest.mark.anyio
+async def test_identity_is_cached_until_it_expires():
+    clock = FakeClock()
+    cache = IdentityCache(30, 10, clock=clock)
+    backend = FakeBackend()
+
+    response = await cache.get("/info", "token", backend)
+    clock.now = 29
+    cached = await cache.get("/info", "token", backend)
+
+    assert backend.calls == 1
+    assert cached.status_code == 200
+    assert cached.json() == response.json()
+
+    clock.now = 31
+    await cache.get("/info", "token", backend)
+    assert backend.calls == 2
+
+
+@pytest.mark.anyio
+async def test_entries_are_keyed_by_token_hash_and_path():
+    cache = IdentityCache(30, 10)
+    backend = FakeBackend()
+
+    await cache.get("/info", "token", backend)
+    await cache.get("/assistant/info", "token", backend)
+    await cache.get("/info", "other-token", backend)
+
+    assert backend.calls == 3
+    assert all("token" not in key for key in cache.entries)
+
+
+@pytest.mark.anyio
+async def test_failed_lookup_is_not_cached():
+    cache = IdentityCache(30, 10)
+    backend = FakeBackend(status_code=401)
+
+    await cache.get("/info", "token", backend)
+    await cache.get("/info", "token", backend)
+
+    assert backend.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.anyio
+async def test_least_recently_used_entry_is_evicted():
+    cache = IdentityCache(30, 2)
+    backend = FakeBackend()
+
+    await cache.get("/info", "a", backend)
+    await cache.get("/info", "b", backend)
+    await cache.get("/info", "a", backend)
+    await cache.get("/info", "c", backend)
+
+    assert cache.stats()["evictions"] == 1
+    await cache.get("/info", "a", backend)
+    assert backend.calls == 3
+    await cache.get("/info", "b", backend)
+    assert backend.calls == 4
+
+
+@pytest.mark.anyio
+async def test_invalidate_removes_every_path_of_the_token():
+    cache = IdentityCache(30, 10)
+    backend = FakeBackend()
+
+    await cache.get("/info", "token", backend)
+    await cache.get("/assistant/info", "token", backend)
+    await cache.get("/info", "other-token", backend)
+    cache.invalidate("token")
+
+    assert cache.stats()["entries"] == 1
+    await cache.get("/info", "token", backend)
+    assert backend.calls == 4
+
+
+@pytest.mark.anyio
+async def test_entry_invalidated_while_fetching_is_not_an_error():
+    clock = FakeClock()
+    cache = IdentityCache(30, 10, clock=clock)
+    await cache.get("/info", "token", FakeBackend())
+    clock.now = 31
+
+    async def logout_while_fetching():
+        # El perfil se borra mientras la entrada caducada se vuelve a pedir
+        cache.invalidate("token")
+        return httpx.Response(401)
+
+    response = await cache.get("/info", "token", logout_while_fetching)
+
+    assert response.status_code == 401
+    assert cache.stats()["entries"] == 0
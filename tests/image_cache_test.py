@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from services.image_cache import ImageCache
+
+
+@pytest.mark.anyio
+async def test_stored_image_is_served_from_disk(tmp_path):
+    cache = ImageCache(tmp_path, 1024)
+
+    assert cache.get("uuid") is None
+    await cache.put("uuid", b"image", "image/png", "evento.png")
+    image = cache.get("uuid")
+
+    assert image is not None
+    assert image.path.read_bytes() == b"image"
+    assert image.media_type == "image/png"
+    assert image.filename == "evento.png"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.anyio
+async def test_least_recently_used_image_is_evicted(tmp_path):
+    cache = ImageCache(tmp_path, 10)
+
+    await cache.put("a", b"aaaa", "image/png", "a.png")
+    await cache.put("b", b"bbbb", "image/png", "b.png")
+    cache.get("a")
+    await cache.put("c", b"cccc", "image/png", "c.png")
+
+    assert cache.get("b") is None
+    assert not (tmp_path / "b").exists()
+    assert cache.get("a") is not None
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.anyio
+async def test_index_is_rebuilt_from_disk(tmp_path):
+    cache = ImageCache(tmp_path, 1024)
+    await cache.put("uuid", b"image", "image/jpeg", "evento.jpg")
+    (tmp_path / "leftover.tmp").write_bytes(b"partial")
+    os.utime(tmp_path / "leftover.tmp", (0, 0))
+    (tmp_path / "writing.tmp").write_bytes(b"partial")
+    (tmp_path / "other-worker").write_bytes(b"image")
+
+    reloaded = ImageCache(tmp_path, 1024)
+
+    image = reloaded.get("uuid")
+    assert image is not None
+    assert image.media_type == "image/jpeg"
+    # Solo se borran los temporales abandonados; el resto puede ser de
+    # otro worker que escribe en el mismo directorio
+    assert not (tmp_path / "leftover.tmp").exists()
+    assert (tmp_path / "writing.tmp").exists()
+    assert (tmp_path / "other-worker").exists()
+
+
+@pytest.mark.anyio
+async def test_image_bigger_than_the_budget_is_not_stored(tmp_path):
+    cache = ImageCache(tmp_path, 4)
+
+    assert await cache.put("uuid", b"image", "image/png", "evento.png") is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.anyio
+async def test_writer_only_stores_the_image_on_commit(tmp_path):
+    cache = ImageCache(tmp_path, 1024)
+
+    writer = cache.writer("uuid", "image/png", "evento.png")
+    await writer.write(b"ima")
+    await writer.write(b"ge")
+    assert cache.get("uuid") is None
+
+    image = await writer.commit()
+    assert image.path.read_bytes() == b"image"
+    assert cache.get("uuid") is not None
+
+
+@pytest.mark.anyio
+async def test_aborted_writer_leaves_nothing_behind(tmp_path):
+    cache = ImageCache(tmp_path, 1024)
+
+    writer = cache.writer("uuid", "image/png", "evento.png")
+    await writer.write(b"ima")
+    writer.abort()
+
+    assert await writer.commit() is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,57 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from services.image_normalizer import ImageNormalizer, normalize_image
+
+
+def photo(width: int, height: int, orientation: int | None = None) -> BytesIO:
+    image = Image.new("RGB", (width, height), "red")
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    buffer.seek(0)
+    return buffer
+
+
+def test_photo_is_shrunk_and_reencoded_as_jpeg():
+    content = normalize_image(photo(4000, 3000), 1024, 85)
+
+    image = Image.open(BytesIO(content))
+    assert image.format == "JPEG"
+    assert image.size == (1024, 768)
+
+
+def test_exif_orientation_is_applied():
+    # 6: la cámara estaba girada 90°, la foto debe quedar vertical
+    content = normalize_image(photo(400, 300, orientation=6), 1024, 85)
+
+    assert Image.open(BytesIO(content)).size == (300, 400)
+
+
+@pytest.mark.anyio
+async def test_undecodable_photo_is_left_to_the_backend():
+    normalizer = ImageNormalizer(1024, 85, 1)
+
+    assert await normalizer.normalize(BytesIO(b"not an image")) is None
+    assert normalizer.stats()["failed"] == 1
+
+
+@pytest.mark.anyio
+async def test_decompression_bomb_is_left_to_the_backend(monkeypatch):
+    normalizer = ImageNormalizer(1024, 85, 1)
+    # Más del doble del límite de píxeles: Pillow se niega a decodificarla
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+
+    assert await normalizer.normalize(photo(400, 300)) is None
+    assert normalizer.stats()["failed"] == 1
+
+
+@pytest.mark.anyio
+async def test_normalization_can_be_disabled():
+    normalizer = ImageNormalizer(0, 85, 1)
+
+    assert await normalizer.normalize(photo(400, 300)) is None
@@ -0,0 +1,46 @@
+import pytest
+from PIL import Image
+
+from services.image_cache import ImageCache
+from services.image_placeholders import PlaceholderCache
+
+
+@pytest.fixture
+async def image_cache(tmp_path):
+    cache = ImageCache(tmp_path, 1024 * 1024)
+    Image.new("RGB", (800, 400), "red").save(tmp_path / "original.png")
+    await cache.put(
+        "uuid",
+        (tmp_path / "original.png").read_bytes(),
+        "image/png",
+        "evento.png"
+    )
+    return cache
+
+
+@pytest.mark.anyio
+async def test_placeholder_is_computed_once_from_the_cached_original(image_cache):
+    placeholders = PlaceholderCache(image_cache, 10)
+
+    placeholder = await placeholders.get("uuid")
+    assert placeholder.startswith("data:image/jpeg;base64,")
+    assert await placeholders.get("uuid") == placeholder
+    assert placeholders.stats()["hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_image_not_cached_gets_no_placeholder(image_cache):
+    placeholders = PlaceholderCache(image_cache, 10)
+
+    assert await placeholders.get_many(["uuid", "missing"]) == {
+        "uuid": await placeholders.get("uuid")
+    }
+
+
+@pytest.mark.anyio
+async def test_oversized_original_gets_no_placeholder(image_cache, monkeypatch):
+    placeholders = PlaceholderCache(image_cache, 10)
+    # Más del doble del límite de píxeles: Pillow se niega a decodificarla
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+
+    assert await placeholders.get("uuid") is None
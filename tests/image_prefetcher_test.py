@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from services.image_cache import ImageCache
+from services.image_prefetcher import ImagePrefetcher
+
+
+@pytest.mark.anyio
+async def test_only_missing_images_are_prefetched(tmp_path):
+    cache = ImageCache(tmp_path, 1024)
+    await cache.put("cached", b"image", "image/png", "a.png")
+    prefetcher = ImagePrefetcher(cache, 2)
+    fetched = []
+
+    async def fetch(key):
+        fetched.append(key)
+        return await cache.put(key, b"image", "image/png", "b.png")
+
+    prefetcher.schedule(["cached", "missing", "missing"], fetch)
+    await asyncio.gather(*prefetcher.tasks.values())
+
+    assert fetched == ["missing"]
+    assert prefetcher.stats()["fetched"] == 1
+
+
+@pytest.mark.anyio
+async def test_concurrency_is_bounded(tmp_path):
+    cache = ImageCache(tmp_path, 1024)
+    prefetcher = ImagePrefetcher(cache, 2)
+    running = 0
+    peak = 0
+
+    async def fetch(key):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return await cache.put(key, b"image", "image/png", "a.png")
+
+    prefetcher.schedule([f"image-{i}" for i in range(6)], fetch)
+    await asyncio.gather(*prefetcher.tasks.values())
+
+    assert peak == 2
+    assert prefetcher.stats()["fetched"] == 6
+
+
+@pytest.mark.anyio
+async def test_hit_rate_counts_prefetched_images_requested_later(tmp_path):
+    cache = ImageCache(tmp_path, 1024)
+    prefetcher = ImagePrefetcher(cache, 2)
+
+    async def fetch(key):
+        if key == "broken":
+            raise RuntimeError("backend down")
+        return await cache.put(key, b"image", "image/png", "a.png")
+
+    prefetcher.schedule(["a", "b", "broken"], fetch)
+    await asyncio.gather(*prefetcher.tasks.values())
+    prefetcher.claim("a")
+    prefetcher.claim("a")
+
+    stats = prefetcher.stats()
+    assert stats["failed"] == 1
+    assert stats["used"] == 1
+    assert stats["hit_rate"] == 1 / 3
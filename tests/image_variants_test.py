@@ -0,0 +1,32 @@
+from io import BytesIO
+
+from PIL import Image
+
+from services.image_variants import negotiate_format, render_variant, variant_width
+
+
+def test_width_is_rounded_up_to_an_allowed_width():
+    assert variant_width(None, None) is None
+    assert variant_width(350, None) == 400
+    assert variant_width(5000, None) == 1600
+    assert variant_width(None, "card") == 800
+
+
+def test_format_is_negotiated_from_the_accept_header():
+    assert negotiate_format("image/webp,image/*;q=0.8") == "webp"
+    assert negotiate_format("image/webp;q=0") is None
+    assert negotiate_format(None) is None
+
+
+def test_variant_is_resized_without_enlarging(tmp_path):
+    path = tmp_path / "image"
+    Image.new("RGBA", (800, 400)).save(path, format="PNG")
+
+    content, media_type, extension = render_variant(path, 400, None)
+    assert media_type == "image/png"
+    assert extension == "png"
+    assert Image.open(BytesIO(content)).size == (400, 200)
+
+    content, media_type, _ = render_variant(path, 1200, "webp")
+    assert media_type == "image/webp"
+    assert Image.open(BytesIO(content)).size == (800, 400)
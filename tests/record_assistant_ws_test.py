@@ -0,0 +1,117 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from main import app
+
+ASSISTANT = {
+    "id": 7,
+    "first_name": "Ana",
+    "last_name": "Pérez",
+    "email": "ana@example.com",
+    "assistant": {"id_number": "1712345678", "phone": "0999999999", "image_uuid": "uuid"},
+}
+
+
+def backend(request: httpx.Request) -> httpx.Response:
+    """Stand-in backend that recognizes every frame."""
+    return httpx.Response(200, json=[ASSISTANT])
+
+
+@pytest.fixture
+def client(use_backend):
+    use_backend(backend)
+    return TestClient(app)
+
+
+def test_frames_are_answered_with_the_matching_assistants(client, session_cookie):
+    client.cookies.set("session", session_cookie())
+
+    with client.websocket_connect("/record-assistant/1/2/ws") as websocket:
+        websocket.send_bytes(b"frame")
+        message = websocket.receive_json()
+
+    assert message["status"] == "match"
+    assert message["assistants"] == [{
+        "id": 7,
+        "first_name": "Ana",
+        "last_name": "Pérez",
+        "email": "ana@example.com",
+        "id_number": "1712345678",
+        "phone": "0999999999",
+        "image_uuid": "uuid",
+    }]
+
+
+def test_only_staff_can_connect(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/record-assistant/1/2/ws") as websocket:
+            websocket.receive_json()
+
+
+@pytest.mark.parametrize("failure", [
+    httpx.ConnectError("backend caído"),
+    httpx.Response(500, text="Internal Server Error"),
+    httpx.Response(404, text="<html>Not Found</html>"),
+])
+def test_backend_failure_is_reported_and_the_connection_stays_open(
+    use_backend,
+    session_cookie,
+    failure
+):
+    responses = [failure, httpx.Response(200, json=[ASSISTANT])]
+
+    def flaky_backend(request: httpx.Request) -> httpx.Response:
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    use_backend(flaky_backend)
+    client = TestClient(app)
+    client.cookies.set("session", session_cookie())
+
+    with client.websocket_connect("/record-assistant/1/2/ws") as websocket:
+        websocket.send_bytes(b"frame")
+        error = websocket.receive_json()
+        websocket.send_bytes(b"next frame")
+        message = websocket.receive_json()
+
+    assert error == {"status": "error", "assistants": []}
+    assert message["status"] == "match"
+
+
+def test_connection_from_another_site_is_rejected(client, session_cookie):
+    client.cookies.set("session", session_cookie())
+
+    with pytest.raises(WebSocketDisconnect) as rejected:
+        with client.websocket_connect(
+            "/record-assistant/1/2/ws",
+            headers={"origin": "https://evil.example.com"}
+        ) as websocket:
+            websocket.receive_json()
+
+    assert rejected.value.code == 1008
+
+
+def test_connection_from_the_app_itself_is_accepted(client, session_cookie):
+    client.cookies.set("session", session_cookie())
+
+    with client.websocket_connect(
+        "/record-assistant/1/2/ws",
+        headers={"origin": "http://testserver"}
+    ) as websocket:
+        websocket.send_bytes(b"frame")
+        assert websocket.receive_json()["status"] == "match"
+
+
+def test_text_message_closes_the_connection(client, session_cookie):
+    client.cookies.set("session", session_cookie())
+
+    with client.websocket_connect("/record-assistant/1/2/ws") as websocket:
+        websocket.send_text("frame")
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+
+    assert closed.value.code == 1003
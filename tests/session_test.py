@@ -0,0 +1,114 @@
+import base64
+import json
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from services.session import Principal, SessionSigner, token_digest, token_expiry
+
+
+def jwt(claims: dict) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=")
+    return f"header.{payload.decode()}.signature"
+
+
+def test_token_expiry_is_read_without_verification():
+    assert token_expiry(jwt({"sub": "ana", "exp": 1700000000})) == 1700000000
+    assert token_expiry(jwt({"sub": "ana"})) is None
+    assert token_expiry("not-a-jwt") is None
+
+
+def test_session_round_trip():
+    signer = SessionSigner("secret", 3600, clock=lambda: 1000)
+    principal = signer.principal(
+        {"id": 7, "role": "staff", "first_name": "Ana", "last_name": "Pérez"},
+        "opaque-token"
+    )
+
+    assert principal == Principal(
+        id=7, role="staff", name="Ana Pérez", expires_at=4600,
+        token_digest=token_digest("opaque-token")
+    )
+    assert signer.loads(signer.dumps(principal)) == principal
+
+
+def test_tampered_or_expired_session_is_rejected():
+    signer = SessionSigner("secret", 3600, clock=lambda: 1000)
+    value = signer.dumps(Principal(
+        id=7, role="staff", name="Ana", expires_at=2000, token_digest=token_digest("token")
+    ))
+
+    assert SessionSigner("other", 3600).loads(value) is None
+    forged = base64.urlsafe_b64encode(b'[7,"organizer","Ana",2000]').rstrip(b"=").decode()
+    assert signer.loads(f"{forged}.{value.split('.')[1]}") is None
+    assert SessionSigner("secret", 3600, clock=lambda: 2000).loads(value) is None
+
+
+@pytest.fixture
+def backend_requests(use_backend):
+    requests = []
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"access_token": jwt({"exp": 4102444800})})
+        if request.url.path == "/info":
+            return httpx.Response(200, json={
+                "id": 7, "role": "staff", "first_name": "Ana", "last_name": "Pérez",
+            })
+        return httpx.Response(204)
+
+    use_backend(backend)
+    return requests
+
+
+def test_login_sets_a_session_used_without_identity_calls(backend_requests):
+    client = TestClient(app, base_url="https://testserver")
+    client.post(
+        "/login",
+        data={"username": "ana@example.com", "password": "secret", "grant_type": "password"},
+        follow_redirects=False
+    )
+
+    principal = app.state.session_signer.loads(client.cookies["session"])
+    assert principal == Principal(
+        id=7, role="staff", name="Ana Pérez", expires_at=4102444800,
+        token_digest=token_digest(client.cookies["access_token"])
+    )
+
+    backend_requests.clear()
+    response = client.delete("/profile", headers={"accept": "application/json"})
+
+    assert response.status_code == 200
+    assert backend_requests == [("DELETE", "/staff/7")]
+
+
+def test_session_issued_with_another_token_is_rejected(backend_requests, session_cookie):
+    client = TestClient(app, base_url="https://testserver")
+    client.cookies.set("access_token", "token-of-luis")
+    client.cookies.set("session", session_cookie("staff", id=7, token="token-of-ana"))
+
+    response = client.delete("/profile", headers={"accept": "application/json"})
+
+    assert response.status_code == 401
+    assert backend_requests == []
+
+
+def test_startup_fails_without_a_session_secret_outside_dev_mode():
+    env = {key: value for key, value in os.environ.items()
+           if key not in ("SESSION_SECRET", "DEV_MODE")}
+
+    result = subprocess.run(
+        [sys.executable, "-c", "import main"],
+        env=env,
+        capture_output=True,
+        text=True
+    )
+
+    assert result.returncode != 0
+    assert "SESSION_SECRET must be set" in result.stderr
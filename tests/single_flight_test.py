@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+@pytest.mark.anyio
+async def test_identical_calls_are_coalesced():
+    single_flight = SingleFlight()
+    executions = 0
+
+    async def fetch_upcoming():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.1)
+        return ["evento"]
+
+    results = await asyncio.gather(*(
+        single_flight.do("/events/upcoming", fetch_upcoming)
+        for _ in range(50)
+    ))
+
+    assert executions == 1
+    assert all(result == ["evento"] for result in results)
+    assert single_flight.stats()["coalesced"] == 49
+    assert single_flight.stats()["fan_in_ratio"] == 50
+    assert single_flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_different_keys_and_later_calls_are_not_coalesced():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    await asyncio.gather(
+        single_flight.do("/events/upcoming", fetch),
+        single_flight.do("/events/all", fetch),
+    )
+    await single_flight.do("/events/upcoming", fetch)
+
+    assert single_flight.stats()["executions"] == 3
+
+
+@pytest.mark.anyio
+async def test_cancelled_caller_does_not_cancel_other_waiters():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    first = asyncio.create_task(single_flight.do("/events/all", fetch))
+    second = asyncio.create_task(single_flight.do("/events/all", fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "ok"
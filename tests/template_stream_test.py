@@ -0,0 +1,134 @@
+import asyncio
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from main import app
+from services.templates import STREAM_ERROR, STREAM_ERROR_END, TemplateStreamer, create_templates
+
+
+@pytest.fixture
+def streamer(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    (directory / "base.html.j2").write_text(
+        "<head>{% block title %}{% endblock %}</head>"
+        "<nav>{{ role }}</nav>"
+        "<main>{% block main %}{% endblock %}</main>"
+        "<footer></footer>"
+    )
+    (directory / "page.html.j2").write_text(
+        '{% extends "base.html.j2" %}'
+        "{% block title %}Eventos{% endblock %}"
+        "{% block main %}{% for event in events %}{{ event }};{% endfor %}{% endblock %}"
+    )
+    (directory / "venue.html.j2").write_text(
+        '{% extends "base.html.j2" %}'
+        "{% block main %}{% for event in events %}{{ event.venue.name }};{% endfor %}{% endblock %}"
+    )
+    templates = create_templates(str(directory), True, tmp_path / "cache")
+    return TemplateStreamer(templates, True)
+
+
+def fake_request():
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+@pytest.mark.anyio
+async def test_head_is_sent_before_the_data_loads(streamer):
+    ready = asyncio.Event()
+
+    async def load():
+        await ready.wait()
+        return {"events": ["a", "b"]}
+
+    parts = streamer.render(fake_request(), "page.html.j2", {"role": "staff"}, load)
+
+    head = await asyncio.wait_for(anext(parts), 1)
+    assert head == "<head>Eventos</head><nav>staff</nav><main>"
+
+    ready.set()
+    assert [part async for part in parts] == ["a;b;</main><footer></footer>"]
+
+
+@pytest.mark.anyio
+async def test_failed_load_replaces_only_the_block(streamer):
+    async def load():
+        raise httpx.ConnectError("backend caído")
+
+    response = await streamer.response(fake_request(), "page.html.j2", {}, load)
+    body = "".join([part async for part in response.body_iterator])
+
+    assert STREAM_ERROR in body
+    assert body.endswith("</main><footer></footer>")
+    assert streamer.stats()["failed"] == 1
+
+
+@pytest.mark.anyio
+async def test_failed_block_render_shows_the_error_and_closes_the_page(streamer):
+    async def load():
+        # Al backend le falta un campo que la plantilla usa
+        return {"events": [{"venue": {"name": "Aula 1"}}, {}]}
+
+    response = await streamer.response(fake_request(), "venue.html.j2", {}, load)
+    body = "".join([part async for part in response.body_iterator])
+
+    assert body.endswith(f"<main>{STREAM_ERROR}</main><footer></footer>")
+    assert "Aula 1" not in body
+    assert streamer.stats()["failed"] == 1
+
+
+@pytest.mark.anyio
+async def test_failure_after_the_block_closes_the_document(streamer):
+    directory = streamer.templates.env.loader.searchpath[0]
+    with open(f"{directory}/scripts.html.j2", "w") as file:
+        file.write(
+            "<head></head><main>{% block main %}ok{% endblock %}</main>"
+            "{% block scripts %}{{ settings.analytics.id }}{% endblock %}"
+        )
+
+    async def load():
+        return {}
+
+    response = await streamer.response(fake_request(), "scripts.html.j2", {}, load)
+    body = "".join([part async for part in response.body_iterator])
+
+    assert body == "<head></head><main>" + STREAM_ERROR_END
+    assert streamer.stats()["failed"] == 1
+
+
+@pytest.mark.anyio
+async def test_disabled_renders_the_whole_page(streamer):
+    streamer.enabled = False
+
+    async def load():
+        return {"events": ["a"]}
+
+    response = await streamer.response(fake_request(), "page.html.j2", {}, load)
+
+    assert b"<main>a;</main>" in response.body
+    assert streamer.stats()["streamed"] == 0
+
+
+@pytest.mark.anyio
+async def test_all_events_view_is_streamed(use_backend, session_cookie):
+    async def backend(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=[])
+
+    upstream = use_backend(backend)
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+            cookies={"session": session_cookie("organizer")}
+        ) as client:
+            response = await client.get("/all-events-view")
+    finally:
+        await upstream.aclose()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "Gestión de Eventos" in response.text
+    assert "Administrar Organizadores" in response.text
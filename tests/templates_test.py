@@ -0,0 +1,45 @@
+from services.templates import create_templates, precompile_templates
+
+
+def write_templates(directory):
+    directory.mkdir()
+    (directory / "base.html.j2").write_text("<b>{% block main %}{% endblock %}</b>")
+    (directory / "page.html.j2").write_text(
+        '{% extends "base.html.j2" %}{% block main %}{{ name }}{% endblock %}'
+    )
+    (directory / "notes.txt").write_text("no es una plantilla")
+
+
+def test_production_precompiles_and_caches_bytecode(tmp_path):
+    write_templates(tmp_path / "templates")
+    cache_dir = tmp_path / "cache"
+    templates = create_templates(str(tmp_path / "templates"), True, cache_dir)
+
+    stats = precompile_templates(templates.env)
+
+    assert stats["templates"] == 2
+    assert not templates.env.auto_reload
+    assert len(list(cache_dir.iterdir())) == 2
+    assert templates.env.get_template("page.html.j2").render(name="Ana") == "<b>Ana</b>"
+
+
+def test_production_ignores_changes_on_disk(tmp_path):
+    write_templates(tmp_path / "templates")
+    templates = create_templates(str(tmp_path / "templates"), True, tmp_path / "cache")
+    precompile_templates(templates.env)
+
+    (tmp_path / "templates" / "page.html.j2").write_text("cambiada")
+
+    assert templates.env.get_template("page.html.j2").render(name="Ana") == "<b>Ana</b>"
+
+
+def test_development_reloads_changes(tmp_path):
+    write_templates(tmp_path / "templates")
+    cache_dir = tmp_path / "cache"
+    templates = create_templates(str(tmp_path / "templates"), False, cache_dir)
+    templates.env.get_template("page.html.j2").render(name="Ana")
+
+    (tmp_path / "templates" / "page.html.j2").write_text("cambiada")
+
+    assert templates.env.get_template("page.html.j2").render() == "cambiada"
+    assert not cache_dir.exists()
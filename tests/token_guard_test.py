@@ -0,0 +1,48 @@
+import base64
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from services.token_guard import TokenGuard
+
+
+def jwt(claims: dict) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=")
+    return f"header.{payload.decode()}.signature"
+
+
+def test_expired_and_almost_expired_tokens_are_rejected():
+    guard = TokenGuard(5, clock=lambda: 1000)
+
+    assert guard.is_expired(jwt({"exp": 999}))
+    assert guard.is_expired(jwt({"exp": 1004}))
+    assert not guard.is_expired(jwt({"exp": 1006}))
+    assert not guard.is_expired("opaque-token")
+    assert guard.stats() == {"checked": 4, "expired": 2}
+
+
+@pytest.fixture
+def backend_requests(use_backend):
+    requests = []
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(401, json={"detail": "Token expired"})
+
+    use_backend(backend)
+    return requests
+
+
+def test_expired_token_redirects_to_login_without_backend_calls(backend_requests):
+    client = TestClient(app)
+    client.cookies.set("access_token", jwt({"exp": 1}))
+    client.cookies.set("role", "assistant")
+
+    response = client.get("/profile", follow_redirects=False)
+
+    assert response.status_code == 303
+    assert response.headers["location"] == "/login"
+    assert backend_requests == []
@@ -0,0 +1,62 @@
+import pytest
+
+from services.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.anyio
+async def test_value_is_cached_until_it_expires():
+    clock = FakeClock()
+    cache = TTLCache(60, clock=clock)
+    fetches = 0
+
+    async def fetch():
+        nonlocal fetches
+        fetches += 1
+        return ["evento"]
+
+    assert await cache.get_or_fetch("upcoming", fetch) == ["evento"]
+    clock.now = 59
+    assert await cache.get_or_fetch("upcoming", fetch) == ["evento"]
+    assert fetches == 1
+
+    clock.now = 61
+    await cache.get_or_fetch("upcoming", fetch)
+    assert fetches == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.anyio
+async def test_failed_fetch_is_not_cached():
+    cache = TTLCache(60)
+
+    async def failing_fetch():
+        raise RuntimeError("backend down")
+
+    async def fetch():
+        return ["evento"]
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_fetch("upcoming", failing_fetch)
+
+    assert await cache.get_or_fetch("upcoming", fetch) == ["evento"]
+
+
+@pytest.mark.anyio
+async def test_zero_ttl_disables_the_cache():
+    cache = TTLCache(0)
+
+    async def fetch():
+        return ["evento"]
+
+    await cache.get_or_fetch("upcoming", fetch)
+
+    assert cache.stats()["entries"] == 0
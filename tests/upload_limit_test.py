@@ -0,0 +1,48 @@
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from services.upload_limit import UploadLimitMiddleware
+
+upload_app = FastAPI()
+upload_app.add_middleware(UploadLimitMiddleware, max_bytes=1024)
+
+
+@upload_app.post("/upload")
+async def upload(request: Request):
+    return {"size": len(await request.body())}
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=upload_app),
+        base_url="http://testserver"
+    ) as client:
+        yield client
+
+
+@pytest.mark.anyio
+async def test_body_within_the_limit_is_accepted(client):
+    response = await client.post("/upload", content=b"x" * 1024)
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 1024}
+
+
+@pytest.mark.anyio
+async def test_announced_oversized_body_is_rejected(client):
+    response = await client.post("/upload", content=b"x" * 1025)
+
+    assert response.status_code == 413
+
+
+@pytest.mark.anyio
+async def test_chunked_oversized_body_is_rejected(client):
+    async def chunks():
+        for _ in range(4):
+            yield b"x" * 512
+
+    response = await client.post("/upload", content=chunks())
+
+    assert response.status_code == 413